@@ -3,37 +3,139 @@ Quick data analysis utilities for NBA stats.
 
 This module provides simple functions to analyze the data without writing SQL.
 """
+import calendar
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, Executable, inspect, text
+from changes import changed_players
 from config import config
+from database import get_engine
+from metrics import QueryMetrics
+from query_builder import (
+    TOP_PERFORMANCE_COLUMNS, compare_players_query, current_form_query, players_data_query,
+    recent_form_columns, recent_form_query, rolling_stats_query, summary_query,
+    summary_rollup_query, top_performances_batch_query, top_performances_query,
+    validate_count, validate_players, validate_stat, validate_stats
+)
+from query_cache import QueryCache, cached_query
+from rolling import ROLLING_TABLE
+from schema import COMBINED_TABLE, RANKED_STATS
+from streaming import RunningAggregate, grouped_averages
+
+if TYPE_CHECKING:
+    # Snapshot backends load Parquet and Arrow support only when created
+    from columnar import ColumnarStore
+    from compact import CompactStore
+
+CAREER_AVERAGE_STATS = {
+    'pts': 'avg_points',
+    'reb': 'avg_rebounds',
+    'ast': 'avg_assists',
+    'stl': 'avg_steals',
+    'blk': 'avg_blocks',
+    'fg_pct': 'avg_fg_pct',
+    'fg3_pct': 'avg_3pt_pct',
+}
+
+SPLIT_STATS = {
+    'pts': 'avg_points',
+    'reb': 'avg_rebounds',
+    'ast': 'avg_assists',
+}
+
+# Columns ``stream_splits`` can split on
+SPLIT_COLUMNS = ['location', 'conf', 'div', 'opp', 'day_of_week', 'month', 'year', 'wl']
 
 
 class NBAStatsAnalyzer:
     """Helper class for analyzing NBA player statistics."""
     
-    def __init__(self):
-        """Initialize the analyzer with database connection."""
-        self.engine = create_engine(config.database_url)
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Initialize the analyzer.
+        
+        The database engine is attached on the first query, so creating an
+        analyzer does not connect.
+        
+        Args:
+            cache_size: Maximum cached query results (defaults to
+                ``config.QUERY_CACHE_SIZE``; 0 disables caching)
+        """
+        self._engine = None
+        self.query_cache = QueryCache(
+            self.get_load_generation, max_entries=cache_size, changes_fn=self.get_changed_players
+        )
+        self.query_metrics = QueryMetrics()
+    
+    @property
+    def engine(self):
+        """Shared database engine (or the connection the analyzer is bound to)."""
+        if self._engine is None:
+            self._engine = get_engine()
+        return self._engine
+    
+    @engine.setter
+    def engine(self, engine):
+        self._engine = engine
+    
+    def _scalar(self, query: str):
+        """Run a single-value query on the engine (or the connection it is bound to)."""
+        if isinstance(self.engine, Connection):
+            return self.engine.execute(text(query)).scalar()
+        with self.engine.connect() as conn:
+            return conn.execute(text(query)).scalar()
+    
+    def get_load_generation(self):
+        """Get the generation stamp of the last successful ETL load."""
+        if not inspect(self.engine).has_table(config.LOAD_GENERATION_TABLE):
+            return None
+        return self._scalar(f"SELECT MAX(generation) FROM {config.LOAD_GENERATION_TABLE}")
+    
+    def get_changed_players(self, since, generation) -> Optional[Set[str]]:
+        """
+        Get the players changed by the ETL loads after ``since`` up to ``generation``.
+        
+        Args:
+            since: Load generation the caller's results belong to
+            generation: Load generation the caller is moving to
+            
+        Returns:
+            Names of the changed players, or None if the change log cannot
+            tell (treat every player as changed)
+        """
+        if isinstance(self.engine, Connection):
+            return changed_players(self.engine, since, generation)
+        with self.engine.connect() as conn:
+            return changed_players(conn, since, generation)
+    
+    def _summary_is_fresh(self, table_name: str) -> bool:
+        """Check whether a summary table was built by the latest ETL load."""
+        generation = self.get_load_generation()
+        if generation is None or not inspect(self.engine).has_table(table_name):
+            return False
+        return self._scalar(f"SELECT MAX(generation) FROM {table_name}") == generation
+    
+    def _read_summary(self, table_name: str) -> pd.DataFrame:
+        """
+        Read a rollup from its summary table, aggregating nba_5 if it is stale.
+        
+        Args:
+            table_name: Summary table name (a key of ``SUMMARY_QUERIES``)
+            
+        Returns:
+            DataFrame with the rollup, in report order
+        """
+        if self._summary_is_fresh(table_name):
+            return pd.read_sql(summary_query(table_name), self.engine).drop(columns='generation')
+        return pd.read_sql(summary_rollup_query(table_name), self.engine)
     
+    @cached_query
     def get_career_averages(self) -> pd.DataFrame:
         """Get career averages for all players."""
-        query = """
-        SELECT 
-            player_id,
-            COUNT(*) as games_played,
-            ROUND(AVG(pts), 2) as avg_points,
-            ROUND(AVG(reb), 2) as avg_rebounds,
-            ROUND(AVG(ast), 2) as avg_assists,
-            ROUND(AVG(stl), 2) as avg_steals,
-            ROUND(AVG(blk), 2) as avg_blocks,
-            ROUND(AVG(fg_pct), 2) as avg_fg_pct,
-            ROUND(AVG(fg3_pct), 2) as avg_3pt_pct
-        FROM nba_5
-        GROUP BY player_id
-        ORDER BY avg_points DESC
-        """
-        return pd.read_sql(query, self.engine)
+        return self._read_summary('summary_career_averages')
     
+    @cached_query(players='player_name')
     def get_player_data(self, player_name: str) -> pd.DataFrame:
         """
         Get all data for a specific player.
@@ -42,10 +144,27 @@ class NBAStatsAnalyzer:
             player_name: Name of the player (e.g., 'lebron_james')
             
         Returns:
-            DataFrame with all player data
+            DataFrame with all player data, in game order
+            
+        Raises:
+            ValueError: If the player has no games loaded
         """
-        return pd.read_sql_table(player_name, self.engine)
+        return self._read_players([player_name])[player_name]
+    
+    def _read_players(self, player_names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """Read players' games from the games table in one query, keyed by player."""
+        names = validate_players(player_names)
+        games = pd.read_sql(players_data_query(), self.engine, params={'player_names': list(names)})
+        players = {
+            name: group.reset_index(drop=True)
+            for name, group in _split(games, 'player_id', names).items()
+        }
+        missing = [name for name, group in players.items() if group.empty]
+        if missing:
+            raise ValueError(f"No games loaded for: {', '.join(missing)}")
+        return players
     
+    @cached_query
     def get_top_performances(self, stat: str = 'pts', limit: int = 10) -> pd.DataFrame:
         """
         Get top performances by a specific stat.
@@ -56,46 +175,72 @@ class NBAStatsAnalyzer:
             
         Returns:
             DataFrame with top performances
+            
+        Raises:
+            ValueError: If the stat is unknown or the limit is not positive
         """
-        query = f"""
-        SELECT 
-            player_id,
-            game_date,
-            matchup,
-            pts, reb, ast, stl, blk,
-            fg_pct, fg3_pct
-        FROM nba_5
-        ORDER BY {stat} DESC
-        LIMIT {limit}
+        query = top_performances_query(validate_stat(stat))
+        return pd.read_sql(query, self.engine, params={'limit': validate_count(limit, 'limit')})
+    
+    @cached_query(players='player_names')
+    def get_player_data_batch(self, player_names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Get all data for several players in one query.
+        
+        Args:
+            player_names: Names of the players (e.g., ['lebron_james', 'kevin_durant'])
+            
+        Returns:
+            Mapping of player name to the DataFrame ``get_player_data`` returns
+            
+        Raises:
+            ValueError: If a player has no games loaded
         """
-        return pd.read_sql(query, self.engine)
+        return self._read_players(player_names)
     
-    def compare_players(self, stats: list = None) -> pd.DataFrame:
+    @cached_query
+    def get_top_performances_batch(self, stats: Iterable[str] = None,
+                                   limit: int = 10) -> Dict[str, pd.DataFrame]:
         """
-        Compare all players across specified stats.
+        Get top performances for several stats in one query.
         
         Args:
-            stats: List of stats to compare (default: pts, reb, ast)
+            stats: Stats to rank by (default: ``schema.RANKED_STATS``)
+            limit: Number of results per stat
             
         Returns:
-            DataFrame with player comparisons
+            Mapping of stat to the DataFrame ``get_top_performances`` returns
+            
+        Raises:
+            ValueError: If a stat is unknown or the limit is not positive
+        """
+        stats = validate_stats(RANKED_STATS if stats is None else stats)
+        query = top_performances_batch_query(stats)
+        top = pd.read_sql(query, self.engine, params={'limit': validate_count(limit, 'limit')})
+        return {
+            stat: _sort_desc(group.drop(columns='stat'), stat)
+            for stat, group in _split(top, 'stat', stats).items()
+        }
+    
+    @cached_query
+    def compare_players(self, stats: list = None) -> pd.DataFrame:
         """
-        if stats is None:
-            stats = ['pts', 'reb', 'ast']
+        Compare all players across specified stats.
         
-        stat_calcs = ', '.join([f'ROUND(AVG({s}), 2) as avg_{s}' for s in stats])
+        Every stat is averaged in the same scan of ``nba_5``.
         
-        query = f"""
-        SELECT 
-            player_id,
-            COUNT(*) as games,
-            {stat_calcs}
-        FROM nba_5
-        GROUP BY player_id
-        ORDER BY avg_{stats[0]} DESC
+        Args:
+            stats: List of stats to compare (default: pts, reb, ast)
+            
+        Returns:
+            DataFrame with player comparisons, ordered by the first stat
+            
+        Raises:
+            ValueError: If a stat is unknown
         """
-        return pd.read_sql(query, self.engine)
+        return pd.read_sql(compare_players_query(validate_stats(stats)), self.engine)
     
+    @cached_query
     def get_recent_form(self, games: int = 10) -> pd.DataFrame:
         """
         Get recent form for all players.
@@ -105,67 +250,491 @@ class NBAStatsAnalyzer:
             
         Returns:
             DataFrame with recent performance stats
+            
+        Raises:
+            ValueError: If games is not a positive integer
+        """
+        games = validate_count(games, 'games')
+        form = pd.read_sql(recent_form_query(), self.engine, params={'games': games})
+        return form.rename(columns=recent_form_columns(games))
+    
+    @cached_query(players='player_name')
+    def get_rolling_stats(self, player_name: str) -> pd.DataFrame:
+        """
+        Get rolling averages, EWM form and streaks for every game of a player.
+        
+        Args:
+            player_name: Name of the player (e.g., 'lebron_james')
+            
+        Returns:
+            DataFrame with one row per game, oldest first
+        """
+        return pd.read_sql(rolling_stats_query(), self.engine, params={'player_name': player_name},
+                           parse_dates=['game_date'])
+    
+    @cached_query
+    def get_current_form(self) -> pd.DataFrame:
+        """Get each player's rolling stats as of their latest game."""
+        return pd.read_sql(current_form_query(), self.engine, parse_dates=['game_date'])
+    
+    @cached_query
+    def get_triple_doubles(self) -> pd.DataFrame:
+        """Get all triple-double games."""
+        return self._read_summary('summary_triple_doubles')
+    
+    @cached_query
+    def home_vs_away(self) -> pd.DataFrame:
+        """Compare home vs away performance."""
+        return self._read_summary('summary_home_away')
+    
+    @cached_query
+    def conference_splits(self) -> pd.DataFrame:
+        """Compare performance against Eastern vs Western conference opponents."""
+        return self._read_summary('summary_conference')
+    
+    @cached_query
+    def day_of_week_splits(self) -> pd.DataFrame:
+        """Compare performance by day of the week."""
+        return self._read_summary('summary_day_of_week')
+    
+    def iter_query(self, query: Union[str, Executable], params: Optional[dict] = None,
+                   chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a query's result in chunks over a server-side cursor.
+        
+        Args:
+            query: SQL query or SQLAlchemy statement
+            params: Bound query parameters
+            chunksize: Rows per chunk (defaults to ``config.ANALYZER_CHUNKSIZE``)
+            
+        Yields:
+            DataFrames of at most ``chunksize`` rows
+        """
+        if isinstance(query, str):
+            query = text(query)
+        with self.engine.connect().execution_options(stream_results=True) as conn:
+            yield from pd.read_sql(
+                query, conn, params=params,
+                chunksize=chunksize or config.ANALYZER_CHUNKSIZE
+            )
+    
+    def iter_player_data(self, player_name: str,
+                         chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream all data for a specific player, oldest game first.
+        
+        Args:
+            player_name: Name of the player (e.g., 'lebron_james')
+            chunksize: Rows per chunk
+            
+        Yields:
+            DataFrames of player data
         """
-        query = f"""
-        WITH recent_games AS (
-            SELECT 
-                player_id,
-                game_date,
-                pts, reb, ast, wl,
-                ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC) as game_rank
-            FROM nba_5
+        yield from self.iter_query(
+            players_data_query(), params={'player_names': [player_name]}, chunksize=chunksize
         )
-        SELECT 
-            player_id,
-            ROUND(AVG(pts), 2) as avg_points_last_{games},
-            ROUND(AVG(reb), 2) as avg_rebounds_last_{games},
-            ROUND(AVG(ast), 2) as avg_assists_last_{games},
-            SUM(CASE WHEN wl = 'W' THEN 1 ELSE 0 END) as wins_last_{games}
-        FROM recent_games
-        WHERE game_rank <= {games}
-        GROUP BY player_id
-        ORDER BY avg_points_last_{games} DESC
-        """
-        return pd.read_sql(query, self.engine)
     
+    def _stream_aggregate(self, aggregate: RunningAggregate, table: str,
+                          chunksize: Optional[int]) -> pd.DataFrame:
+        """Fold a table's rows into an aggregate chunk by chunk."""
+        quote = self.engine.dialect.identifier_preparer.quote
+        columns = ', '.join(quote(c) for c in aggregate.columns)
+        for chunk in self.iter_query(f"SELECT {columns} FROM {quote(table)}", chunksize=chunksize):
+            aggregate.update(chunk)
+        return aggregate.result()
+    
+    def stream_career_averages(self, table: str = 'nba_5',
+                               chunksize: Optional[int] = None) -> pd.DataFrame:
+        """
+        Compute career averages for all players without loading the table.
+        
+        Args:
+            table: Game table to aggregate (``nba_5`` or a player table)
+            chunksize: Rows per chunk
+            
+        Returns:
+            DataFrame with the columns of ``get_career_averages``
+        """
+        aggregate = RunningAggregate('player_id', CAREER_AVERAGE_STATS)
+        result = self._stream_aggregate(aggregate, table, chunksize)
+        return (result.rename(columns={'games': 'games_played'})
+                .sort_values('avg_points', ascending=False, kind='stable')
+                .reset_index(drop=True))
+    
+    def stream_splits(self, by: str = 'location', table: str = 'nba_5',
+                      chunksize: Optional[int] = None) -> pd.DataFrame:
+        """
+        Compute per-player splits without loading the table.
+        
+        Args:
+            by: Column to split on (one of ``SPLIT_COLUMNS``)
+            table: Game table to aggregate
+            chunksize: Rows per chunk
+            
+        Returns:
+            DataFrame with games, average points/rebounds/assists and win
+            percentage per player and split value
+        """
+        if by not in SPLIT_COLUMNS:
+            raise ValueError(f"Cannot split on '{by}', expected one of {SPLIT_COLUMNS}")
+        aggregate = RunningAggregate(['player_id', by], SPLIT_STATS, win_pct=True)
+        return self._stream_aggregate(aggregate, table, chunksize)
+
+
+def _sort_desc(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Sort like ``ORDER BY column DESC`` on PostgreSQL (NULLs first)."""
+    return (df.sort_values(column, ascending=False, kind='stable', na_position='first')
+            .reset_index(drop=True))
+
+
+def _split(df: pd.DataFrame, column: str, keys: Iterable) -> Dict[object, pd.DataFrame]:
+    """Split a frame on a column's values, in ``keys`` order (empty frames for absent keys)."""
+    groups = dict(tuple(df.groupby(column, sort=False)))
+    return {key: groups.get(key, df.iloc[:0]) for key in keys}
+
+
+class ColumnarStatsAnalyzer(NBAStatsAnalyzer):
+    """
+    Analyzer that answers the same queries in-process from Parquet snapshots.
+    
+    The ETL writes a snapshot of every published table after each load; this
+    backend needs no database connection and returns the same results as the
+    database-backed analyzer for the same load generation.
+    """
+    
+    # Snapshots are read without a database connection
+    engine = None
+    
+    def __init__(self, cache_size: Optional[int] = None,
+                 store: Optional['ColumnarStore'] = None):
+        """
+        Initialize the analyzer with a snapshot store.
+        
+        Args:
+            cache_size: Maximum cached query results (0 disables caching)
+            store: Snapshot store (defaults to ``config.SNAPSHOT_DIR``)
+        """
+        from columnar import ColumnarStore
+        
+        self.store = store or ColumnarStore()
+        self.query_cache = QueryCache(
+            self.get_load_generation, max_entries=cache_size, changes_fn=self.get_changed_players
+        )
+        self.query_metrics = QueryMetrics()
+    
+    def get_load_generation(self):
+        """Get the generation stamp of the current snapshot."""
+        return self.store.generation()
+    
+    def get_changed_players(self, since, generation) -> Optional[Set[str]]:
+        """Get the players changed between two snapshots, as recorded in the snapshot pointer."""
+        from columnar import snapshot_changes
+        
+        return snapshot_changes(self.store.current(), since, generation)
+    
+    def _games(self) -> pd.DataFrame:
+        """Get the combined game table."""
+        return self.store.table('nba_5')
+    
+    def _check_players(self, player_names: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Check that players have game tables in the snapshot.
+        
+        Raises:
+            ValueError: If a player has no games loaded, like the database backend
+        """
+        names = validate_players(player_names)
+        current = self.store.current()
+        if current is not None:
+            tables = set(current['tables']) - {COMBINED_TABLE, ROLLING_TABLE}
+            missing = [name for name in names if name not in tables]
+            if missing:
+                raise ValueError(f"No games loaded for: {', '.join(missing)}")
+        return names
+    
+    @cached_query
+    def get_career_averages(self) -> pd.DataFrame:
+        """Get career averages for all players."""
+        averages = grouped_averages(
+            self._games(), ['player_id'], CAREER_AVERAGE_STATS, count_column='games_played'
+        )
+        return _sort_desc(averages, 'avg_points')
+    
+    @cached_query(players='player_name')
+    def get_player_data(self, player_name: str) -> pd.DataFrame:
+        """Get all data for a specific player."""
+        player_name, = self._check_players([player_name])
+        return self.store.table(player_name)
+    
+    @cached_query
+    def get_top_performances(self, stat: str = 'pts', limit: int = 10) -> pd.DataFrame:
+        """Get top performances by a specific stat."""
+        stat, limit = validate_stat(stat), validate_count(limit, 'limit')
+        return _sort_desc(self._games(), stat)[TOP_PERFORMANCE_COLUMNS].head(limit)
+    
+    @cached_query(players='player_names')
+    def get_player_data_batch(self, player_names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """Get all data for several players."""
+        return {name: self.store.table(name) for name in self._check_players(player_names)}
+    
+    @cached_query
+    def get_top_performances_batch(self, stats: Iterable[str] = None,
+                                   limit: int = 10) -> Dict[str, pd.DataFrame]:
+        """Get top performances for several stats from one read of the game table."""
+        stats = validate_stats(RANKED_STATS if stats is None else stats)
+        limit = validate_count(limit, 'limit')
+        games = self._games()[TOP_PERFORMANCE_COLUMNS]
+        return {stat: _sort_desc(games, stat).head(limit) for stat in stats}
+    
+    @cached_query
+    def compare_players(self, stats: list = None) -> pd.DataFrame:
+        """Compare all players across specified stats."""
+        stats = validate_stats(stats)
+        averages = grouped_averages(self._games(), ['player_id'], {s: f'avg_{s}' for s in stats})
+        return _sort_desc(averages, f'avg_{stats[0]}')
+    
+    @cached_query
+    def get_recent_form(self, games: int = 10) -> pd.DataFrame:
+        """Get recent form for all players."""
+        games = validate_count(games, 'games')
+        df = self._games().sort_values(['player_id', 'game_date'], ascending=[True, False])
+        recent = df[df.groupby('player_id').cumcount() < games]
+        stats = {
+            'pts': f'avg_points_last_{games}',
+            'reb': f'avg_rebounds_last_{games}',
+            'ast': f'avg_assists_last_{games}',
+        }
+        form = grouped_averages(recent, ['player_id'], stats)
+        form[f'wins_last_{games}'] = (
+            recent['wl'].eq('W').groupby(recent['player_id']).sum().to_numpy()
+        )
+        return _sort_desc(form.drop(columns='games'), f'avg_points_last_{games}')
+    
+    @cached_query(players='player_name')
+    def get_rolling_stats(self, player_name: str) -> pd.DataFrame:
+        """Get rolling averages, EWM form and streaks for every game of a player."""
+        rolling = self.store.table(ROLLING_TABLE)
+        return rolling[rolling['player_id'] == player_name].reset_index(drop=True)
+    
+    @cached_query
+    def get_current_form(self) -> pd.DataFrame:
+        """Get each player's rolling stats as of their latest game."""
+        latest = self.store.table(ROLLING_TABLE).groupby('player_id', sort=False).tail(1)
+        return (latest.sort_values(['pts_avg_10', 'player_id'], ascending=[False, True],
+                                   kind='stable', na_position='first')
+                .reset_index(drop=True))
+    
+    @cached_query
     def get_triple_doubles(self) -> pd.DataFrame:
         """Get all triple-double games."""
-        query = """
-        SELECT 
-            player_id,
-            game_date,
-            matchup,
-            pts, reb, ast, stl, blk
-        FROM nba_5
-        WHERE pts >= 10 AND reb >= 10 AND ast >= 10
-        ORDER BY game_date DESC
-        """
-        return pd.read_sql(query, self.engine)
+        df = self._games()
+        triple_doubles = df[(df['pts'] >= 10) & (df['reb'] >= 10) & (df['ast'] >= 10)]
+        return (triple_doubles[['player_id', 'game_date', 'matchup', 'pts', 'reb', 'ast', 'stl', 'blk']]
+                .sort_values(['game_date', 'player_id'], ascending=[False, True], kind='stable')
+                .reset_index(drop=True))
     
+    @cached_query
     def home_vs_away(self) -> pd.DataFrame:
         """Compare home vs away performance."""
-        query = """
-        SELECT 
-            player_id,
-            location,
-            COUNT(*) as games,
-            ROUND(AVG(pts), 2) as avg_points,
-            ROUND(AVG(reb), 2) as avg_rebounds,
-            ROUND(AVG(ast), 2) as avg_assists,
-            ROUND(AVG(fg_pct), 2) as avg_fg_pct,
-            ROUND(SUM(CASE WHEN wl = 'W' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100, 2) as win_pct
-        FROM nba_5
-        WHERE location IN ('HOME', 'AWAY')
-        GROUP BY player_id, location
-        ORDER BY player_id, location
-        """
-        return pd.read_sql(query, self.engine)
+        df = self._games()
+        return grouped_averages(
+            df[df['location'].isin(['HOME', 'AWAY'])], ['player_id', 'location'],
+            {'pts': 'avg_points', 'reb': 'avg_rebounds', 'ast': 'avg_assists',
+             'fg_pct': 'avg_fg_pct'},
+            win_pct=True
+        )
+    
+    @cached_query
+    def conference_splits(self) -> pd.DataFrame:
+        """Compare performance against Eastern vs Western conference opponents."""
+        splits = grouped_averages(self._games(), ['player_id', 'conf'], SPLIT_STATS, win_pct=True)
+        return splits.rename(columns={'conf': 'conference'})
+    
+    @cached_query
+    def day_of_week_splits(self) -> pd.DataFrame:
+        """Compare performance by day of the week."""
+        splits = grouped_averages(
+            self._games(), ['player_id', 'day_of_week'],
+            {'pts': 'avg_points', 'fg_pct': 'avg_fg_pct'}
+        )
+        weekday = splits['day_of_week'].map({day: i for i, day in enumerate(calendar.day_name)})
+        return (splits.assign(_weekday=weekday)
+                .sort_values(['player_id', '_weekday'], kind='stable')
+                .drop(columns='_weekday')
+                .reset_index(drop=True))
+    
+    def iter_player_data(self, player_name: str,
+                         chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Stream all data for a specific player, oldest game first."""
+        yield from self.store.iter_batches(player_name, chunksize or config.ANALYZER_CHUNKSIZE)
+    
+    def _stream_aggregate(self, aggregate: RunningAggregate, table: str,
+                          chunksize: Optional[int]) -> pd.DataFrame:
+        """Fold a snapshot table's record batches into an aggregate."""
+        batches = self.store.iter_batches(
+            table, chunksize or config.ANALYZER_CHUNKSIZE, columns=aggregate.columns
+        )
+        for chunk in batches:
+            aggregate.update(chunk)
+        return aggregate.result()
 
 
-def main():
-    """Example usage of the analyzer."""
-    analyzer = NBAStatsAnalyzer()
+class CompactStatsAnalyzer(ColumnarStatsAnalyzer):
+    """
+    Analyzer that keeps the snapshot's game tables resident in compact form.
+    
+    Game tables are held dictionary encoded with narrow integer columns (see
+    ``compact``) and every game-table report runs as NumPy kernels over them,
+    returning the same results as the columnar backend. Rolling stats and
+    streaming reads are served by the columnar backend from the snapshot.
+    """
+    
+    def __init__(self, cache_size: Optional[int] = None,
+                 store: Optional['CompactStore'] = None):
+        """
+        Initialize the analyzer with a compact store.
+        
+        Args:
+            cache_size: Maximum cached query results (0 disables caching)
+            store: Compact store (defaults to one over ``config.SNAPSHOT_DIR``)
+        """
+        from compact import CompactStore
+        
+        self.compact = store or CompactStore()
+        super().__init__(cache_size=cache_size, store=self.compact.store)
+    
+    def _compact_games(self):
+        """Get the combined game table in compact form."""
+        return self.compact.table('nba_5')
+    
+    @cached_query
+    def get_career_averages(self) -> pd.DataFrame:
+        """Get career averages for all players."""
+        averages = self._compact_games().averages(
+            ['player_id'], CAREER_AVERAGE_STATS, count_column='games_played'
+        )
+        return _sort_desc(averages, 'avg_points')
+    
+    @cached_query(players='player_name')
+    def get_player_data(self, player_name: str) -> pd.DataFrame:
+        """Get all data for a specific player."""
+        player_name, = self._check_players([player_name])
+        return self.compact.table(player_name).to_frame()
+    
+    @cached_query
+    def get_top_performances(self, stat: str = 'pts', limit: int = 10) -> pd.DataFrame:
+        """Get top performances by a specific stat."""
+        stat, limit = validate_stat(stat), validate_count(limit, 'limit')
+        games = self._compact_games()
+        return games.to_frame(games.top(stat, limit), TOP_PERFORMANCE_COLUMNS)
+    
+    @cached_query(players='player_names')
+    def get_player_data_batch(self, player_names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """Get all data for several players."""
+        return {
+            name: self.compact.table(name).to_frame() for name in self._check_players(player_names)
+        }
+    
+    @cached_query
+    def get_top_performances_batch(self, stats: Iterable[str] = None,
+                                   limit: int = 10) -> Dict[str, pd.DataFrame]:
+        """Get top performances for several stats."""
+        stats = validate_stats(RANKED_STATS if stats is None else stats)
+        limit = validate_count(limit, 'limit')
+        games = self._compact_games()
+        return {stat: games.to_frame(games.top(stat, limit), TOP_PERFORMANCE_COLUMNS)
+                for stat in stats}
+    
+    @cached_query
+    def compare_players(self, stats: list = None) -> pd.DataFrame:
+        """Compare all players across specified stats."""
+        stats = validate_stats(stats)
+        averages = self._compact_games().averages(['player_id'], {s: f'avg_{s}' for s in stats})
+        return _sort_desc(averages, f'avg_{stats[0]}')
     
+    @cached_query
+    def get_recent_form(self, games: int = 10) -> pd.DataFrame:
+        """Get recent form for all players."""
+        games = validate_count(games, 'games')
+        table = self._compact_games()
+        columns = recent_form_columns(games)
+        stats = {'pts': columns['avg_points'], 'reb': columns['avg_rebounds'],
+                 'ast': columns['avg_assists']}
+        form = table.averages(['player_id'], stats, rows=table.most_recent(games),
+                              wins=columns['wins'])
+        return _sort_desc(form.drop(columns='games'), columns['avg_points'])
+    
+    @cached_query
+    def get_triple_doubles(self) -> pd.DataFrame:
+        """Get all triple-double games."""
+        table = self._compact_games()
+        rows = table.where_at_least({'pts': 10, 'reb': 10, 'ast': 10})
+        rows = table.sort(rows, [('game_date', True), ('player_id', False)])
+        return table.to_frame(
+            rows, ['player_id', 'game_date', 'matchup', 'pts', 'reb', 'ast', 'stl', 'blk']
+        )
+    
+    @cached_query
+    def home_vs_away(self) -> pd.DataFrame:
+        """Compare home vs away performance."""
+        table = self._compact_games()
+        return table.averages(
+            ['player_id', 'location'],
+            {'pts': 'avg_points', 'reb': 'avg_rebounds', 'ast': 'avg_assists',
+             'fg_pct': 'avg_fg_pct'},
+            rows=table.where_in('location', ['HOME', 'AWAY']), win_pct=True
+        )
+    
+    @cached_query
+    def conference_splits(self) -> pd.DataFrame:
+        """Compare performance against Eastern vs Western conference opponents."""
+        splits = self._compact_games().averages(['player_id', 'conf'], SPLIT_STATS, win_pct=True)
+        return splits.rename(columns={'conf': 'conference'})
+    
+    @cached_query
+    def day_of_week_splits(self) -> pd.DataFrame:
+        """Compare performance by day of the week."""
+        splits = self._compact_games().averages(
+            ['player_id', 'day_of_week'], {'pts': 'avg_points', 'fg_pct': 'avg_fg_pct'}
+        )
+        weekday = splits['day_of_week'].map({day: i for i, day in enumerate(calendar.day_name)})
+        return (splits.assign(_weekday=weekday)
+                .sort_values(['player_id', '_weekday'], kind='stable')
+                .drop(columns='_weekday')
+                .reset_index(drop=True))
+
+
+def create_analyzer(backend: Optional[str] = None, **kwargs) -> NBAStatsAnalyzer:
+    """
+    Create an analyzer for the configured backend.
+    
+    Args:
+        backend: 'database', 'columnar' or 'compact' (defaults to
+            ``config.ANALYZER_BACKEND``)
+        **kwargs: Passed to the analyzer
+        
+    Returns:
+        Analyzer instance
+    """
+    backend = backend or config.ANALYZER_BACKEND
+    if backend == 'columnar':
+        return ColumnarStatsAnalyzer(**kwargs)
+    if backend == 'compact':
+        return CompactStatsAnalyzer(**kwargs)
+    if backend == 'database':
+        return NBAStatsAnalyzer(**kwargs)
+    raise ValueError(
+        f"Unknown analyzer backend '{backend}', expected 'database', 'columnar' or 'compact'"
+    )
+
+
+def print_report(analyzer: NBAStatsAnalyzer):
+    """
+    Print the quick analysis report.
+    
+    Args:
+        analyzer: Analyzer to run the report's queries on
+    """
     print("=" * 60)
     print("NBA STATS QUICK ANALYSIS")
     print("=" * 60)
@@ -197,5 +766,10 @@ def main():
     print(analyzer.home_vs_away().to_string(index=False))
 
 
+def main():
+    """Example usage of the analyzer."""
+    print_report(create_analyzer())
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,198 @@
+"""
+Asyncio interface to the NBA stats analyzer.
+
+Queries run on SQLAlchemy's async engine (asyncpg for PostgreSQL, aiosqlite
+for SQLite), and identical requests that are already in flight share one
+database query.
+"""
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+import pandas as pd
+from sqlalchemy import Connection
+
+from analyze_stats import NBAStatsAnalyzer
+from database import create_async_pooled_engine
+from metrics import QueryMetrics
+from query_cache import _copy_result, _freeze
+
+
+class _BoundAnalyzer(NBAStatsAnalyzer):
+    """Synchronous analyzer bound to one connection of the async engine."""
+
+    def __init__(self, connection: Connection):
+        self.engine = connection
+        self.query_cache = None
+        self.query_metrics = None
+
+
+class AsyncNBAStatsAnalyzer:
+    """
+    Async counterpart of ``NBAStatsAnalyzer`` with the same report methods.
+
+    Each report runs the synchronous analyzer's query on an async engine
+    connection, so no thread pool is needed. Concurrent calls with the same
+    arguments are coalesced into one query; every caller receives its own
+    copy of the result. Per-report latency, as seen by each caller, is
+    recorded in ``query_metrics``.
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        """
+        Initialize the analyzer with an async database engine.
+
+        The engine (and its async driver) is created on the first query.
+
+        Args:
+            url: Database URL (defaults to ``config.database_url``)
+        """
+        self.url = url
+        self._engine = None
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.query_metrics = QueryMetrics()
+        self.queries = 0
+        self.coalesced = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def engine(self):
+        """Async database engine owned by this analyzer."""
+        if self._engine is None:
+            self._engine = create_async_pooled_engine(self.url)
+        return self._engine
+
+    async def close(self):
+        """Close the engine's pooled connections."""
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    async def _run_report(self, method: str, *args, **kwargs) -> Any:
+        """Run an analyzer method on a pooled async connection."""
+        async with self.engine.connect() as conn:
+            return await conn.run_sync(
+                lambda sync_conn: getattr(_BoundAnalyzer(sync_conn), method)(*args, **kwargs)
+            )
+
+    async def _report(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run a report, joining an identical request that is already running.
+
+        Args:
+            method: Name of the ``NBAStatsAnalyzer`` method
+            *args: Method arguments
+            **kwargs: Method keyword arguments
+
+        Returns:
+            Report result (a private copy for DataFrames)
+        """
+        key = (method, _freeze(args), _freeze(kwargs))
+        future = self._in_flight.get(key)
+        if future is None:
+            self.queries += 1
+            future = asyncio.ensure_future(self._run_report(method, *args, **kwargs))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # Shield the shared query so one cancelled caller does not cancel the rest
+        with self.query_metrics.timed(method):
+            result = await asyncio.shield(future)
+        return _copy_result(result)
+
+    async def get_load_generation(self):
+        """Get the generation stamp of the last successful ETL load."""
+        return await self._report('get_load_generation')
+
+    async def get_career_averages(self) -> pd.DataFrame:
+        """Get career averages for all players."""
+        return await self._report('get_career_averages')
+
+    async def get_player_data(self, player_name: str) -> pd.DataFrame:
+        """Get all data for a specific player."""
+        return await self._report('get_player_data', player_name)
+
+    async def get_top_performances(self, stat: str = 'pts', limit: int = 10) -> pd.DataFrame:
+        """Get top performances by a specific stat."""
+        return await self._report('get_top_performances', stat, limit)
+
+    async def get_player_data_batch(self, player_names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """Get all data for several players in one query."""
+        return await self._report('get_player_data_batch', list(player_names))
+
+    async def get_top_performances_batch(self, stats: Iterable[str] = None,
+                                         limit: int = 10) -> Dict[str, pd.DataFrame]:
+        """Get top performances for several stats in one query."""
+        stats = None if stats is None else list(stats)
+        return await self._report('get_top_performances_batch', stats, limit)
+
+    async def compare_players(self, stats: list = None) -> pd.DataFrame:
+        """Compare all players across specified stats."""
+        return await self._report('compare_players', stats)
+
+    async def get_recent_form(self, games: int = 10) -> pd.DataFrame:
+        """Get recent form for all players."""
+        return await self._report('get_recent_form', games)
+
+    async def get_rolling_stats(self, player_name: str) -> pd.DataFrame:
+        """Get rolling averages, EWM form and streaks for every game of a player."""
+        return await self._report('get_rolling_stats', player_name)
+
+    async def get_current_form(self) -> pd.DataFrame:
+        """Get each player's rolling stats as of their latest game."""
+        return await self._report('get_current_form')
+
+    async def get_triple_doubles(self) -> pd.DataFrame:
+        """Get all triple-double games."""
+        return await self._report('get_triple_doubles')
+
+    async def home_vs_away(self) -> pd.DataFrame:
+        """Compare home vs away performance."""
+        return await self._report('home_vs_away')
+
+    async def conference_splits(self) -> pd.DataFrame:
+        """Compare performance against Eastern vs Western conference opponents."""
+        return await self._report('conference_splits')
+
+    async def day_of_week_splits(self) -> pd.DataFrame:
+        """Compare performance by day of the week."""
+        return await self._report('day_of_week_splits')
+
+    async def dashboard(self, recent_games: int = 10, top: int = 5) -> Dict[str, pd.DataFrame]:
+        """
+        Run the reports shown by ``analyze_stats.main`` concurrently.
+
+        Args:
+            recent_games: Games for the recent form report
+            top: Number of top scoring performances
+
+        Returns:
+            Mapping of report name to result
+        """
+        names = ['career_averages', 'recent_form', 'top_performances', 'triple_doubles',
+                 'home_vs_away']
+        results = await asyncio.gather(
+            self.get_career_averages(),
+            self.get_recent_form(recent_games),
+            self.get_top_performances('pts', top),
+            self.get_triple_doubles(),
+            self.home_vs_away(),
+        )
+        return dict(zip(names, results))
+
+
+async def main():
+    """Print the example dashboard, fetched concurrently."""
+    async with AsyncNBAStatsAnalyzer() as analyzer:
+        for name, report in (await analyzer.dashboard()).items():
+            print(f"\n{name}:")
+            print(report.to_string(index=False))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
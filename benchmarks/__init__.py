@@ -0,0 +1 @@
+"""Performance benchmarks for the NBA Stats ETL and analysis tools."""
@@ -0,0 +1,93 @@
+"""
+Benchmark concurrent dashboard requests against the analyzer.
+
+Fires ``--requests`` concurrent report requests (a mix of the dashboard
+reports) and compares latency percentiles for the synchronous analyzer run
+in threads with ``AsyncNBAStatsAnalyzer``. Result caching is disabled for
+the synchronous analyzer so both paths hit the database.
+
+Usage:
+    python -m benchmarks.bench_async --url sqlite:///data/nba.db --requests 500
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from analyze_stats import NBAStatsAnalyzer
+from async_analyzer import AsyncNBAStatsAnalyzer
+from config import config
+
+REPORTS = [
+    ('get_career_averages', ()),
+    ('get_recent_form', (10,)),
+    ('get_top_performances', ('pts', 5)),
+    ('get_triple_doubles', ()),
+    ('home_vs_away', ()),
+]
+
+
+def _summarize(mode: str, latencies, elapsed: float) -> dict:
+    """Latency percentiles for one benchmark mode."""
+    ms = np.asarray(latencies) * 1000
+    result = {
+        'mode': mode,
+        'requests': len(ms),
+        'p50_ms': round(float(np.percentile(ms, 50)), 1),
+        'p99_ms': round(float(np.percentile(ms, 99)), 1),
+        'max_ms': round(float(ms.max()), 1),
+        'requests_per_sec': round(len(ms) / elapsed),
+    }
+    print(f"{mode:<8} p50 {result['p50_ms']:>8.1f} ms  p99 {result['p99_ms']:>8.1f} ms  "
+          f"max {result['max_ms']:>8.1f} ms  {result['requests_per_sec']:>6,} req/s")
+    return result
+
+
+async def _timed(call):
+    """Await a call and return its latency in seconds."""
+    start = time.perf_counter()
+    await call
+    return time.perf_counter() - start
+
+
+async def bench_threads(url: str, requests: int) -> dict:
+    """Serve requests with the synchronous analyzer in the default thread pool."""
+    config.DATABASE_URL = url
+    analyzer = NBAStatsAnalyzer(cache_size=0)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*[
+        _timed(asyncio.to_thread(getattr(analyzer, name), *args))
+        for name, args in (REPORTS[i % len(REPORTS)] for i in range(requests))
+    ])
+    return _summarize('threads', latencies, time.perf_counter() - start)
+
+
+async def bench_async(url: str, requests: int) -> dict:
+    """Serve requests with the async analyzer."""
+    async with AsyncNBAStatsAnalyzer(url) as analyzer:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*[
+            _timed(getattr(analyzer, name)(*args))
+            for name, args in (REPORTS[i % len(REPORTS)] for i in range(requests))
+        ])
+        result = _summarize('async', latencies, time.perf_counter() - start)
+        print(f"         {analyzer.queries} queries for {requests} requests "
+              f"({analyzer.coalesced} coalesced)")
+    return result
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', default=None, help='Database URL (defaults to config)')
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    url = args.url or config.database_url
+    asyncio.run(bench_threads(url, args.requests))
+    asyncio.run(bench_async(url, args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark the compact in-memory store against the snapshot DataFrames.
+
+Writes a synthetic league's ``nba_5`` table as a Parquet snapshot, then
+compares the memory held by the DataFrame the columnar analyzer reads with
+the compact store's encoding, checks that both backends return identical
+reports and times each report. Exits non-zero when the memory reduction is
+below ``--min-ratio``.
+
+Usage:
+    python -m benchmarks.bench_compact --players 500 --games 1000
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from analyze_stats import ColumnarStatsAnalyzer, CompactStatsAnalyzer
+from benchmarks.synthetic import generate_game_log
+from columnar import ColumnarStore, write_snapshot
+from compact import CompactStore
+from nba_stats_etl import NBAStatsETL
+from schema import COMBINED_TABLE, GAME_COLUMN_NAMES
+
+# Reports compared between the backends, with their arguments
+REPORTS = [
+    ('get_career_averages', ()),
+    ('get_top_performances', ('pts', 10)),
+    ('get_top_performances_batch', (None, 10)),
+    ('compare_players', (['pts', 'reb', 'ast', 'fg_pct'],)),
+    ('get_recent_form', (10,)),
+    ('get_triple_doubles', ()),
+    ('home_vs_away', ()),
+    ('conference_splits', ()),
+    ('day_of_week_splits', ()),
+]
+
+
+def build_games(players: int, games: int) -> pd.DataFrame:
+    """
+    Build a combined game table for a synthetic league.
+
+    Columns get the dtypes ``pd.read_sql`` returns (object strings, int64
+    integers), as in the snapshots the ETL writes from the database.
+    """
+    etl = NBAStatsETL(players={})
+    frames = [
+        etl.transform_player_data(generate_game_log(player_id, games), f'player_{player_id:05d}')
+        for player_id in range(1, players + 1)
+    ]
+    df = pd.concat(frames, ignore_index=True).rename(columns=str.lower)[GAME_COLUMN_NAMES]
+    return df.astype({
+        column: 'int64' if dtype.kind in 'iu' else object
+        for column, dtype in df.dtypes.items() if dtype.kind in 'iuO' or dtype == 'category'
+    })
+
+
+def run_benchmark(players: int, games: int, repeat: int = 5) -> dict:
+    """
+    Compare memory and report latency of the columnar and compact backends.
+
+    Args:
+        players: Players in the synthetic league
+        games: Games per player
+        repeat: Timed runs per report (the best is kept)
+
+    Returns:
+        Dict with the memory of each representation, their ratio and the
+        per-report timings in seconds
+    """
+    with tempfile.TemporaryDirectory() as root:
+        write_snapshot({COMBINED_TABLE: build_games(players, games)}, generation=1, root=root)
+        store = ColumnarStore(root)
+        columnar = ColumnarStatsAnalyzer(cache_size=0, store=store)
+        compact = CompactStatsAnalyzer(cache_size=0, store=CompactStore(store))
+
+        frame_bytes = int(store.table(COMBINED_TABLE).memory_usage(deep=True).sum())
+        compact_bytes = compact.compact.table(COMBINED_TABLE).nbytes
+        results = {
+            'rows': players * games,
+            'frame_bytes': frame_bytes,
+            'compact_bytes': compact_bytes,
+            'ratio': round(frame_bytes / compact_bytes, 1),
+            'reports': {},
+        }
+        print(f"{players * games:,} games: DataFrame {frame_bytes / 1e6:,.1f} MB, "
+              f"compact {compact_bytes / 1e6:,.1f} MB ({results['ratio']}x smaller)")
+
+        for method, args in REPORTS:
+            expected, actual = getattr(columnar, method)(*args), getattr(compact, method)(*args)
+            for key in (expected if isinstance(expected, dict) else [None]):
+                pd.testing.assert_frame_equal(
+                    expected if key is None else expected[key], actual if key is None else actual[key]
+                )
+
+            timings = {}
+            for name, analyzer in (('columnar', columnar), ('compact', compact)):
+                runs = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    getattr(analyzer, method)(*args)
+                    runs.append(time.perf_counter() - start)
+                timings[name] = round(min(runs), 6)
+            results['reports'][method] = timings
+            print(f"{method:<28} columnar {timings['columnar'] * 1000:8.2f} ms  "
+                  f"compact {timings['compact'] * 1000:8.2f} ms  "
+                  f"{timings['columnar'] / timings['compact']:6.1f}x")
+    return results
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--games', type=int, default=1_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-ratio', type=float, default=5.0,
+                        help='Smallest acceptable memory reduction')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = run_benchmark(args.players, args.games, args.repeat)
+    sys.exit(0 if results['ratio'] >= args.min_ratio else 1)
+
+
+if __name__ == '__main__':
+    main()
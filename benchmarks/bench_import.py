@@ -0,0 +1,135 @@
+"""
+Check entry point import times against a startup budget.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``.
+The budget covers the project's own modules (the best of ``--repeat`` runs):
+pandas and SQLAlchemy dominate the total and vary with the machine, while
+work added to the project's import path shows up here. Each entry point must
+also leave its deferred modules unimported, so a heavy dependency pulled in
+eagerly fails the check however fast the machine is. Exits non-zero when a
+check fails, so it can run in CI; tests/test_import_time.py runs it too.
+
+Usage:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --repeat 5 --scale 2
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Import time of the project's own modules per entry point, in milliseconds
+IMPORT_BUDGETS_MS = {
+    'cli': 10,
+    'config': 10,
+    'analyze_stats': 50,
+    'nba_stats_etl': 50,
+}
+
+# Modules that ``cli`` must leave to its subcommands
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'sqlalchemy', 'nba_api', 'dotenv')
+
+# Snapshot backends, Parquet, the transform pool and the NBA API client
+SNAPSHOT_MODULES = ('columnar', 'compact', 'pyarrow.parquet', 'pipeline', 'nba_api')
+
+# Modules each entry point must not import until they are used
+DEFERRED_MODULES = {
+    'cli': HEAVY_MODULES,
+    'config': ('pandas', 'numpy', 'pyarrow', 'sqlalchemy', 'nba_api'),
+    'analyze_stats': SNAPSHOT_MODULES + ('nba_stats_etl',),
+    'nba_stats_etl': SNAPSHOT_MODULES + ('analyze_stats',),
+}
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def project_modules() -> Set[str]:
+    """Top-level module and package names of the project."""
+    return {path.stem for path in ROOT.glob('*.py')} | {'benchmarks'}
+
+
+def import_times(module: str) -> Dict[str, tuple]:
+    """
+    Import a module in a fresh interpreter and read ``-X importtime``.
+
+    Args:
+        module: Module name to import
+
+    Returns:
+        Mapping of every imported module to its self and cumulative time in
+        microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def check_budgets(budgets: Dict[str, float], repeat: int = 3) -> List[dict]:
+    """
+    Time each module's import and check it against its budget.
+
+    Args:
+        budgets: Mapping of module name to the budget for the project's own
+            modules in milliseconds
+        repeat: Imports per module; the fastest is kept
+
+    Returns:
+        List of result dicts with module, total and project milliseconds,
+        budget, deferred modules that were imported and whether the check passed
+    """
+    own = project_modules()
+    results = []
+    for module, budget in budgets.items():
+        runs = [import_times(module) for _ in range(repeat)]
+        total_ms = min(times[module][1] for times in runs) / 1000
+        project_ms = min(
+            sum(self_us for name, (self_us, _) in times.items() if name.split('.')[0] in own)
+            for times in runs
+        ) / 1000
+        eager = [name for name in DEFERRED_MODULES.get(module, ()) if name in runs[0]]
+        results.append({
+            'module': module,
+            'ms': round(total_ms, 1),
+            'project_ms': round(project_ms, 1),
+            'budget_ms': budget,
+            'eager_imports': eager,
+            'ok': project_ms <= budget and not eager,
+        })
+    return results
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per module (best is kept)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply every budget (e.g., for slow CI machines)')
+    parser.add_argument('--module', nargs='+', choices=sorted(IMPORT_BUDGETS_MS),
+                        default=list(IMPORT_BUDGETS_MS))
+    args = parser.parse_args()
+
+    budgets = {name: IMPORT_BUDGETS_MS[name] * args.scale for name in args.module}
+    results = check_budgets(budgets, args.repeat)
+    for result in results:
+        status = 'OK  ' if result['ok'] else 'OVER'
+        line = (f"{status} {result['module']:<15} {result['project_ms']:>6.1f} ms project "
+                f"(budget {result['budget_ms']:,.0f} ms), {result['ms']:>7.1f} ms total")
+        if result['eager_imports']:
+            line += f"  imports {', '.join(result['eager_imports'])}"
+        print(line)
+    sys.exit(0 if all(result['ok'] for result in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
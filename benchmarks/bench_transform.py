@@ -0,0 +1,130 @@
+"""
+Benchmark ``NBAStatsETL.transform_player_data``.
+
+Times the vectorized transform against the original per-row ``apply``
+implementation on a synthetic game log and reports the speedup and the
+memory footprint of each result.
+
+Usage:
+    python -m benchmarks.bench_transform --rows 1000000
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_game_log
+from config import config
+from nba_stats_etl import NBAStatsETL
+
+GAMES_PER_PLAYER = 1_000
+
+
+def legacy_transform(df: pd.DataFrame, player_name: str) -> pd.DataFrame:
+    """Original row-wise transform, kept as the benchmark baseline."""
+    def get_division(team_code):
+        for division, teams in config.DIVISIONS.items():
+            if team_code in teams:
+                return division
+        return 'UNKNOWN'
+
+    def get_conference(team_code):
+        division = get_division(team_code)
+        for conference, divisions in config.CONFERENCES.items():
+            if division in divisions:
+                return conference
+        return 'UNKNOWN'
+
+    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
+    df = df.sort_values(by='GAME_DATE', ascending=True)
+    df = df.drop(['SEASON_ID', 'Game_ID', 'VIDEO_AVAILABLE'], axis=1, errors='ignore')
+    df['FG_PCT'] = (df['FG_PCT'] * 100).round(2)
+    df['FG3_PCT'] = (df['FG3_PCT'] * 100).round(2)
+    df['FT_PCT'] = (df['FT_PCT'] * 100).round(2)
+    df['YEAR'] = df['GAME_DATE'].dt.year
+    df['MONTH'] = df['GAME_DATE'].dt.month_name()
+    df['DAY'] = df['GAME_DATE'].dt.day
+    df['DAY_OF_WEEK'] = df['GAME_DATE'].dt.day_name()
+    df['OPP'] = df['MATCHUP'].str[-3:]
+    df['DIV'] = df['OPP'].apply(get_division)
+    df['CONF'] = df['OPP'].apply(get_conference)
+    df['LOCATION'] = df['MATCHUP'].apply(
+        lambda x: 'HOME' if 'vs.' in x else 'AWAY' if '@' in x else ''
+    )
+    df['G'] = np.arange(1, len(df) + 1)
+    df['Player_ID'] = player_name
+    return df
+
+
+def build_raw_log(rows: int) -> pd.DataFrame:
+    """Build a raw game log of ``rows`` games by stacking synthetic players."""
+    frames = [
+        generate_game_log(player_id, GAMES_PER_PLAYER)
+        for player_id in range(1, -(-rows // GAMES_PER_PLAYER) + 1)
+    ]
+    return pd.concat(frames, ignore_index=True).head(rows)
+
+
+def time_transform(func, raw: pd.DataFrame, repeat: int):
+    """Return the best wall time over ``repeat`` runs and the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        df = raw.copy()
+        start = time.perf_counter()
+        result = func(df, 'bench_player')
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(rows: int, repeat: int = 1) -> dict:
+    """
+    Compare legacy and vectorized transform throughput.
+
+    Args:
+        rows: Number of games in the synthetic log
+        repeat: Runs per implementation (best time is kept)
+
+    Returns:
+        Dict with timings, rows/sec, speedup and result memory in bytes
+    """
+    raw = build_raw_log(rows)
+    etl = NBAStatsETL()
+
+    legacy_time, legacy_df = time_transform(legacy_transform, raw, repeat)
+    vector_time, vector_df = time_transform(etl.transform_player_data, raw, repeat)
+
+    result = {
+        'rows': rows,
+        'legacy_seconds': round(legacy_time, 4),
+        'vectorized_seconds': round(vector_time, 4),
+        'legacy_rows_per_sec': round(rows / legacy_time),
+        'vectorized_rows_per_sec': round(rows / vector_time),
+        'speedup': round(legacy_time / vector_time, 2),
+        'legacy_bytes': int(legacy_df.memory_usage(deep=True).sum()),
+        'vectorized_bytes': int(vector_df.memory_usage(deep=True).sum()),
+    }
+
+    print(f"Rows:        {rows:,}")
+    print(f"Legacy:      {legacy_time:8.3f}s  {result['legacy_rows_per_sec']:>12,} rows/sec  "
+          f"{result['legacy_bytes'] / 2**20:8.1f} MiB")
+    print(f"Vectorized:  {vector_time:8.3f}s  {result['vectorized_rows_per_sec']:>12,} rows/sec  "
+          f"{result['vectorized_bytes'] / 2**20:8.1f} MiB")
+    print(f"Speedup:     {result['speedup']:.1f}x")
+    return result
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    run_benchmark(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
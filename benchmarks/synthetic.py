@@ -0,0 +1,218 @@
+"""Synthetic game log generation for benchmarks and tests."""
+import random
+import threading
+import time
+from typing import Iterator, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from extraction import GameLogSource
+
+TEAMS = sorted({team for teams in config.DIVISIONS.values() for team in teams})
+
+# Players generated at each benchmark scale
+SCALES = {
+    'small': 5,
+    'medium': 50,
+    'large': 500,
+    'league': 5_000,
+}
+
+MAX_SEASONS = 20
+GAMES_PER_SEASON = (55, 82)
+
+
+def generate_game_log(player_id: int, games: int, seed: Optional[int] = None,
+                      start: str = '2003-10-28') -> pd.DataFrame:
+    """
+    Generate a raw game log shaped like the ``PlayerGameLog`` endpoint result.
+
+    Args:
+        player_id: Player ID written to the ``Player_ID`` column
+        games: Number of games to generate
+        seed: Random seed (defaults to ``player_id``)
+        start: Date of the first game
+
+    Returns:
+        DataFrame with the endpoint's columns, most recent game first
+    """
+    rng = np.random.default_rng(player_id if seed is None else seed)
+    gaps = rng.integers(1, 4, games)
+    dates = pd.Timestamp(start) + pd.to_timedelta(np.cumsum(gaps) - gaps[0], unit='D')
+
+    team = rng.choice(TEAMS)
+    opponents = pd.Series(rng.choice(TEAMS, games))
+    home = rng.random(games) < 0.5
+    matchup = np.where(home, f'{team} vs. ' + opponents, f'{team} @ ' + opponents)
+
+    fga = rng.integers(5, 30, games)
+    fgm = rng.binomial(fga, 0.48)
+    fg3a = rng.integers(0, 12, games)
+    fg3m = rng.binomial(fg3a, 0.36)
+    fta = rng.integers(0, 14, games)
+    ftm = rng.binomial(fta, 0.78)
+    oreb = rng.integers(0, 5, games)
+    dreb = rng.integers(0, 12, games)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df = pd.DataFrame({
+            'SEASON_ID': '2' + pd.Series(dates.year.astype(str)),
+            'Player_ID': player_id,
+            'Game_ID': [f'{player_id:07d}{i:05d}' for i in range(games)],
+            'GAME_DATE': dates.strftime('%b %d, %Y').str.upper(),
+            'MATCHUP': matchup,
+            'WL': rng.choice(['W', 'L'], games),
+            'MIN': rng.integers(10, 48, games),
+            'FGM': fgm,
+            'FGA': fga,
+            'FG_PCT': np.round(fgm / fga, 3),
+            'FG3M': fg3m,
+            'FG3A': fg3a,
+            'FG3_PCT': np.round(np.where(fg3a > 0, fg3m / fg3a, 0), 3),
+            'FTM': ftm,
+            'FTA': fta,
+            'FT_PCT': np.round(np.where(fta > 0, ftm / fta, 0), 3),
+            'OREB': oreb,
+            'DREB': dreb,
+            'REB': oreb + dreb,
+            'AST': rng.integers(0, 15, games),
+            'STL': rng.integers(0, 5, games),
+            'BLK': rng.integers(0, 5, games),
+            'TOV': rng.integers(0, 7, games),
+            'PF': rng.integers(0, 6, games),
+            'PTS': 2 * (fgm - fg3m) + 3 * fg3m + ftm,
+            'PLUS_MINUS': rng.integers(-25, 26, games),
+            'VIDEO_AVAILABLE': 1,
+        })
+
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def career_games(player_id: int, seed: int = 0) -> int:
+    """
+    Number of games in a synthetic player's full career.
+
+    Careers last 1 to ``MAX_SEASONS`` seasons of 55 to 82 games, so a
+    league-scale run mixes rookies with long careers like the real one.
+
+    Args:
+        player_id: Player ID
+        seed: Seed shared by every player of a generated league
+
+    Returns:
+        Career games
+    """
+    rng = np.random.default_rng([seed, player_id])
+    seasons = int(rng.integers(1, MAX_SEASONS + 1))
+    return int(rng.integers(*GAMES_PER_SEASON, size=seasons, endpoint=True).sum())
+
+
+def generate_career(player_id: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic player's full-career game log.
+
+    Args:
+        player_id: Player ID
+        seed: Seed shared by every player of a generated league
+
+    Returns:
+        Raw game log, most recent game first
+    """
+    games = career_games(player_id, seed)
+    return generate_game_log(player_id, games, seed=seed * 100_003 + player_id)
+
+
+def player_name(player_id: int) -> str:
+    """Table name of a synthetic player."""
+    return f"player_{player_id:05d}"
+
+
+def generate_league(players: int, seed: int = 0) -> Iterator[Tuple[str, int, pd.DataFrame]]:
+    """
+    Generate full-career game logs for a league of synthetic players.
+
+    Logs are generated one player at a time, so a league-scale benchmark
+    never holds every career in memory.
+
+    Args:
+        players: Number of players
+        seed: Seed shared by every player
+
+    Yields:
+        Player name, player ID and raw game log
+    """
+    for player_id in range(1, players + 1):
+        yield player_name(player_id), player_id, generate_career(player_id, seed)
+
+
+class SyntheticGameLogSource(GameLogSource):
+    """Game log source serving synthetic careers, for running the ETL offline."""
+
+    def __init__(self, seed: int = 0):
+        """
+        Initialize the source.
+
+        Args:
+            seed: Seed shared by every player
+        """
+        self.seed = seed
+
+    def fetch(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
+        """Generate a player's career (or the last season's worth of games)."""
+        raw = generate_career(player_id, self.seed)
+        return raw.head(GAMES_PER_SEASON[1]) if season else raw
+
+
+class FaultyGameLogSource(GameLogSource):
+    """
+    Game log source that adds latency and failures to another source.
+
+    Stands in for the NBA API when exercising concurrent extraction, rate
+    limiting and retries: every fetch sleeps for ``latency`` seconds and a
+    ``failure_rate`` share of them raise ``error``. Calls, injected failures
+    and the most fetches seen in flight at once are counted.
+    """
+
+    def __init__(self, source: Optional[GameLogSource] = None, latency: float = 0.0,
+                 failure_rate: float = 0.0, error: Type[Exception] = ConnectionError,
+                 seed: int = 0):
+        """
+        Initialize the source.
+
+        Args:
+            source: Source serving the game logs (defaults to synthetic careers)
+            latency: Seconds each fetch takes
+            failure_rate: Share of fetches that fail, between 0 and 1
+            error: Exception type raised by a failing fetch
+            seed: Seed for choosing which fetches fail
+        """
+        self.source = source or SyntheticGameLogSource()
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.error = error
+        self.calls = 0
+        self.failures = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
+        """Fetch from the wrapped source after the injected latency, or fail."""
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            fail = self._random.random() < self.failure_rate
+        try:
+            time.sleep(self.latency)
+            if fail:
+                with self._lock:
+                    self.failures += 1
+                raise self.error(f"Injected failure fetching player {player_id}")
+            return self.source.fetch(player_id, season)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
@@ -0,0 +1,306 @@
+"""Per-player change log written by each load, and notifications of new loads."""
+import json
+import logging
+import selectors
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+import pandas as pd
+from sqlalchemy import MetaData, Table, and_, case, func, inspect, or_, select, text
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+CHANGE_COUNTS = ['new_games', 'corrected_games', 'removed_games']
+
+EVENT_TARGETS = ('file', 'notify')
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+def player_change(new_games: int = 0, corrected_games: int = 0, removed_games: int = 0,
+                  first_game_date: Optional[pd.Timestamp] = None) -> dict:
+    """
+    Describe how one player's games changed in a load.
+
+    Args:
+        new_games: Games that were not stored before
+        corrected_games: Stored games whose stat line changed
+        removed_games: Stored games missing from the reloaded career
+        first_game_date: Earliest game that was added, corrected or removed
+
+    Returns:
+        Change record as stored in the change log
+    """
+    return {
+        'new_games': int(new_games),
+        'corrected_games': int(corrected_games),
+        'removed_games': int(removed_games),
+        'first_game_date': None if pd.isna(first_game_date) else pd.Timestamp(first_game_date),
+    }
+
+
+def diff_staged_games(conn, staged: Table, games: Table, keys: List[int]) -> Dict[int, dict]:
+    """
+    Compare staged careers with the stored games of the same players.
+
+    Runs in the database before the staged rows replace the stored ones:
+    staged games without a stored game on the same date are new, staged
+    games that differ from the stored one in any column are corrections and
+    stored games without a staged one are removed.
+
+    Args:
+        conn: Connection with an open transaction
+        staged: Games staging table
+        games: Games table
+        keys: Player keys of the staged players
+
+    Returns:
+        Mapping of player key to its change record, for players with changes
+    """
+    if not keys:
+        return {}
+    same_game = and_(games.c.player_key == staged.c.player_key,
+                     games.c.game_date == staged.c.game_date)
+    is_new = games.c.player_key.is_(None)
+    differs = or_(*[
+        staged.c[c.name].is_distinct_from(games.c[c.name])
+        for c in staged.c if c.name not in ('player_key', 'game_date')
+    ])
+    changed = select(
+        staged.c.player_key,
+        func.sum(case((is_new, 1), else_=0)).label('new_games'),
+        func.sum(case((and_(~is_new, differs), 1), else_=0)).label('corrected_games'),
+        func.min(case((or_(is_new, differs), staged.c.game_date))).label('first_game_date'),
+    ).select_from(staged.outerjoin(games, same_game)).where(
+        staged.c.player_key.in_(keys)
+    ).group_by(staged.c.player_key)
+    removed = select(
+        games.c.player_key,
+        func.count().label('removed_games'),
+        func.min(games.c.game_date).label('first_game_date'),
+    ).select_from(games.outerjoin(staged, same_game)).where(
+        games.c.player_key.in_(keys), staged.c.player_key.is_(None)
+    ).group_by(games.c.player_key)
+
+    diffs = {}
+    for key, new_games, corrected_games, first_date in conn.execute(changed):
+        if new_games or corrected_games:
+            diffs[key] = player_change(new_games, corrected_games, first_game_date=first_date)
+    for key, removed_games, first_date in conn.execute(removed):
+        diff = diffs.setdefault(key, player_change())
+        diff['removed_games'] = int(removed_games)
+        dates = [pd.Timestamp(d) for d in (diff['first_game_date'], first_date) if not pd.isna(d)]
+        diff['first_game_date'] = min(dates) if dates else None
+    return diffs
+
+
+def write_change_log(conn, generation: int, changes: Dict[str, dict],
+                     players: Dict[str, int], retention: Optional[int] = None):
+    """
+    Append a load's changed players to the change log.
+
+    Generations older than ``retention`` are pruned in the same transaction.
+
+    Args:
+        conn: Connection with the load's open transaction
+        generation: Load generation being published
+        changes: Mapping of player name to change record
+        players: Mapping of player name to player key
+        retention: Load generations to keep (defaults to
+            ``config.CHANGE_LOG_RETENTION``; 0 keeps every generation)
+    """
+    retention = config.CHANGE_LOG_RETENTION if retention is None else retention
+    if retention and inspect(conn).has_table(config.CHANGE_LOG_TABLE):
+        log = Table(config.CHANGE_LOG_TABLE, MetaData(), autoload_with=conn)
+        conn.execute(log.delete().where(log.c.generation <= generation - retention))
+    if not changes:
+        return
+
+    logged_at = datetime.now()
+    rows = pd.DataFrame([
+        {'generation': int(generation), 'player_name': name, 'player_key': players[name],
+         **change, 'logged_at': logged_at}
+        for name, change in sorted(changes.items())
+    ])
+    rows['first_game_date'] = pd.to_datetime(rows['first_game_date'])
+    rows.to_sql(config.CHANGE_LOG_TABLE, conn, if_exists='append', index=False)
+
+
+def read_change_log(conn, since: int, generation: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read the change log rows of the loads after a generation.
+
+    Args:
+        conn: SQLAlchemy connection or engine
+        since: Generation the caller already has
+        generation: Last generation to include (all later ones if None)
+
+    Returns:
+        DataFrame with one row per changed player and load, oldest first
+    """
+    if not inspect(conn).has_table(config.CHANGE_LOG_TABLE):
+        return pd.DataFrame(columns=['generation', 'player_name', 'player_key', *CHANGE_COUNTS,
+                                     'first_game_date', 'logged_at'])
+    log = Table(config.CHANGE_LOG_TABLE, MetaData(), autoload_with=conn)
+    query = select(log).where(log.c.generation > since)
+    if generation is not None:
+        query = query.where(log.c.generation <= generation)
+    return pd.read_sql(query.order_by(log.c.generation, log.c.player_name), conn,
+                       parse_dates=['first_game_date', 'logged_at'])
+
+
+def changed_players(conn, since: Optional[int], generation: Optional[int]) -> Optional[Set[str]]:
+    """
+    Get the players changed by the loads after ``since`` up to ``generation``.
+
+    Args:
+        conn: SQLAlchemy connection
+        since: Generation the caller's data belongs to
+        generation: Generation the caller is moving to
+
+    Returns:
+        Names of the changed players, or None when the log cannot tell (no
+        log, the generations are out of order or older loads were pruned),
+        in which case everything must be treated as changed
+    """
+    if since is None or generation is None or generation < since:
+        return None
+    if not inspect(conn).has_table(config.CHANGE_LOG_TABLE):
+        return None
+    log = Table(config.CHANGE_LOG_TABLE, MetaData(), autoload_with=conn)
+    first = conn.execute(select(func.min(log.c.generation))).scalar()
+    if first is None or first > since + 1:
+        return None
+    rows = conn.execute(
+        select(log.c.player_name).distinct()
+        .where(log.c.generation > since, log.c.generation <= generation)
+    )
+    return {name for (name,) in rows}
+
+
+def change_event(generation: int, changes: Dict[str, dict]) -> dict:
+    """
+    Build the notification for a published load.
+
+    Args:
+        generation: Published load generation
+        changes: Mapping of player name to change record
+
+    Returns:
+        JSON-serializable event with the changed players and total counts
+    """
+    event = {'generation': int(generation), 'players': sorted(changes)}
+    for count in CHANGE_COUNTS:
+        event[count] = sum(change[count] for change in changes.values())
+    event['published_at'] = datetime.now().isoformat(timespec='seconds')
+    return event
+
+
+def event_targets(targets: Optional[str] = None) -> List[str]:
+    """
+    Parse the configured event targets.
+
+    Args:
+        targets: Comma-separated targets, or 'none' (defaults to
+            ``config.CHANGE_EVENTS``)
+
+    Returns:
+        Enabled targets
+
+    Raises:
+        ValueError: If a target is unknown
+    """
+    targets = config.CHANGE_EVENTS if targets is None else targets
+    names = [name.strip() for name in targets.split(',') if name.strip() not in ('', 'none')]
+    unknown = sorted(set(names) - set(EVENT_TARGETS))
+    if unknown:
+        raise ValueError(f"Unknown CHANGE_EVENTS target(s) {unknown}, expected {EVENT_TARGETS}")
+    return names
+
+
+def emit_change_event(event: dict, engine=None, targets: Optional[List[str]] = None,
+                      path: Optional[Path] = None, channel: Optional[str] = None):
+    """
+    Send a load's change event to the configured targets.
+
+    'file' appends the event as a JSON line to ``path``; 'notify' sends it
+    with PostgreSQL ``NOTIFY`` on ``channel``. A notification too large for
+    NOTIFY is sent without its player list and marked ``truncated``, so
+    listeners read the change log instead.
+
+    Args:
+        event: Event from ``change_event``
+        engine: SQLAlchemy engine for 'notify'
+        targets: Targets from ``event_targets`` (defaults to ``config.CHANGE_EVENTS``)
+        path: Event file (defaults to ``config.CHANGE_EVENTS_FILE``)
+        channel: Notification channel (defaults to ``config.CHANGE_CHANNEL``)
+    """
+    for target in event_targets() if targets is None else targets:
+        if target == 'file':
+            path = Path(path or config.CHANGE_EVENTS_FILE)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(json.dumps(event) + '\n')
+        elif engine is None or engine.dialect.name != 'postgresql':
+            logger.warning("Skipping change notification: NOTIFY needs a PostgreSQL database")
+        else:
+            payload = json.dumps(event)
+            if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+                payload = json.dumps({**event, 'players': [], 'truncated': True})
+            with engine.begin() as conn:
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                             {'channel': channel or config.CHANGE_CHANNEL, 'payload': payload})
+    logger.info(f"Load generation {event['generation']} changed {len(event['players'])} players")
+
+
+def read_change_events(path: Optional[Path] = None, since: Optional[int] = None) -> List[dict]:
+    """
+    Read the events appended to the local event file.
+
+    Args:
+        path: Event file (defaults to ``config.CHANGE_EVENTS_FILE``)
+        since: Only return events for generations after this one
+
+    Returns:
+        Events, oldest first
+    """
+    path = Path(path or config.CHANGE_EVENTS_FILE)
+    if not path.exists():
+        return []
+    with open(path) as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    return [event for event in events if since is None or event['generation'] > since]
+
+
+def listen_for_changes(engine, channel: Optional[str] = None,
+                       timeout: Optional[float] = None) -> Iterator[dict]:
+    """
+    Wait for change notifications with PostgreSQL ``LISTEN``.
+
+    Holds one connection for as long as the iterator is consumed.
+
+    Args:
+        engine: SQLAlchemy engine for a PostgreSQL database (psycopg2)
+        channel: Notification channel (defaults to ``config.CHANGE_CHANNEL``)
+        timeout: Seconds to wait for the next notification before stopping
+            (waits forever if None)
+
+    Yields:
+        Events sent by ``emit_change_event``
+    """
+    channel = channel or config.CHANGE_CHANNEL
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.exec_driver_sql(f"LISTEN {conn.dialect.identifier_preparer.quote(channel)}")
+        dbapi_conn = conn.connection.driver_connection
+        with selectors.DefaultSelector() as selector:
+            selector.register(dbapi_conn, selectors.EVENT_READ)
+            while True:
+                if not selector.select(timeout):
+                    return
+                dbapi_conn.poll()
+                while dbapi_conn.notifies:
+                    yield json.loads(dbapi_conn.notifies.pop(0).payload)
@@ -0,0 +1,134 @@
+"""
+Command-line front end for the ETL pipeline and the analyzer.
+
+Only the standard library is imported up front; each subcommand imports the
+modules it needs when it runs, so ``--help``, argument errors and dispatch
+start without loading pandas, SQLAlchemy or the NBA API client.
+
+Usage:
+    python cli.py etl [--incremental | --full] [--roster rosters/league.csv]
+    python cli.py report [--backend columnar]
+    python cli.py query top_performances --stat pts --limit 5
+    python cli.py query player_data --player lebron_james --format csv
+"""
+import argparse
+import sys
+
+# Analyzer method behind each ``query`` name, and the options it takes
+QUERIES = {
+    'career_averages': ('get_career_averages', ()),
+    'player_data': ('get_player_data', ('player_name',)),
+    'top_performances': ('get_top_performances', ('stat', 'limit')),
+    'compare_players': ('compare_players', ('stats',)),
+    'recent_form': ('get_recent_form', ('games',)),
+    'rolling_stats': ('get_rolling_stats', ('player_name',)),
+    'current_form': ('get_current_form', ()),
+    'triple_doubles': ('get_triple_doubles', ()),
+    'home_vs_away': ('home_vs_away', ()),
+    'conference_splits': ('conference_splits', ()),
+    'day_of_week_splits': ('day_of_week_splits', ()),
+}
+
+OUTPUT_FORMATS = ('table', 'csv', 'json')
+
+BACKENDS = ('database', 'columnar', 'compact')
+
+
+def run_etl(args: argparse.Namespace) -> int:
+    """Run the ETL pipeline."""
+    from database import dispose_engines
+    from nba_stats_etl import NBAStatsETL, configure_logging
+
+    configure_logging()
+    players = None
+    if args.roster:
+        from roster import load_roster
+        players = load_roster(args.roster)
+    try:
+        NBAStatsETL(players=players).run(incremental=args.incremental)
+    finally:
+        dispose_engines()
+    return 0
+
+
+def run_report(args: argparse.Namespace) -> int:
+    """Print the quick analysis report."""
+    from analyze_stats import create_analyzer, print_report
+    from database import dispose_engines
+
+    try:
+        print_report(create_analyzer(args.backend))
+    finally:
+        dispose_engines()
+    return 0
+
+
+def run_query(args: argparse.Namespace) -> int:
+    """Run one analyzer query and write its result to stdout."""
+    from analyze_stats import create_analyzer
+    from database import dispose_engines
+
+    method, options = QUERIES[args.name]
+    kwargs = {name: getattr(args, name) for name in options if getattr(args, name) is not None}
+    if 'player_name' in options and 'player_name' not in kwargs:
+        args.parser.error(f"query {args.name} requires --player")
+
+    try:
+        result = getattr(create_analyzer(args.backend), method)(**kwargs)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        dispose_engines()
+
+    if args.format == 'csv':
+        result.to_csv(sys.stdout, index=False)
+    elif args.format == 'json':
+        print(result.to_json(orient='records', date_format='iso'))
+    else:
+        print(result.to_string(index=False))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    etl = commands.add_parser('etl', help='Run the ETL pipeline')
+    mode = etl.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true', default=None,
+                      help='Only fetch the current season for loaded players')
+    mode.add_argument('--full', dest='incremental', action='store_false',
+                      help='Reload every player\'s whole career')
+    etl.add_argument('--roster', help="Roster source: 'config', 'table' or a .csv/.json path")
+    etl.set_defaults(handler=run_etl)
+
+    report = commands.add_parser('report', help='Print the quick analysis report')
+    report.add_argument('--backend', choices=BACKENDS,
+                        help='Analyzer backend (defaults to ANALYZER_BACKEND)')
+    report.set_defaults(handler=run_report)
+
+    query = commands.add_parser('query', help='Run a single analyzer query')
+    query.add_argument('name', choices=sorted(QUERIES), help='Query to run')
+    query.add_argument('--player', dest='player_name', help='Player name')
+    query.add_argument('--stat', help='Stat to rank by (top_performances)')
+    query.add_argument('--stats', nargs='+', help='Stats to compare (compare_players)')
+    query.add_argument('--limit', type=int, help='Number of games (top_performances)')
+    query.add_argument('--games', type=int, help='Recent games window (recent_form)')
+    query.add_argument('--format', choices=OUTPUT_FORMATS, default='table', help='Output format')
+    query.add_argument('--backend', choices=BACKENDS,
+                       help='Analyzer backend (defaults to ANALYZER_BACKEND)')
+    query.set_defaults(handler=run_query, parser=query)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
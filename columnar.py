@@ -0,0 +1,230 @@
+"""Parquet snapshots of published tables, read by the in-process analyzer backends."""
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = 'CURRENT.json'
+
+
+def _generation_dir(root: Path, generation: int) -> Path:
+    """Directory holding one generation's snapshot."""
+    return root / f"g{int(generation)}"
+
+
+def _read_pointer(root: Path) -> Optional[dict]:
+    """Read a snapshot directory's ``CURRENT.json`` pointer, if there is one."""
+    try:
+        with open(root / CURRENT_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(frames: Dict[str, pd.DataFrame], generation: int,
+                   root: Optional[Path] = None, keep: int = 2,
+                   reused: Iterable[str] = (), changed: Optional[Iterable[str]] = None) -> Path:
+    """
+    Write one load generation's tables as Parquet and make it current.
+
+    Files go to a per-generation directory; the ``CURRENT.json`` pointer is
+    replaced atomically once every file is written, so readers always see a
+    complete generation. Older generations beyond ``keep`` are removed.
+
+    Tables in ``reused`` are unchanged since the current snapshot and are
+    hard linked from it instead of written. When ``changed`` is given, the
+    pointer records the changed players and the reused tables relative to
+    the previous generation, so readers can keep what they already loaded.
+
+    Args:
+        frames: Table name to published DataFrame
+        generation: Load generation the tables belong to
+        root: Snapshot directory (defaults to ``config.SNAPSHOT_DIR``)
+        keep: Generations to retain on disk
+        reused: Tables of the current snapshot to carry over unchanged
+        changed: Players changed since the current snapshot
+
+    Returns:
+        Directory holding the snapshot
+    """
+    root = Path(root or config.SNAPSHOT_DIR)
+    target = _generation_dir(root, generation)
+    target.mkdir(parents=True, exist_ok=True)
+    for table_name, df in frames.items():
+        tmp_path = target / f"{table_name}.parquet.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, target / f"{table_name}.parquet")
+
+    reused = sorted(set(reused) - set(frames))
+    previous = _read_pointer(root) if reused or changed is not None else None
+    if reused and (previous is None or previous['generation'] == generation):
+        raise ValueError("Reused tables need a current snapshot from an earlier generation")
+    for table_name in reused:
+        source = _generation_dir(root, previous['generation']) / f"{table_name}.parquet"
+        tmp_path = target / f"{table_name}.parquet.tmp"
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target / f"{table_name}.parquet")
+
+    current = {'generation': int(generation), 'tables': sorted(set(frames) | set(reused))}
+    if changed is not None and previous is not None:
+        current['changes'] = {
+            'since': previous['generation'], 'players': sorted(changed), 'reused': reused
+        }
+    pointer = root / CURRENT_FILE
+    tmp_pointer = root / f"{CURRENT_FILE}.tmp"
+    with open(tmp_pointer, 'w') as f:
+        json.dump(current, f)
+    os.replace(tmp_pointer, pointer)
+
+    generations = sorted(
+        int(path.name[1:]) for path in root.glob('g*')
+        if path.is_dir() and path.name[1:].isdigit()
+    )
+    for old in generations[:-keep] if keep else []:
+        if old != generation:
+            shutil.rmtree(_generation_dir(root, old), ignore_errors=True)
+
+    logger.info(
+        f"Wrote Parquet snapshot of {len(frames)} tables for generation {generation}"
+        + (f", reusing {len(reused)} unchanged tables" if reused else "")
+    )
+    return target
+
+
+def snapshot_changes(current: Optional[dict], since, generation) -> Optional[Set[str]]:
+    """
+    Get the players a snapshot records as changed since an earlier generation.
+
+    Args:
+        current: Snapshot pointer
+        since: Generation the caller's data belongs to
+        generation: Generation the caller is moving to
+
+    Returns:
+        Names of the changed players, or None if the pointer does not cover
+        the move from ``since`` to ``generation``
+    """
+    changes = (current or {}).get('changes')
+    if not changes or changes['since'] != since or current['generation'] != generation:
+        return None
+    return set(changes['players'])
+
+
+def reused_tables(current: Optional[dict], since) -> Set[str]:
+    """
+    Get the tables a snapshot carried over unchanged from generation ``since``.
+
+    Args:
+        current: Snapshot pointer
+        since: Generation of the tables the caller holds
+
+    Returns:
+        Names of the tables that can be kept (empty if unknown)
+    """
+    changes = (current or {}).get('changes')
+    if not changes or changes['since'] != since:
+        return set()
+    return set(changes['reused'])
+
+
+class ColumnarStore:
+    """
+    Read-only access to the current Parquet snapshot.
+
+    Tables are memory-mapped on first use and kept in memory until the
+    snapshot pointer moves to a new generation that changed them.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Snapshot directory (defaults to ``config.SNAPSHOT_DIR``)
+        """
+        self.root = Path(root or config.SNAPSHOT_DIR)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._frames_generation = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[dict]:
+        """Read the snapshot pointer, or None if nothing has been written."""
+        return _read_pointer(self.root)
+
+    def generation(self) -> Optional[int]:
+        """Get the load generation of the current snapshot."""
+        current = self.current()
+        return None if current is None else current['generation']
+
+    def _path(self, table_name: str, current: Optional[dict]) -> Path:
+        """Resolve a table's Parquet file in the current snapshot."""
+        if current is None:
+            raise LookupError(f"No Parquet snapshot in {self.root}; run the ETL first")
+        if table_name not in current['tables']:
+            raise LookupError(f"Table '{table_name}' is not in snapshot {current['generation']}")
+        return _generation_dir(self.root, current['generation']) / f"{table_name}.parquet"
+
+    def table(self, table_name: str) -> pd.DataFrame:
+        """
+        Get a table from the current snapshot.
+
+        Args:
+            table_name: Published table name
+
+        Returns:
+            DataFrame shared between callers; do not modify it
+        """
+        current = self.current()
+        path = self._path(table_name, current)
+        with self._lock:
+            if self._frames_generation != current['generation']:
+                kept = reused_tables(current, self._frames_generation)
+                self._frames = {name: df for name, df in self._frames.items() if name in kept}
+                self._frames_generation = current['generation']
+            if table_name not in self._frames:
+                self._frames[table_name] = pq.read_table(path, memory_map=True).to_pandas()
+            return self._frames[table_name]
+
+    def read_arrow(self, table_name: str, current: Optional[dict] = None) -> pa.Table:
+        """
+        Read a table of the snapshot as Arrow, bypassing the DataFrame cache.
+
+        Args:
+            table_name: Published table name
+            current: Snapshot pointer to read from (defaults to the current one)
+
+        Returns:
+            Memory-mapped Arrow table
+        """
+        return pq.read_table(self._path(table_name, current or self.current()), memory_map=True)
+
+    def iter_batches(self, table_name: str, batch_size: int,
+                     columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a table from the current snapshot in record batches.
+
+        Args:
+            table_name: Published table name
+            batch_size: Rows per batch
+            columns: Columns to read (all if None)
+
+        Yields:
+            DataFrames of at most ``batch_size`` rows
+        """
+        parquet = pq.ParquetFile(self._path(table_name, self.current()), memory_map=True)
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
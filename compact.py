@@ -0,0 +1,502 @@
+"""
+Compact in-memory copies of snapshot tables with NumPy report kernels.
+
+String columns are dictionary encoded (sorted dictionaries, so code order is
+string order), integer stats are stored in the narrowest integer type that
+holds them, percentages as fixed-point hundredths and game dates as int32
+day numbers. Tables are encoded straight from Arrow, so strings never become
+Python objects row by row.
+"""
+import logging
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from columnar import ColumnarStore, reused_tables
+from streaming import _round_ratio, _scale
+
+logger = logging.getLogger(__name__)
+
+SIGNED_TYPES = (np.int8, np.int16, np.int32, np.int64)
+CODE_TYPES = (np.uint8, np.uint16, np.uint32)
+
+
+def _narrowest(low: int, high: int, types=SIGNED_TYPES) -> np.dtype:
+    """Narrowest integer type holding every value from ``low`` to ``high``."""
+    for dtype in types:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(types[-1])
+
+
+class CompactColumn:
+    """
+    One encoded column.
+
+    Kinds:
+        'category': ``values`` are codes into the sorted ``dictionary`` (None,
+            for nulls, sorts last)
+        'int': integers times ``scale``, with ``null`` as the null sentinel
+        'date': day numbers since the epoch, with ``null`` as the null sentinel
+        'raw': the column as NumPy decoded it (kept when encoding would lose
+            information)
+    """
+
+    def __init__(self, kind: str, values: np.ndarray, dictionary: Optional[np.ndarray] = None,
+                 null: Optional[int] = None, scale: int = 1, dtype: Optional[np.dtype] = None):
+        """
+        Initialize the column.
+
+        Args:
+            kind: 'category', 'int', 'date' or 'raw'
+            values: Encoded values
+            dictionary: Code values of a 'category' column
+            null: Sentinel marking nulls in an 'int' or 'date' column
+            scale: Fixed-point scale of an 'int' column
+            dtype: NumPy type the column decodes to
+        """
+        self.kind = kind
+        self.values = values
+        self.dictionary = dictionary
+        self.null = null
+        self.scale = scale
+        self.dtype = dtype
+
+    @classmethod
+    def from_arrow(cls, name: str, array: pa.ChunkedArray) -> 'CompactColumn':
+        """
+        Encode an Arrow column.
+
+        Args:
+            name: Column name (``*_pct`` columns are stored as hundredths)
+            array: Column values
+
+        Returns:
+            Encoded column
+        """
+        if pa.types.is_null(array.type):
+            array = array.cast(pa.string())
+        type_ = array.type
+        if pa.types.is_string(type_) or pa.types.is_large_string(type_):
+            return cls._encode_strings(array.combine_chunks().dictionary_encode())
+        if pa.types.is_dictionary(type_):
+            return cls._encode_strings(array.combine_chunks())
+        if pa.types.is_timestamp(type_) and type_.tz is None:
+            return cls._encode_dates(array)
+        if pa.types.is_integer(type_) or pa.types.is_floating(type_):
+            return cls._encode_numbers(array, _scale(name))
+        return cls('raw', array.to_numpy(zero_copy_only=False))
+
+    @classmethod
+    def _encode_strings(cls, encoded: pa.DictionaryArray) -> 'CompactColumn':
+        """Re-code a dictionary array against its sorted dictionary."""
+        dictionary = encoded.dictionary.to_numpy(zero_copy_only=False).astype(object)
+        order = np.argsort(dictionary, kind='stable')
+        ranks = np.empty(len(order) + 1, dtype=np.int64)
+        ranks[order] = np.arange(len(order))
+        ranks[-1] = len(order)
+        dictionary = dictionary[order]
+        if encoded.null_count:
+            dictionary = np.append(dictionary, None)
+        indices = encoded.indices.fill_null(len(order)).to_numpy()
+        codes = ranks[indices].astype(_narrowest(0, len(dictionary), CODE_TYPES))
+        return cls('category', codes, dictionary=dictionary, dtype=np.dtype(object))
+
+    @classmethod
+    def _encode_numbers(cls, array: pa.ChunkedArray, scale: int) -> 'CompactColumn':
+        """Store numbers as narrow (fixed-point) integers when that is lossless."""
+        nulls = array.is_null().to_numpy(zero_copy_only=False)
+        numbers = array.fill_null(0).to_numpy()
+        dtype = np.dtype('float64') if nulls.any() else numbers.dtype
+        raw = cls('raw', np.where(nulls, np.nan, numbers) if nulls.any() else numbers, scale=scale)
+
+        if numbers.dtype.kind == 'f':
+            scaled = np.rint(numbers * scale)
+            if not (np.isfinite(scaled).all() and np.array_equal(scaled / scale, numbers)):
+                return raw
+            numbers = scaled.astype(np.int64)
+        elif scale != 1:
+            numbers = numbers.astype(np.int64) * scale
+
+        valid = numbers[~nulls]
+        low, high = (int(valid.min()), int(valid.max())) if len(valid) else (0, 0)
+        null = None
+        if nulls.any():
+            low -= 1
+            null = int(np.iinfo(_narrowest(low, high)).min)
+        values = numbers.astype(_narrowest(low, high))
+        if null is not None:
+            values[nulls] = null
+        return cls('int', values, null=null, scale=scale, dtype=dtype)
+
+    @classmethod
+    def _encode_dates(cls, array: pa.ChunkedArray) -> 'CompactColumn':
+        """Store midnight timestamps as int32 day numbers."""
+        nulls = array.is_null().to_numpy(zero_copy_only=False)
+        stamps = array.cast(pa.timestamp('ns')).fill_null(0).to_numpy().astype('datetime64[ns]')
+        days = stamps.astype('datetime64[D]')
+        if not np.array_equal(days.astype('datetime64[ns]'), stamps):
+            return cls('raw', np.where(nulls, np.datetime64('NaT'), stamps))
+        values = days.astype(np.int64)
+        null = None
+        if nulls.any():
+            null = int(np.iinfo(np.int32).min)
+            values[nulls] = null
+        return cls('date', values.astype(np.int32), null=null, dtype=np.dtype('datetime64[ns]'))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column, including dictionary strings."""
+        nbytes = self.values.nbytes
+        if self.dictionary is not None:
+            nbytes += self.dictionary.nbytes + sum(sys.getsizeof(v) for v in self.dictionary)
+        return nbytes
+
+    def valid(self, rows: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Mask of non-null values (None when the column has no nulls)."""
+        values = self.values if rows is None else self.values[rows]
+        if self.kind == 'raw' and values.dtype.kind in 'fM':
+            return ~np.isnan(values)
+        if self.null is not None:
+            return values != self.null
+        return None
+
+    def fixed_point(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Values as integers times ``scale``, the way averages are summed.
+
+        Null positions hold arbitrary values; check them with ``valid``.
+        """
+        values = self.values if rows is None else self.values[rows]
+        if self.kind != 'raw':
+            return values
+        return np.rint(np.nan_to_num(values * self.scale)).astype(np.int64)
+
+    def sort_key(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Values in an order-preserving numeric form, for sorts and comparisons.
+
+        Null positions hold arbitrary values; check them with ``valid``.
+        """
+        values = self.values if rows is None else self.values[rows]
+        if self.kind == 'raw' and values.dtype.kind == 'f':
+            return np.nan_to_num(values)
+        if self.kind == 'raw' and values.dtype.kind == 'M':
+            return values.view(np.int64)
+        return values.astype(np.int64)
+
+    def code(self, value: str) -> int:
+        """Code of a category value (-1 if it does not occur)."""
+        known = self.dictionary
+        if len(known) and known[-1] is None:
+            known = known[:-1]
+        position = int(np.searchsorted(known, value))
+        if position < len(known) and known[position] == value:
+            return position
+        return -1
+
+    def decode(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Decode values to the dtype pandas reads from the snapshot.
+
+        Args:
+            rows: Row positions to decode (all rows if None)
+
+        Returns:
+            NumPy array
+        """
+        values = self.values if rows is None else self.values[rows]
+        if self.kind == 'category':
+            return self.dictionary[values]
+        if self.kind == 'raw':
+            return values
+        if self.kind == 'date':
+            decoded = values.astype(np.int64).astype('datetime64[D]').astype('datetime64[ns]')
+            if self.null is not None:
+                decoded[values == self.null] = np.datetime64('NaT')
+            return decoded
+        if self.dtype.kind != 'f':
+            return values.astype(self.dtype)
+        decoded = values.astype(np.float64)
+        if self.scale != 1:
+            decoded /= self.scale
+        if self.null is not None:
+            decoded[values == self.null] = np.nan
+        return decoded
+
+
+class CompactTable:
+    """A snapshot table held as compact columns, with the analyzer's report kernels."""
+
+    def __init__(self, columns: Dict[str, CompactColumn], rows: int):
+        """
+        Initialize the table.
+
+        Args:
+            columns: Encoded columns in table order
+            rows: Number of rows
+        """
+        self.columns = columns
+        self.rows = rows
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> 'CompactTable':
+        """Encode an Arrow table column by column."""
+        columns = {
+            name: CompactColumn.from_arrow(name, table.column(name)) for name in table.column_names
+        }
+        return cls(columns, table.num_rows)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'CompactTable':
+        """Encode a DataFrame."""
+        return cls.from_arrow(pa.Table.from_pandas(df, preserve_index=False))
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the table's columns."""
+        return sum(column.nbytes for column in self.columns.values())
+
+    def to_frame(self, rows: Optional[np.ndarray] = None,
+                 columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Decode rows back into a DataFrame.
+
+        Args:
+            rows: Row positions, in output order (all rows if None)
+            columns: Columns to decode (all if None)
+
+        Returns:
+            DataFrame with the snapshot's dtypes and a fresh index
+        """
+        names = list(self.columns) if columns is None else list(columns)
+        return pd.DataFrame({name: self.columns[name].decode(rows) for name in names})
+
+    def where_in(self, column: str, values: Iterable[str]) -> np.ndarray:
+        """Positions of rows whose category column holds one of ``values``."""
+        codes = [self.columns[column].code(value) for value in values]
+        return np.flatnonzero(np.isin(self.columns[column].values, [c for c in codes if c >= 0]))
+
+    def where_at_least(self, thresholds: Dict[str, int]) -> np.ndarray:
+        """Positions of rows where every column is at least its threshold (nulls never match)."""
+        mask = np.ones(self.rows, dtype=bool)
+        for name, threshold in thresholds.items():
+            column = self.columns[name]
+            mask &= column.sort_key() >= threshold * (column.scale if column.kind == 'int' else 1)
+            valid = column.valid()
+            if valid is not None:
+                mask &= valid
+        return np.flatnonzero(mask)
+
+    def sort(self, rows: np.ndarray, keys: List[Tuple[str, bool]]) -> np.ndarray:
+        """
+        Stably sort row positions by columns.
+
+        Args:
+            rows: Row positions to sort
+            keys: (column, descending) pairs, most significant first; nulls
+                sort last
+
+        Returns:
+            Sorted row positions
+        """
+        sort_keys = [np.arange(len(rows))]
+        for name, descending in reversed(keys):
+            column = self.columns[name]
+            values = column.sort_key(rows)
+            sort_keys.append(-values if descending else values)
+            valid = column.valid(rows)
+            if valid is not None:
+                sort_keys.append(~valid)
+        return rows[np.lexsort(sort_keys)]
+
+    def top(self, stat: str, limit: int) -> np.ndarray:
+        """
+        Positions of the ``limit`` rows with the highest ``stat``.
+
+        Matches a stable descending sort with nulls first: nulls lead in row
+        order, ties keep row order. Only rows that can make the cut are sorted.
+
+        Args:
+            stat: Column to rank by
+            limit: Number of rows
+
+        Returns:
+            Row positions, best first
+        """
+        column = self.columns[stat]
+        values = column.sort_key()
+        valid = column.valid()
+        nulls = np.empty(0, dtype=np.int64) if valid is None else np.flatnonzero(~valid)
+        if len(nulls) >= limit:
+            return nulls[:limit]
+
+        candidates = np.arange(self.rows) if valid is None else np.flatnonzero(valid)
+        needed = limit - len(nulls)
+        scores = values[candidates]
+        if needed < len(scores):
+            cutoff = np.partition(scores, len(scores) - needed)[len(scores) - needed]
+            keep = scores >= cutoff
+            candidates, scores = candidates[keep], scores[keep]
+        best = candidates[np.lexsort((candidates, -scores))][:needed]
+        return np.concatenate([nulls, best])
+
+    def most_recent(self, games: int, by: str = 'player_id', order: str = 'game_date') -> np.ndarray:
+        """Positions of each group's ``games`` latest rows."""
+        groups = self.columns[by].values.astype(np.int64)
+        rows = np.lexsort((-self.columns[order].sort_key(), groups))
+        sorted_groups = groups[rows]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        rank = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+        return rows[rank < games]
+
+    def averages(self, by: List[str], stats: Dict[str, str], rows: Optional[np.ndarray] = None,
+                 win_pct: bool = False, wins: Optional[str] = None,
+                 count_column: str = 'games') -> pd.DataFrame:
+        """
+        Compute ``ROUND(AVG(stat), 2)`` per group, like ``grouped_averages``.
+
+        Groups are mixed-radix keys over the group columns' codes, summed with
+        ``np.bincount``; sorted dictionaries keep the groups in string order.
+
+        Args:
+            by: Category columns to group by
+            stats: Mapping of source column to output column name
+            rows: Row positions to aggregate (all rows if None)
+            win_pct: Also compute ``win_pct`` from the ``wl`` column
+            wins: Also count wins, into a column of this name
+            count_column: Name of the row count column
+
+        Returns:
+            DataFrame with the group columns, the row count, one average per
+            stat and optionally ``win_pct`` and wins, sorted by the group columns
+        """
+        sizes = [len(self.columns[column].dictionary) for column in by]
+        keys = np.zeros(self.rows if rows is None else len(rows), dtype=np.int64)
+        for column, size in zip(by, sizes):
+            codes = self.columns[column].values
+            keys = keys * size + (codes if rows is None else codes[rows])
+        groups = int(np.prod(sizes))
+        counts = np.bincount(keys, minlength=groups)
+        present = np.flatnonzero(counts)
+
+        result = {}
+        group_codes = np.unravel_index(present, sizes) if len(present) else [present] * len(by)
+        for column, codes in zip(by, group_codes):
+            result[column] = self.columns[column].dictionary[codes]
+        result[count_column] = counts[present].astype(np.int64)
+        for name, output in stats.items():
+            column = self.columns[name]
+            values, valid = column.fixed_point(rows), column.valid(rows)
+            group_keys = keys if valid is None else keys[valid]
+            values = values if valid is None else values[valid]
+            sums = np.bincount(group_keys, weights=values, minlength=groups)[present]
+            totals = np.bincount(group_keys, minlength=groups)[present]
+            result[output] = _round_ratio(sums, totals * column.scale)
+        if win_pct or wins:
+            wl = self.columns['wl']
+            won = (wl.values if rows is None else wl.values[rows]) == wl.code('W')
+            won_counts = np.bincount(keys[won], minlength=groups)[present].astype(np.int64)
+            if win_pct:
+                result['win_pct'] = _round_ratio(won_counts * 100, result[count_column])
+            if wins:
+                result[wins] = won_counts
+        return pd.DataFrame(result)
+
+
+class CompactStore:
+    """
+    Compact, in-memory copies of the current snapshot's tables.
+
+    Tables are encoded on first use and kept until the snapshot pointer moves
+    to a new generation that changed them; ``refresh`` loads every other
+    table of the new snapshot ahead of queries, so the process keeps all
+    players resident and re-encodes only what a load changed.
+    """
+
+    def __init__(self, store: Optional[ColumnarStore] = None):
+        """
+        Initialize the store.
+
+        Args:
+            store: Snapshot store to read from (defaults to ``config.SNAPSHOT_DIR``)
+        """
+        self.store = store or ColumnarStore()
+        self._tables: Dict[str, CompactTable] = {}
+        self._tables_generation = None
+        self._lock = threading.Lock()
+
+    def generation(self) -> Optional[int]:
+        """Get the load generation of the current snapshot."""
+        return self.store.generation()
+
+    def table(self, table_name: str) -> CompactTable:
+        """
+        Get a table of the current snapshot in compact form.
+
+        Args:
+            table_name: Published table name
+
+        Returns:
+            Compact table shared between callers; do not modify it
+        """
+        current = self.store.current()
+        with self._lock:
+            if current is not None and self._tables_generation != current['generation']:
+                kept = reused_tables(current, self._tables_generation)
+                self._tables = {name: t for name, t in self._tables.items() if name in kept}
+                self._tables_generation = current['generation']
+            if table_name not in self._tables:
+                self._tables[table_name] = CompactTable.from_arrow(
+                    self.store.read_arrow(table_name, current)
+                )
+            return self._tables[table_name]
+
+    def refresh(self, table_names: Optional[Iterable[str]] = None) -> Optional[int]:
+        """
+        Load the current snapshot's tables, replacing an older generation.
+
+        The new tables are encoded before they replace the old ones, so
+        queries keep being answered during a reload. Tables the snapshot
+        carried over unchanged from the generation in memory are kept as is.
+
+        Args:
+            table_names: Tables to load (defaults to every table in the snapshot)
+
+        Returns:
+            Generation now held in memory (None if there is no snapshot)
+        """
+        current = self.store.current()
+        if current is None:
+            return None
+        with self._lock:
+            if self._tables_generation == current['generation']:
+                loaded = dict(self._tables)
+            else:
+                kept = reused_tables(current, self._tables_generation)
+                loaded = {name: t for name, t in self._tables.items() if name in kept}
+        encoded = 0
+        for table_name in table_names or current['tables']:
+            if table_name not in loaded:
+                loaded[table_name] = CompactTable.from_arrow(self.store.read_arrow(table_name, current))
+                encoded += 1
+        with self._lock:
+            self._tables, self._tables_generation = loaded, current['generation']
+        logger.info(
+            f"Loaded {len(loaded)} compact tables ({encoded} encoded) for generation "
+            f"{current['generation']} ({self.nbytes / 1e6:.1f} MB)"
+        )
+        return current['generation']
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the loaded tables."""
+        return sum(table.nbytes for table in list(self._tables.values()))
@@ -15,15 +15,77 @@ class Config:
     DB_NAME = os.getenv('DB_NAME', 'postgres')
     DB_USER = os.getenv('DB_USER', 'postgres')
     DB_PASSWORD = os.getenv('DB_PASSWORD')
+    DATABASE_URL = os.getenv('DATABASE_URL')  # Optional full URL override (e.g., SQLite)
     
     @property
     def database_url(self):
         """Construct database URL from components."""
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         if not self.DB_PASSWORD:
             raise ValueError("DB_PASSWORD environment variable is required")
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
+    # Connection Pool (shared by the ETL and analyzers in a process)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # seconds, -1 disables
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    
+    # NBA API Extraction
+    INGEST_MODE = os.getenv('INGEST_MODE', 'player')  # 'player' or 'league' (per-season logs)
+    LEAGUE_FIRST_SEASON = os.getenv('LEAGUE_FIRST_SEASON', '2003-04')  # earliest season fetched
+    EXTRACT_WORKERS = int(os.getenv('EXTRACT_WORKERS', '4'))
+    API_RATE_LIMIT = float(os.getenv('API_RATE_LIMIT', '1.0'))  # requests per second
+    API_RATE_BURST = int(os.getenv('API_RATE_BURST', '2'))
+    API_MAX_RETRIES = int(os.getenv('API_MAX_RETRIES', '3'))
+    API_BACKOFF_BASE = float(os.getenv('API_BACKOFF_BASE', '1.0'))  # seconds
+    API_BACKOFF_MAX = float(os.getenv('API_BACKOFF_MAX', '30.0'))  # seconds
+    
+    # Pipeline (extract -> transform -> load)
+    TRANSFORM_WORKERS = int(os.getenv('TRANSFORM_WORKERS', str(max(1, (os.cpu_count() or 1) - 1))))
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '8'))  # players in flight per stage
+    
+    # Run Metrics
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_RETENTION = int(os.getenv('METRICS_RETENTION', '100'))  # run reports kept, 0 keeps all
+    
+    # Load Configuration
+    ETL_MODE = os.getenv('ETL_MODE', 'full')  # 'full' or 'incremental'
+    INGEST_STATE_TABLE = 'etl_ingest_state'
+    LOAD_GENERATION_TABLE = 'etl_load_generation'
+    LOAD_METHOD = os.getenv('LOAD_METHOD', 'auto')  # 'auto', 'copy', 'multi' or 'executemany'
+    LOAD_CHUNKSIZE = int(os.getenv('LOAD_CHUNKSIZE', '50000'))
+    SWAP_LOCK_TIMEOUT_MS = int(os.getenv('SWAP_LOCK_TIMEOUT_MS', '5000'))
+    SWAP_RETRIES = int(os.getenv('SWAP_RETRIES', '3'))
+    GAMES_PARTITIONS = int(os.getenv('GAMES_PARTITIONS', '8'))  # hash partitions (PostgreSQL)
+    PLAYER_VIEWS_ENABLED = os.getenv('PLAYER_VIEWS_ENABLED', 'true').lower() == 'true'
+    
+    # Change Data
+    CHANGE_LOG_TABLE = 'etl_change_log'
+    CHANGE_LOG_RETENTION = int(os.getenv('CHANGE_LOG_RETENTION', '100'))  # load generations
+    CHANGE_EVENTS = os.getenv('CHANGE_EVENTS', 'none')  # 'none', 'file', 'notify' or 'file,notify'
+    CHANGE_CHANNEL = os.getenv('CHANGE_CHANNEL', 'nba_stats_changes')  # PostgreSQL NOTIFY channel
+    
+    # Rolling Stats
+    ROLLING_EWM_SPAN = int(os.getenv('ROLLING_EWM_SPAN', '10'))  # games
+    SCORING_STREAK_POINTS = int(os.getenv('SCORING_STREAK_POINTS', '20'))  # points per game
+    
+    # Raw API Response Cache
+    RAW_CACHE_ENABLED = os.getenv('RAW_CACHE_ENABLED', 'true').lower() == 'true'
+    RAW_CACHE_TTL = int(os.getenv('RAW_CACHE_TTL', '21600'))  # seconds, current season only
+    OFFLINE = os.getenv('OFFLINE', 'false').lower() == 'true'  # replay from cache only
+    
+    # Analyzer Query Cache
+    QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', '256'))  # 0 disables caching
+    QUERY_CACHE_CHECK_INTERVAL = float(os.getenv('QUERY_CACHE_CHECK_INTERVAL', '5'))  # seconds
+    ANALYZER_CHUNKSIZE = int(os.getenv('ANALYZER_CHUNKSIZE', '10000'))  # rows per streamed chunk
+    ANALYZER_BACKEND = os.getenv('ANALYZER_BACKEND', 'database')  # 'database', 'columnar' or 'compact'
+    SNAPSHOTS_ENABLED = os.getenv('SNAPSHOTS_ENABLED', 'true').lower() == 'true'
+    
     # Player Configuration
+    ROSTER_SOURCE = os.getenv('ROSTER_SOURCE', 'config')  # 'config', 'table' or a .csv/.json path
     PLAYER_IDS = {
         'lebron_james': 2544,
         'stephen_curry': 201939,
@@ -50,6 +112,10 @@ class Config:
     # Project Paths
     BASE_DIR = Path(__file__).parent
     DATA_DIR = BASE_DIR / 'data'
+    RAW_CACHE_DIR = DATA_DIR / 'raw_cache'
+    SNAPSHOT_DIR = DATA_DIR / 'snapshots'
+    METRICS_DIR = DATA_DIR / 'metrics'
+    CHANGE_EVENTS_FILE = DATA_DIR / 'changes.jsonl'
     LOGS_DIR = BASE_DIR / 'logs'
 
 config = Config()
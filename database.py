@@ -0,0 +1,269 @@
+"""Shared SQLAlchemy engines with configurable, instrumented connection pools."""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.pool import QueuePool
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL errors worth retrying: serialization failure, deadlock, lock
+# timeout and the server shutting down or starting up
+TRANSIENT_SQLSTATES = {'40001', '40P01', '55P03', '57P01', '57P02', '57P03'}
+# ... and every connection exception
+TRANSIENT_SQLSTATE_CLASSES = {'08'}
+
+# Messages of transient errors from drivers without error codes
+TRANSIENT_MESSAGES = ('database is locked', 'database table is locked', 'deadlock',
+                      'could not serialize', 'server closed the connection')
+
+_engines: Dict[str, Engine] = {}
+_metrics: Dict[str, 'PoolMetrics'] = {}
+_engines_pid = os.getpid()
+_lock = threading.Lock()
+
+# Async drivers used in place of each dialect's default driver
+ASYNC_DRIVERS = {
+    'postgresql': 'asyncpg',
+    'sqlite': 'aiosqlite',
+}
+
+
+class PoolMetrics:
+    """Counters for one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.overflow_hits = 0
+
+    def add(self, **counts):
+        """Increment counters by name."""
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict:
+        """Get a snapshot of the counters."""
+        with self._lock:
+            return {name: value for name, value in vars(self).items() if not name.startswith('_')}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records checkout waits and overflow use.
+
+    A checkout waits when every pooled and overflow connection is in use;
+    an overflow hit is a checkout that opened a connection beyond
+    ``pool_size``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        """Recreate the pool (on dispose), keeping its metrics."""
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        overflow = self.overflow()
+        exhausted = self.checkedin() == 0 and overflow >= self._max_overflow > -1
+        start = time.perf_counter()
+        connection = super()._do_get()
+        self.metrics.add(
+            overflow_hits=int(self.overflow() > max(overflow, 0)),
+            waits=int(exhausted),
+            wait_time=time.perf_counter() - start if exhausted else 0.0
+        )
+        return connection
+
+
+def _instrument(engine: Engine) -> PoolMetrics:
+    """Count checkouts, checkins, new connections and invalidations."""
+    pool = engine.pool
+    metrics = pool.metrics = getattr(pool, 'metrics', None) or PoolMetrics()
+
+    event.listen(pool, 'checkout', lambda *args: metrics.add(checkouts=1))
+    event.listen(pool, 'checkin', lambda *args: metrics.add(checkins=1))
+    event.listen(pool, 'connect', lambda *args: metrics.add(connects=1))
+    event.listen(pool, 'invalidate', lambda *args: metrics.add(invalidations=1))
+    return metrics
+
+
+def _pool_options(url: str) -> dict:
+    """Pool arguments from the configuration for a database URL."""
+    options = {
+        'pool_pre_ping': config.DB_POOL_PRE_PING,
+        'pool_recycle': config.DB_POOL_RECYCLE,
+    }
+    # SQLite memory databases use a per-thread pool that takes no sizing
+    parsed = make_url(url)
+    if not (parsed.get_backend_name() == 'sqlite' and parsed.database in (None, '', ':memory:')):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def _reset_after_fork():
+    """Drop engines inherited from a parent process without closing its connections."""
+    global _engines, _metrics, _engines_pid, _lock
+    for engine in _engines.values():
+        engine.dispose(close=False)
+    _engines, _metrics = {}, {}
+    _engines_pid = os.getpid()
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_engine(url: Optional[str] = None) -> Engine:
+    """
+    Get the process-wide engine for a database URL, creating it on first use.
+
+    Engines are shared by the ETL and every analyzer in the process, so they
+    share one connection pool. A forked child process gets fresh engines
+    instead of reusing the parent's pooled connections.
+
+    Args:
+        url: Database URL (defaults to ``config.database_url``)
+
+    Returns:
+        SQLAlchemy engine
+    """
+    url = url or config.database_url
+    with _lock:
+        if _engines_pid != os.getpid():
+            _reset_after_fork()
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(url, **_pool_options(url))
+            _metrics[url] = _instrument(engine)
+            _engines[url] = engine
+            logger.debug(f"Created {engine.dialect.name} engine with {engine.pool.status()}")
+        return engine
+
+
+def is_transient_db_error(error: Exception) -> bool:
+    """
+    Check whether a failed transaction is worth retrying.
+
+    Lock timeouts, busy databases, deadlocks, serialization failures and
+    dropped connections are transient. Other ``OperationalError``s (such as
+    SQLite's missing tables and syntax errors), constraint violations and
+    programming errors are not.
+
+    Args:
+        error: Exception raised by the transaction
+
+    Returns:
+        True if the transaction may succeed when repeated
+    """
+    if not isinstance(error, DBAPIError):
+        return False
+    if error.connection_invalidated:
+        return True
+    if not isinstance(error, OperationalError):
+        return False
+
+    orig = error.orig
+    sqlstate = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    if sqlstate:
+        return sqlstate in TRANSIENT_SQLSTATES or sqlstate[:2] in TRANSIENT_SQLSTATE_CLASSES
+    errorname = getattr(orig, 'sqlite_errorname', None)
+    if errorname:
+        return errorname.split('_')[:2] in (['SQLITE', 'BUSY'], ['SQLITE', 'LOCKED'])
+    return any(message in str(orig).lower() for message in TRANSIENT_MESSAGES)
+
+
+def pool_status(url: Optional[str] = None) -> dict:
+    """
+    Get pool usage and metrics for a shared engine.
+
+    Args:
+        url: Database URL (defaults to ``config.database_url``)
+
+    Returns:
+        Pool size, connections checked out and in overflow, and counters
+    """
+    url = url or config.database_url
+    pool = get_engine(url).pool
+    status = {'status': pool.status()}
+    if isinstance(pool, QueuePool):
+        status.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+    status.update(_metrics[url].as_dict())
+    return status
+
+
+def async_database_url(url: Optional[str] = None) -> str:
+    """
+    Rewrite a database URL to use the dialect's async driver.
+
+    Args:
+        url: Database URL (defaults to ``config.database_url``)
+
+    Returns:
+        URL string with an async driver (e.g., ``postgresql+asyncpg://``)
+    """
+    parsed = make_url(url or config.database_url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def create_async_pooled_engine(url: Optional[str] = None):
+    """
+    Create an async engine with the configured pool settings.
+
+    Async engines are bound to the event loop that uses them, so they are
+    not shared through ``get_engine``; each async analyzer owns one.
+
+    Args:
+        url: Database URL (defaults to ``config.database_url``)
+
+    Returns:
+        SQLAlchemy ``AsyncEngine``
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_database_url(url)
+    options = {'pool_pre_ping': config.DB_POOL_PRE_PING, 'pool_recycle': config.DB_POOL_RECYCLE}
+    if make_url(url).get_backend_name() != 'sqlite':
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+        )
+    return create_async_engine(url, **options)
+
+
+def dispose_engines():
+    """Close every shared engine's pooled connections (e.g., at shutdown)."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _metrics.clear()
@@ -0,0 +1,185 @@
+"""Rate-limited, retrying game log extraction for the NBA Stats ETL."""
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Callable, Optional, TypeVar
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# HTTP statuses worth retrying: rate limited or a server-side failure
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def current_season(today: Optional[date] = None) -> str:
+    """
+    Get the NBA season identifier for a date.
+
+    Seasons tip off in October, so a date from October onward belongs to the
+    season starting that year (e.g., 2024-11-01 -> '2024-25').
+
+    Args:
+        today: Date to resolve (defaults to today)
+
+    Returns:
+        Season identifier in NBA API format
+    """
+    today = today or date.today()
+    start_year = today.year if today.month >= 10 else today.year - 1
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum tokens held (burst size)
+            clock: Monotonic clock, injectable for testing
+            sleep: Sleep function, injectable for testing
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                elapsed = now - self._updated
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check whether an API request failure is worth retrying.
+
+    Timeouts, dropped connections and HTTP 429/5xx responses are transient;
+    anything else (bad arguments, malformed data, programming errors) is not.
+
+    Args:
+        error: Exception raised by a request
+
+    Returns:
+        True if the request may succeed when repeated
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        import requests
+    except ImportError:
+        requests = None
+    if requests is not None and isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) in TRANSIENT_STATUS_CODES
+
+
+def retry_with_backoff(func: Callable[[], T], max_retries: int, base_delay: float,
+                       max_delay: float,
+                       sleep: Callable[[float], None] = time.sleep,
+                       on_retry: Optional[Callable[[int, Exception], None]] = None,
+                       retry_on: Callable[[Exception], bool] = is_transient_error) -> T:
+    """
+    Call a function, retrying transient failures with full-jitter exponential backoff.
+
+    Args:
+        func: Zero-argument callable to invoke
+        max_retries: Number of retries after the first attempt
+        base_delay: Backoff base in seconds
+        max_delay: Upper bound on a single backoff in seconds
+        sleep: Sleep function, injectable for testing
+        on_retry: Called with the attempt number and error before each retry
+        retry_on: Decides whether an error is retried; others are raised at
+            once (defaults to ``is_transient_error``)
+
+    Returns:
+        The return value of ``func``
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not retry_on(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            logger.warning(
+                f"Attempt {attempt} failed ({e}); retrying in {delay:.2f}s"
+            )
+            if on_retry is not None:
+                on_retry(attempt, e)
+            sleep(delay)
+
+
+class GameLogSource(ABC):
+    """Interface for a source of raw player game logs."""
+
+    # Whether every fetch makes its own API request (and takes a rate limiter token)
+    throttled = True
+
+    @abstractmethod
+    def fetch(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
+        """
+        Fetch a player's raw game log.
+
+        Args:
+            player_id: NBA API player ID
+            season: Season identifier (e.g., '2023-24'); all seasons when None
+
+        Returns:
+            DataFrame shaped like the ``PlayerGameLog`` endpoint result
+        """
+
+
+class NBAApiGameLogSource(GameLogSource):
+    """Game log source backed by the ``nba_api`` stats endpoints."""
+
+    def __init__(self, timeout: int = 30):
+        """
+        Initialize the source.
+
+        Args:
+            timeout: HTTP timeout in seconds for each request
+        """
+        self.timeout = timeout
+
+    def fetch(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
+        """Fetch a player's game log from the NBA stats API."""
+        from nba_api.stats.endpoints import playergamelog
+        from nba_api.stats.library.parameters import SeasonAll
+
+        career = playergamelog.PlayerGameLog(
+            player_id=player_id,
+            season=season or SeasonAll.all,
+            timeout=self.timeout
+        )
+        return career.get_data_frames()[0]
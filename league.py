@@ -0,0 +1,242 @@
+"""League-wide, per-season game log ingestion fanned out to players."""
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from config import config
+from extraction import GameLogSource, TokenBucket, current_season
+from response_cache import RawResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Columns of the ``PlayerGameLog`` endpoint result, which the ETL transforms
+PLAYER_GAME_LOG_COLUMNS = [
+    'SEASON_ID', 'Player_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'MIN',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS',
+    'VIDEO_AVAILABLE'
+]
+
+# ``LeagueGameLog`` columns renamed to their ``PlayerGameLog`` spelling
+LEAGUE_COLUMN_NAMES = {'PLAYER_ID': 'Player_ID', 'GAME_ID': 'Game_ID'}
+
+
+def seasons_between(first: str, last: Optional[str] = None) -> List[str]:
+    """
+    List season identifiers from one season to another, inclusive.
+
+    Args:
+        first: First season (e.g., '2003-04')
+        last: Last season (defaults to the current season)
+
+    Returns:
+        Season identifiers in NBA API format, oldest first
+    """
+    start, end = int(first[:4]), int((last or current_season())[:4])
+    return [f"{year}-{str(year + 1)[-2:]}" for year in range(start, end + 1)]
+
+
+def to_player_game_log(season_log: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reshape ``LeagueGameLog`` rows into ``PlayerGameLog`` rows.
+
+    League logs carry team and player name columns and ISO dates; the result
+    has the player game log's columns, with dates already parsed.
+
+    Args:
+        season_log: League-wide player game log rows
+
+    Returns:
+        DataFrame with ``PLAYER_GAME_LOG_COLUMNS``
+    """
+    df = season_log.rename(columns=LEAGUE_COLUMN_NAMES)
+    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'], format='%Y-%m-%d')
+    if 'VIDEO_AVAILABLE' not in df:
+        df['VIDEO_AVAILABLE'] = 0
+    return df[PLAYER_GAME_LOG_COLUMNS]
+
+
+class SeasonGameLogSource(ABC):
+    """Interface for a source of league-wide game logs, one season per request."""
+
+    @abstractmethod
+    def fetch_season(self, season: str) -> pd.DataFrame:
+        """
+        Fetch every player's games of a season.
+
+        Args:
+            season: Season identifier (e.g., '2023-24')
+
+        Returns:
+            DataFrame shaped like the ``LeagueGameLog`` endpoint result
+        """
+
+
+class NBAApiSeasonGameLogSource(SeasonGameLogSource):
+    """Season game log source backed by the ``nba_api`` ``LeagueGameLog`` endpoint."""
+
+    def __init__(self, timeout: int = 60):
+        """
+        Initialize the source.
+
+        Args:
+            timeout: HTTP timeout in seconds for each request
+        """
+        self.timeout = timeout
+
+    def fetch_season(self, season: str) -> pd.DataFrame:
+        """Fetch a season's player game logs from the NBA stats API."""
+        from nba_api.stats.endpoints import leaguegamelog
+
+        log = leaguegamelog.LeagueGameLog(
+            season=season,
+            player_or_team_abbreviation='P',
+            timeout=self.timeout
+        )
+        return log.get_data_frames()[0]
+
+
+class RecordedSeasonGameLogSource(SeasonGameLogSource):
+    """
+    Season game log source replaying recorded responses from a directory.
+
+    Each season is a ``<season>.parquet`` or ``<season>.csv`` file with the
+    ``LeagueGameLog`` columns, so the ETL can run against fixtures instead
+    of the API.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize the source.
+
+        Args:
+            root: Directory of recorded seasons
+        """
+        self.root = Path(root)
+
+    def fetch_season(self, season: str) -> pd.DataFrame:
+        """Read a recorded season (an empty log if it was not recorded)."""
+        parquet_path, csv_path = self.root / f"{season}.parquet", self.root / f"{season}.csv"
+        if parquet_path.exists():
+            return pd.read_parquet(parquet_path)
+        if csv_path.exists():
+            return pd.read_csv(csv_path, dtype={'GAME_ID': str, 'SEASON_ID': str})
+        logger.warning(f"No recorded game log for season {season}")
+        columns = {name: league for league, name in LEAGUE_COLUMN_NAMES.items()}
+        return pd.DataFrame(columns=[columns.get(c, c) for c in PLAYER_GAME_LOG_COLUMNS])
+
+    @staticmethod
+    def record(source: SeasonGameLogSource, seasons: List[str], root: Path):
+        """
+        Record seasons from another source (e.g., the live API) as fixtures.
+
+        Args:
+            source: Source to record from
+            seasons: Seasons to record
+            root: Directory to write the recorded seasons to
+        """
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        for season in seasons:
+            source.fetch_season(season).to_parquet(root / f"{season}.parquet", index=False)
+
+
+class LeagueGameLogSource(GameLogSource):
+    """
+    Player game log source built from league-wide, per-season game logs.
+
+    Each season is requested once, however many players are fetched, and
+    split by player locally; a whole-career fetch reads every season from
+    ``first_season`` on. Concurrent fetches share one request per season.
+    Completed seasons are kept in the raw response cache indefinitely, so
+    after the first run only the current season is requested again.
+
+    Season responses are kept in memory for the lifetime of the source
+    (one ETL run).
+    """
+
+    ENDPOINT = 'leaguegamelog'
+    CACHE_KEY = 'league'
+
+    # Fetches are served from memory; only season requests are rate limited
+    throttled = False
+
+    def __init__(self, source: Optional[SeasonGameLogSource] = None,
+                 cache: Optional[RawResponseCache] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 first_season: Optional[str] = None,
+                 offline: bool = False):
+        """
+        Initialize the source.
+
+        Args:
+            source: Upstream season source (defaults to the live NBA API)
+            cache: Raw response cache for season responses (None disables it)
+            rate_limiter: Rate limiter taken for every upstream request
+            first_season: Earliest season of a whole-career fetch (defaults
+                to ``config.LEAGUE_FIRST_SEASON``)
+            offline: Replay seasons from the cache only, serving expired
+                entries too
+        """
+        self.source = source or NBAApiSeasonGameLogSource()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.first_season = first_season or config.LEAGUE_FIRST_SEASON
+        self.offline = offline
+        self.requests = 0
+        self._seasons: Dict[str, Dict[int, pd.DataFrame]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _request(self, season: str) -> pd.DataFrame:
+        """Get a season's league log from the cache or the upstream source."""
+        if self.cache is not None:
+            cached = self.cache.get(self.ENDPOINT, self.CACHE_KEY, season, allow_stale=self.offline)
+            if cached is not None:
+                logger.debug(f"Cache hit for league game log ({season})")
+                return cached
+        if self.offline:
+            raise LookupError(f"No cached league game log for season {season}")
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        df = self.source.fetch_season(season)
+        self.requests += 1
+        if self.cache is not None:
+            self.cache.put(self.ENDPOINT, self.CACHE_KEY, season, df)
+        logger.info(f"Fetched league game log for {season}: {len(df)} games")
+        return df
+
+    def season(self, season: str) -> Dict[int, pd.DataFrame]:
+        """
+        Get a season's games split by player, requesting it on first use.
+
+        Args:
+            season: Season identifier
+
+        Returns:
+            Mapping of NBA API player ID to the player's games that season
+        """
+        with self._lock:
+            lock = self._locks.setdefault(season, threading.Lock())
+        with lock:
+            if season not in self._seasons:
+                games = to_player_game_log(self._request(season))
+                self._seasons[season] = {
+                    int(player_id): player for player_id, player in games.groupby('Player_ID')
+                }
+            return self._seasons[season]
+
+    def fetch(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
+        """Get a player's game log, newest game first, from the league logs."""
+        seasons = [season] if season else seasons_between(self.first_season)
+        games = [self.season(s).get(int(player_id)) for s in seasons]
+        games = [df for df in games if df is not None]
+        if not games:
+            return pd.DataFrame(columns=PLAYER_GAME_LOG_COLUMNS)
+        df = pd.concat(games, ignore_index=True)
+        return df.sort_values('GAME_DATE', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,200 @@
+"""Bulk DataFrame loaders for the NBA Stats ETL."""
+import csv
+import io
+import logging
+from typing import Iterable, List, Optional
+
+import pandas as pd
+from sqlalchemy import inspect
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+LOAD_METHODS = ('auto', 'copy', 'multi', 'executemany')
+
+# PostgreSQL drivers whose cursors support ``copy_expert``
+COPY_DRIVERS = ('psycopg2',)
+
+# Conservative bound on bound parameters per statement (SQLite's historical limit)
+MAX_BIND_PARAMS = 999
+
+STAGING_SUFFIX = '__staging'
+RETIRED_SUFFIX = '__retired'
+
+
+def copy_from_stdin(table, conn, keys: List[str], data_iter: Iterable[tuple]):
+    """
+    Insert rows through PostgreSQL ``COPY ... FROM STDIN``.
+
+    Used as a ``DataFrame.to_sql`` insertion method. Rows are streamed as
+    CSV through an in-memory buffer, so no temporary files are written.
+
+    Args:
+        table: pandas ``SQLTable`` being written
+        conn: SQLAlchemy connection
+        keys: Column names
+        data_iter: Iterable of row tuples
+    """
+    dbapi_conn = conn.connection
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(data_iter)
+    buffer.seek(0)
+
+    quote = conn.dialect.identifier_preparer.quote
+    columns = ', '.join(quote(k) for k in keys)
+    target = quote(table.name)
+    if table.schema:
+        target = f"{quote(table.schema)}.{target}"
+
+    with dbapi_conn.cursor() as cursor:
+        cursor.copy_expert(f"COPY {target} ({columns}) FROM STDIN WITH CSV", buffer)
+
+
+def resolve_load_method(dialect_name: str, method: Optional[str] = None,
+                        driver: Optional[str] = None) -> str:
+    """
+    Pick the insertion strategy for a SQLAlchemy dialect and driver.
+
+    Args:
+        dialect_name: SQLAlchemy dialect name (e.g., 'postgresql', 'sqlite')
+        method: Requested method (defaults to ``config.LOAD_METHOD``)
+        driver: DBAPI driver name (e.g., 'psycopg2', 'psycopg', 'pg8000')
+
+    Returns:
+        One of 'copy', 'multi' or 'executemany'
+    """
+    method = method or config.LOAD_METHOD
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Unknown load method '{method}', expected one of {LOAD_METHODS}")
+    can_copy = dialect_name == 'postgresql' and driver in COPY_DRIVERS
+    if method == 'copy' and not can_copy:
+        raise ValueError(
+            f"COPY loading requires PostgreSQL through {' or '.join(COPY_DRIVERS)}, "
+            f"not {dialect_name}+{driver}"
+        )
+    if method == 'auto':
+        return 'copy' if can_copy else 'executemany'
+    return method
+
+
+def bulk_load(df: pd.DataFrame, table_name: str, con, if_exists: str = 'append',
+              method: Optional[str] = None, chunksize: Optional[int] = None) -> int:
+    """
+    Write a DataFrame to a table with the fastest strategy for the database.
+
+    PostgreSQL through psycopg2 uses ``COPY FROM STDIN``; other drivers and
+    dialects fall back to chunked
+    ``executemany`` inserts, or multi-row ``INSERT`` statements when
+    ``method='multi'``. Table creation is still handled by pandas.
+
+    Args:
+        df: DataFrame to write
+        table_name: Name of the target table
+        con: SQLAlchemy engine or connection
+        if_exists: 'fail', 'replace' or 'append'
+        method: Insertion strategy (defaults to ``config.LOAD_METHOD``)
+        chunksize: Rows per batch (defaults to ``config.LOAD_CHUNKSIZE``)
+
+    Returns:
+        Number of rows written
+    """
+    method = resolve_load_method(con.dialect.name, method, con.dialect.driver)
+    chunksize = chunksize or config.LOAD_CHUNKSIZE
+
+    if method == 'copy':
+        insert_method = copy_from_stdin
+    elif method == 'multi':
+        insert_method = 'multi'
+        chunksize = min(chunksize, max(1, MAX_BIND_PARAMS // max(1, len(df.columns))))
+    else:
+        insert_method = None
+
+    df.to_sql(
+        table_name,
+        con,
+        if_exists=if_exists,
+        index=False,
+        chunksize=chunksize,
+        method=insert_method
+    )
+    logger.debug(f"Bulk loaded {len(df)} rows to '{table_name}' using {method}")
+    return len(df)
+
+
+def staging_name(table_name: str) -> str:
+    """Get the staging table name for a live table."""
+    return f"{table_name}{STAGING_SUFFIX}"
+
+
+def swap_in_staged_tables(conn, table_names: List[str]):
+    """
+    Replace live tables with their staging copies.
+
+    Must be called inside the caller's transaction. Each live table is renamed
+    aside, its staging table renamed into place, and the old version dropped.
+    On PostgreSQL the renames are transactional, so readers see either every
+    previous table or every new one, never a missing or partial table; a
+    ``lock_timeout`` keeps the swap from queueing behind long-running reads.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        table_names: Live table names whose staging tables should be swapped in
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    if conn.dialect.name == 'postgresql':
+        conn.exec_driver_sql(f"SET LOCAL lock_timeout = '{int(config.SWAP_LOCK_TIMEOUT_MS)}ms'")
+
+    inspector = inspect(conn)
+    for name in table_names:
+        staged, retired = staging_name(name), f"{name}{RETIRED_SUFFIX}"
+        existed = inspector.has_table(name)
+
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {quote(retired)}")
+        if existed:
+            conn.exec_driver_sql(f"ALTER TABLE {quote(name)} RENAME TO {quote(retired)}")
+        conn.exec_driver_sql(f"ALTER TABLE {quote(staged)} RENAME TO {quote(name)}")
+        if existed:
+            conn.exec_driver_sql(f"DROP TABLE {quote(retired)}")
+        _rename_staged_indexes(conn, staged, name)
+
+    logger.debug(f"Swapped in staged tables: {', '.join(table_names)}")
+
+
+def _rename_staged_indexes(conn, staged: str, name: str):
+    """
+    Give a swapped-in table's indexes and primary key the live table's names.
+
+    Index names must be unique per schema, so a staging table's are built
+    from the staging table name (``ix_nba_5__staging_pts``) while the live
+    table still holds ``ix_nba_5_pts``; once the live table is dropped they
+    take its names. SQLite cannot rename an index, so it is recreated.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        staged: Staging table name the indexes were named after
+        name: Live table name the staging table was renamed to
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    if conn.dialect.name == 'postgresql':
+        inspector = inspect(conn)
+        for index in inspector.get_indexes(name):
+            if staged in index['name']:
+                renamed = index['name'].replace(staged, name, 1)
+                conn.exec_driver_sql(f"ALTER INDEX {quote(index['name'])} RENAME TO {quote(renamed)}")
+        primary_key = inspector.get_pk_constraint(name).get('name')
+        if primary_key and staged in primary_key:
+            renamed = primary_key.replace(staged, name, 1)
+            conn.exec_driver_sql(
+                f"ALTER TABLE {quote(name)} RENAME CONSTRAINT {quote(primary_key)} TO {quote(renamed)}"
+            )
+    elif conn.dialect.name == 'sqlite':
+        indexes = conn.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (name,)
+        ).all()
+        for index_name, sql in indexes:
+            if staged in index_name:
+                conn.exec_driver_sql(f"DROP INDEX {quote(index_name)}")
+                conn.exec_driver_sql(sql.replace(index_name, index_name.replace(staged, name, 1), 1))
@@ -0,0 +1,364 @@
+"""Per-stage ETL metrics, run reports and analyzer query latency histograms."""
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Stages of an ETL run, in pipeline order ('publish' spans the whole publishing
+# transaction, including 'combine')
+STAGES = ['extract', 'transform', 'load', 'combine', 'publish']
+
+# Fields recorded for every stage execution and summed in the run totals
+STAGE_FIELDS = ['wall_seconds', 'cpu_seconds', 'rows', 'bytes', 'retries']
+
+# Query latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+PROMETHEUS_FILE = 'nba_etl.prom'
+
+
+def frame_bytes(df: Optional[pd.DataFrame]) -> int:
+    """In-memory size of a DataFrame, including string contents."""
+    return 0 if df is None else int(df.memory_usage(deep=True).sum())
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    High-water mark of this process's resident memory (None where unsupported).
+
+    The mark covers the whole process lifetime and never goes down, so it
+    says how much memory the process has needed so far, not what any one
+    stage or player used.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    """Format Prometheus labels, skipping empty values."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels.items() if value is not None]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class StageRecord:
+    """Measurements of one stage for one player (or the whole run)."""
+
+    def __init__(self, stage: str, player: Optional[str] = None):
+        self.stage = stage
+        self.player = player
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.retries = 0
+        # Process-wide peak RSS when the stage finished, not the stage's own use
+        self.process_peak_rss_at_end = None
+        self.error = None
+
+    def as_dict(self) -> dict:
+        """Get the record as a JSON-serializable dict."""
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, values: dict) -> 'StageRecord':
+        """Rebuild a record sent from another process."""
+        record = cls(values['stage'], values.get('player'))
+        vars(record).update(values)
+        return record
+
+
+class RunMetrics:
+    """
+    Metrics for one ETL run.
+
+    Each stage execution is timed with ``stage()``, which records wall time
+    and CPU time of the calling thread; the instrumented code fills in rows,
+    bytes and retries. Each record also notes the process's peak resident
+    memory so far when the stage ended. That high-water mark only rises and
+    is shared by concurrent stages, so it is reported as such and never
+    attributed to a stage. Records from transform worker processes are
+    merged with ``extend``.
+    """
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        self.status = 'running'
+        self.records: List[StageRecord] = []
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self.duration_seconds = None
+
+    @contextmanager
+    def stage(self, stage: str, player: Optional[str] = None) -> Iterator[StageRecord]:
+        """
+        Time a stage execution.
+
+        Args:
+            stage: Stage name (one of ``STAGES``)
+            player: Player the stage ran for (None for run-wide stages)
+
+        Yields:
+            Record to fill in with rows, bytes and retries
+        """
+        record = StageRecord(stage, player)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.thread_time() - cpu
+            record.process_peak_rss_at_end = peak_rss_bytes()
+            with self._lock:
+                self.records.append(record)
+
+    def extend(self, records: List[dict]):
+        """Add records measured elsewhere (e.g., in a worker process)."""
+        with self._lock:
+            self.records.extend(StageRecord.from_dict(values) for values in records)
+
+    def drain(self) -> List[dict]:
+        """Remove and return the recorded stages as dicts."""
+        with self._lock:
+            records, self.records = self.records, []
+        return [record.as_dict() for record in records]
+
+    def finish(self, status: str):
+        """
+        Mark the run as finished.
+
+        Args:
+            status: 'success' or 'failed'
+        """
+        self.status = status
+        self.finished_at = datetime.now(timezone.utc)
+        self.duration_seconds = time.perf_counter() - self._start
+
+    def totals(self) -> Dict[str, dict]:
+        """Sum every stage's measurements across players."""
+        totals = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            total = totals.setdefault(record.stage, {'count': 0, **dict.fromkeys(STAGE_FIELDS, 0)})
+            total['count'] += 1
+            for field in STAGE_FIELDS:
+                total[field] += getattr(record, field)
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(STAGES))))
+
+    def report(self) -> dict:
+        """Build the structured run report."""
+        with self._lock:
+            records = [record.as_dict() for record in self.records]
+        return {
+            'run_id': self.run_id,
+            'status': self.status,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds,
+            'process_peak_rss_bytes': peak_rss_bytes(),
+            'stages': self.totals(),
+            'records': records,
+        }
+
+    def to_prometheus(self) -> str:
+        """Render the run in the Prometheus text exposition format."""
+        lines = []
+
+        def gauge(name: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+        gauge('nba_etl_run_success', 'Whether the last ETL run succeeded',
+              [('', int(self.status == 'success'))])
+        gauge('nba_etl_run_duration_seconds', 'Wall time of the last ETL run',
+              [('', self.duration_seconds or 0)])
+        gauge('nba_etl_run_timestamp_seconds', 'Start time of the last ETL run',
+              [('', self.started_at.timestamp())])
+        peak = peak_rss_bytes()
+        if peak is not None:
+            gauge('nba_etl_process_peak_rss_bytes',
+                  'Peak resident memory of the ETL process since it started, as of the last run',
+                  [('', peak)])
+
+        # One sample per series: repeated executions (e.g., a retried
+        # publish) are summed
+        series = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            key = (record.stage, record.player)
+            total = series.setdefault(key, StageRecord(*key))
+            for field in STAGE_FIELDS:
+                setattr(total, field, getattr(total, field) + getattr(record, field))
+
+        for field, help_text in [
+            ('wall_seconds', 'Wall time per stage and player in the last run'),
+            ('cpu_seconds', 'CPU time per stage and player in the last run'),
+            ('rows', 'Rows processed per stage and player in the last run'),
+            ('bytes', 'In-memory bytes processed per stage and player in the last run'),
+            ('retries', 'Retried attempts per stage and player in the last run'),
+        ]:
+            gauge(f"nba_etl_stage_{field}", help_text, [
+                (_labels(stage=record.stage, player=record.player), getattr(record, field))
+                for record in series.values()
+            ])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory, retention: Optional[int] = None) -> Path:
+        """
+        Write the JSON run report and the Prometheus textfile.
+
+        The textfile is replaced atomically so a scraping collector never
+        reads a partial file. Reports beyond the newest ``retention`` are
+        deleted.
+
+        Args:
+            directory: Output directory
+            retention: Run reports to keep (defaults to
+                ``config.METRICS_RETENTION``; 0 keeps every report)
+
+        Returns:
+            Path of the JSON report
+        """
+        retention = config.METRICS_RETENTION if retention is None else retention
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = self.started_at.strftime('%Y%m%dT%H%M%SZ')
+        report_path = directory / f"run-{stamp}-{self.run_id}.json"
+        report_path.write_text(json.dumps(self.report(), indent=2))
+
+        temporary = directory / f".{PROMETHEUS_FILE}.{os.getpid()}"
+        temporary.write_text(self.to_prometheus())
+        os.replace(temporary, directory / PROMETHEUS_FILE)
+        logger.info(f"Wrote run report to {report_path}")
+
+        if retention:
+            reports = sorted(directory.glob('run-*.json'), key=lambda path: path.stat().st_mtime_ns)
+            for expired in reports[:-retention]:
+                expired.unlink(missing_ok=True)
+        return report_path
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed buckets."""
+
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = list(buckets or LATENCY_BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        """Record one latency."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[int]:
+        """Observations at or below each bucket bound, then the total."""
+        total, counts = 0, []
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, count in zip(self.buckets + [float('inf')], self.cumulative()):
+            if count >= rank:
+                return bound
+        return float('inf')
+
+
+class QueryMetrics:
+    """Latency histograms of analyzer queries, keyed by query name."""
+
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = buckets
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, query: str, seconds: float):
+        """
+        Record a query's latency.
+
+        Args:
+            query: Query (analyzer method) name
+            seconds: Latency in seconds
+        """
+        with self._lock:
+            histogram = self.histograms.get(query)
+            if histogram is None:
+                histogram = self.histograms[query] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed(self, query: str):
+        """Record the latency of the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(query, time.perf_counter() - start)
+
+    def as_dict(self) -> Dict[str, dict]:
+        """Get count, total and estimated p50/p99 per query."""
+        with self._lock:
+            return {
+                query: {
+                    'count': histogram.count,
+                    'sum_seconds': histogram.sum,
+                    'p50_seconds': histogram.quantile(0.5),
+                    'p99_seconds': histogram.quantile(0.99),
+                }
+                for query, histogram in sorted(self.histograms.items())
+            }
+
+    def to_prometheus(self, name: str = 'nba_analyzer_query_seconds') -> str:
+        """Render the histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {name} Analyzer query latency",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for query, histogram in sorted(self.histograms.items()):
+                bounds = [str(bound) for bound in histogram.buckets] + ['+Inf']
+                for bound, count in zip(bounds, histogram.cumulative()):
+                    lines.append(f"{name}_bucket{_labels(query=query, le=bound)} {count}")
+                lines.append(f"{name}_sum{_labels(query=query)} {histogram.sum}")
+                lines.append(f"{name}_count{_labels(query=query)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
@@ -1,215 +1,984 @@
 """NBA Stats ETL Pipeline - Extract player stats and load to PostgreSQL."""
 import logging
+import queue
 import sys
-from typing import Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine
-from nba_api.stats.endpoints import playergamelog
-from nba_api.stats.library.parameters import SeasonAll
+from sqlalchemy import (
+    MetaData, String, Table, bindparam, column, func, inspect, select, text, union_all
+)
 
+from changes import (
+    change_event, changed_players, diff_staged_games, emit_change_event, event_targets,
+    player_change, write_change_log
+)
 from config import config
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
+from database import dispose_engines, get_engine, is_transient_db_error, pool_status
+from extraction import (
+    GameLogSource, NBAApiGameLogSource, TokenBucket, current_season, retry_with_backoff
 )
+from league import LeagueGameLogSource
+from loaders import bulk_load, staging_name, swap_in_staged_tables
+from metrics import RunMetrics, frame_bytes
+from response_cache import CachedGameLogSource, RawResponseCache
+from rolling import (
+    ROLLING_TABLE, SOURCE_COLUMNS, compute_rolling, players_with_rolling_stats, update_rolling_stats,
+    write_rolling
+)
+from roster import load_roster
+from schema import (
+    COMBINED_TABLE, GAME_COLUMN_NAMES, GAMES_TABLE, PLAYERS_TABLE, create_game_table,
+    create_games_tables, create_player_views, games_table, migrate, player_games, write_players
+)
+from summaries import build_summaries
+
+if TYPE_CHECKING:
+    # Snapshots and the transform pool are loaded when a run needs them
+    from columnar import ColumnarStore
+
 logger = logging.getLogger(__name__)
 
+# Team lookups, built once from the configured divisions and conferences
+UNKNOWN = 'UNKNOWN'
+DIVISION_CONFERENCES = {
+    division: conference
+    for conference, divisions in config.CONFERENCES.items()
+    for division in divisions
+}
+TEAM_DIVISIONS = {
+    team: division
+    for division, teams in config.DIVISIONS.items()
+    for team in teams
+}
+TEAM_CONFERENCES = {
+    team: DIVISION_CONFERENCES.get(division, UNKNOWN)
+    for team, division in TEAM_DIVISIONS.items()
+}
+DIVISION_LEVELS = list(config.DIVISIONS) + [UNKNOWN]
+CONFERENCE_LEVELS = list(config.CONFERENCES) + [UNKNOWN]
+LOCATION_LEVELS = ['HOME', 'AWAY', '']
+MONTH_LEVELS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December']
+DAY_OF_WEEK_LEVELS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+                      'Saturday', 'Sunday']
+
+GAME_DATE_FORMAT = '%b %d, %Y'
+
+# Players per INSERT when building nba_5 (SQLite allows 500 UNION ALL terms)
+COMBINED_BATCH_PLAYERS = 250
+
+# Upper-case month abbreviations packed into 24-bit keys, sorted for searchsorted
+_MONTH_KEYS, _MONTH_NUMBERS = (np.array(values) for values in zip(*sorted(
+    ((ord(name[0]) << 16) | (ord(name[1]) << 8) | ord(name[2]), number)
+    for number, name in enumerate((m[:3].upper() for m in MONTH_LEVELS), start=1)
+)))
+STAT_COLUMNS = [
+    'MIN', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'OREB', 'DREB',
+    'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS'
+]
+
+
+def _parse_api_dates(dates: pd.Series) -> Optional[pd.Series]:
+    """
+    Parse 'MMM DD, YYYY' game dates with fixed-width byte arithmetic.
+    
+    Args:
+        dates: Date strings as returned by the NBA API (e.g., 'OCT 29, 2003')
+        
+    Returns:
+        Parsed dates, or None if any value does not match the layout
+    """
+    try:
+        raw = dates.to_numpy().astype('S13')
+    except (UnicodeEncodeError, TypeError, ValueError):
+        return None
+    if len(raw) == 0:
+        return None
+    
+    chars = raw.view(np.uint8).reshape(len(raw), 13)
+    if chars[:, 12].any() or (chars[:, 3] != ord(' ')).any() or (chars[:, 6] != ord(',')).any():
+        return None
+    
+    digits = chars[:, [4, 5, 8, 9, 10, 11]].astype(np.int64) - ord('0')
+    if ((digits < 0) | (digits > 9)).any():
+        return None
+    
+    letters = chars[:, :3].astype(np.int64) & ~0x20
+    keys = (letters[:, 0] << 16) | (letters[:, 1] << 8) | letters[:, 2]
+    slots = np.minimum(np.searchsorted(_MONTH_KEYS, keys), len(_MONTH_KEYS) - 1)
+    if (_MONTH_KEYS[slots] != keys).any():
+        return None
+    
+    day = digits[:, 0] * 10 + digits[:, 1]
+    year = digits[:, 2] * 1000 + digits[:, 3] * 100 + digits[:, 4] * 10 + digits[:, 5]
+    if ((day < 1) | (day > 31)).any():
+        return None
+    
+    months = (year - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (_MONTH_NUMBERS[slots] - 1)
+    values = (months.astype('datetime64[D]') + (day - 1)).astype('datetime64[ns]')
+    return pd.Series(values, index=dates.index, name=dates.name)
+
 
 class NBAStatsETL:
     """ETL pipeline for NBA player statistics."""
     
-    def __init__(self):
-        """Initialize the ETL pipeline."""
+    def __init__(self, source: Optional[GameLogSource] = None,
+                 workers: Optional[int] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 offline: Optional[bool] = None,
+                 players: Optional[Dict[str, int]] = None):
+        """
+        Initialize the ETL pipeline.
+        
+        Args:
+            source: Game log source (defaults to the live NBA API, cached
+                under ``config.RAW_CACHE_DIR`` when enabled)
+            workers: Number of concurrent extraction workers
+            rate_limiter: Shared rate limiter for API requests
+            offline: Replay the default source from the cache without
+                calling the API (defaults to ``config.OFFLINE``)
+            players: Mapping of player name to NBA API player ID (defaults
+                to the roster from ``config.ROSTER_SOURCE``, loaded on first use)
+        """
         self.engine = None
-        self.player_data = {}
+        self._players = players
+        self._labels = None
+        self.metrics = RunMetrics()
+        # Players changed by the last publish, mapping name to change record
+        self.changes: Dict[str, dict] = {}
+        self.workers = workers or config.EXTRACT_WORKERS
+        self.rate_limiter = rate_limiter or TokenBucket(
+            config.API_RATE_LIMIT, config.API_RATE_BURST
+        )
         
-    def connect_to_database(self):
-        """Establish database connection."""
+        if source is None:
+            offline = config.OFFLINE if offline is None else offline
+            cache = RawResponseCache() if config.RAW_CACHE_ENABLED or offline else None
+            if config.INGEST_MODE == 'league':
+                source = LeagueGameLogSource(
+                    cache=cache, rate_limiter=self.rate_limiter, offline=offline
+                )
+            elif config.INGEST_MODE == 'player':
+                source = NBAApiGameLogSource()
+                if cache is not None:
+                    source = CachedGameLogSource(
+                        source, cache, offline=offline, rate_limiter=self.rate_limiter
+                    )
+            else:
+                raise ValueError(
+                    f"Unknown INGEST_MODE '{config.INGEST_MODE}', expected 'player' or 'league'"
+                )
+        self.source = source
+    
+    @property
+    def players(self) -> Dict[str, int]:
+        """Tracked players, mapping player name to NBA API player ID."""
+        if self._players is None:
+            self._players = load_roster(engine=self.engine)
+        return self._players
+        
+    def connect_to_database(self, url: Optional[str] = None):
+        """
+        Attach to the process-wide database engine and its connection pool.
+        
+        Args:
+            url: Database URL (defaults to ``config.database_url``)
+        """
         try:
-            self.engine = create_engine(config.database_url)
-            logger.info("Successfully connected to PostgreSQL database")
+            self.engine = get_engine(url)
+            logger.info(f"Successfully connected to {self.engine.dialect.name} database")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
     
-    def extract_player_data(self, player_id: int) -> pd.DataFrame:
+    def extract_player_data(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
         """
         Extract career game log for a specific player.
         
         Args:
             player_id: NBA API player ID
+            season: Single season to extract (defaults to the whole career)
             
         Returns:
             DataFrame containing player's career game log
         """
+        def fetch():
+            if self.source.throttled:
+                self.rate_limiter.acquire()
+            return self.source.fetch(player_id, season)
+        
         try:
-            career = playergamelog.PlayerGameLog(
-                player_id=player_id,
-                season=SeasonAll.all
-            )
-            df = career.get_data_frames()[0]
+            with self.metrics.stage('extract', self._player_label(player_id)) as stage:
+                df = retry_with_backoff(
+                    fetch,
+                    max_retries=config.API_MAX_RETRIES,
+                    base_delay=config.API_BACKOFF_BASE,
+                    max_delay=config.API_BACKOFF_MAX,
+                    on_retry=lambda attempt, error: setattr(stage, 'retries', attempt)
+                )
+                stage.rows = len(df)
+                stage.bytes = frame_bytes(df)
             logger.info(f"Extracted {len(df)} games for player {player_id}")
             return df
         except Exception as e:
             logger.error(f"Failed to extract data for player {player_id}: {e}")
             raise
     
-    def transform_player_data(self, df: pd.DataFrame, player_name: str) -> pd.DataFrame:
+    def _player_label(self, player_id: int) -> str:
+        """Configured player name for an NBA API player ID (for metrics)."""
+        if self._labels is None or len(self._labels) != len(self.players):
+            self._labels = {configured_id: name for name, configured_id in self.players.items()}
+        return self._labels.get(player_id, str(player_id))
+    
+    def iter_extracted(self, players: Dict[str, int],
+                       seasons: Optional[Dict[str, Optional[str]]] = None
+                       ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Extract game logs concurrently, yielding each player as it arrives.
+        
+        Finished extractions wait in a queue of ``config.PIPELINE_QUEUE_SIZE``
+        players, so extraction pauses when later stages fall behind.
+        
+        Args:
+            players: Mapping of player name to NBA API player ID
+            seasons: Optional mapping of player name to the season to fetch
+            
+        Yields:
+            Player name and raw game log, in completion order
+        """
+        seasons = seasons or {}
+        results = queue.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def extract(name: str, player_id: int):
+            if stop.is_set():
+                return
+            try:
+                item = (name, self.extract_player_data(player_id, seasons.get(name)), None)
+            except Exception as e:
+                item = (name, None, e)
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for name, player_id in players.items():
+                pool.submit(extract, name, player_id)
+            for _ in range(len(players)):
+                name, df, error = results.get()
+                if error is not None:
+                    raise error
+                yield name, df
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def transform_player_data(self, df: pd.DataFrame, player_name: str,
+                              first_game: int = 1) -> pd.DataFrame:
         """
         Transform raw player data with additional features.
         
         Args:
             df: Raw player data DataFrame
             player_name: Name identifier for the player
+            first_game: Career game number of the earliest game in ``df``
             
         Returns:
             Transformed DataFrame with additional features
         """
-        # Convert date column
-        df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
+        with self.metrics.stage('transform', player_name) as stage:
+            # Convert date column
+            df['GAME_DATE'] = self._parse_game_dates(df['GAME_DATE'])
+            
+            # Drop unnecessary columns
+            df = df.drop(['SEASON_ID', 'Game_ID', 'VIDEO_AVAILABLE'], axis=1, errors='ignore')
+            
+            # Sort by game date (the API returns games newest first)
+            if df['GAME_DATE'].is_monotonic_decreasing:
+                df = df.iloc[::-1]
+            elif not df['GAME_DATE'].is_monotonic_increasing:
+                df = df.iloc[np.argsort(df['GAME_DATE'].to_numpy(), kind='stable')]
+            
+            # Convert percentages to more readable format
+            df['FG_PCT'] = (df['FG_PCT'] * 100).round(2)
+            df['FG3_PCT'] = (df['FG3_PCT'] * 100).round(2)
+            df['FT_PCT'] = (df['FT_PCT'] * 100).round(2)
+            
+            # Add date components
+            dates = df['GAME_DATE'].dt
+            df['YEAR'] = dates.year.astype(np.int16)
+            df['MONTH'] = pd.Categorical.from_codes(dates.month.to_numpy() - 1, MONTH_LEVELS)
+            df['DAY'] = dates.day.astype(np.int8)
+            df['DAY_OF_WEEK'] = pd.Categorical.from_codes(dates.dayofweek.to_numpy(), DAY_OF_WEEK_LEVELS)
+            
+            # Derive opponent, division, conference and location once per
+            # distinct matchup, then broadcast through the category codes
+            matchup = pd.Categorical(df['MATCHUP'])
+            matchups = matchup.categories
+            opponents = matchups.str[-3:]
+            opp_codes, opp_levels = pd.factorize(opponents, sort=True)
+            div_codes = [DIVISION_LEVELS.index(TEAM_DIVISIONS.get(t, UNKNOWN)) for t in opponents]
+            conf_codes = [CONFERENCE_LEVELS.index(TEAM_CONFERENCES.get(t, UNKNOWN)) for t in opponents]
+            location_codes = np.select(
+                [matchups.str.contains('vs.', regex=False), matchups.str.contains('@', regex=False)],
+                [0, 1],
+                default=2
+            )
+            
+            codes = matchup.codes
+            df['MATCHUP'] = matchup
+            df['OPP'] = pd.Categorical.from_codes(opp_codes[codes], opp_levels)
+            df['DIV'] = pd.Categorical.from_codes(np.asarray(div_codes, dtype=np.int8)[codes], DIVISION_LEVELS)
+            df['CONF'] = pd.Categorical.from_codes(np.asarray(conf_codes, dtype=np.int8)[codes], CONFERENCE_LEVELS)
+            df['LOCATION'] = pd.Categorical.from_codes(location_codes[codes], LOCATION_LEVELS)
+            df['WL'] = df['WL'].astype('category')
+            
+            # Downcast counting stats to the smallest integer type that fits
+            for col in STAT_COLUMNS:
+                values = df[col].to_numpy()
+                if values.dtype.kind in 'iu' and len(values):
+                    low, high = values.min(), values.max()
+                    for dtype in (np.int8, np.int16, np.int32):
+                        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                            df[col] = values.astype(dtype)
+                            break
+            
+            # Add game number
+            df['G'] = np.arange(first_game, first_game + len(df), dtype=np.int32)
+            
+            # Replace Player_ID with name
+            df['Player_ID'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), [player_name])
+            
+            # Reorder columns for better readability
+            column_order = [
+                'G', 'Player_ID', 'GAME_DATE', 'MONTH', 'DAY', 'YEAR',
+                'DAY_OF_WEEK', 'MATCHUP', 'LOCATION', 'OPP', 'DIV', 'CONF',
+                'WL', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT',
+                'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL',
+                'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS'
+            ]
+            
+            df = df[column_order]
+            stage.rows = len(df)
+            stage.bytes = frame_bytes(df)
+        
+        logger.info(f"Transformed data for {player_name}")
+        return df
+    
+    @staticmethod
+    def _parse_game_dates(dates: pd.Series) -> pd.Series:
+        """Parse API game dates, falling back to format inference."""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
+        parsed = _parse_api_dates(dates)
+        if parsed is not None:
+            return parsed
+        try:
+            return pd.to_datetime(dates, format=GAME_DATE_FORMAT)
+        except (ValueError, TypeError):
+            return pd.to_datetime(dates)
+    
+    def load_to_database(self, df: pd.DataFrame, player_name: str):
+        """
+        Replace a player's games in the games table.
+        
+        Args:
+            df: Transformed player data
+            player_name: Name of the player (a key of ``self.players``)
+        """
+        try:
+            with self.metrics.stage('load', player_name) as stage, self.engine.begin() as conn:
+                games = create_games_tables(conn)
+                write_players(conn, {player_name: self.players[player_name]})
+                conn.execute(games.delete().where(
+                    games.c.player_key == self.players[player_name]
+                ))
+                bulk_load(self._to_games_frame(df, player_name), GAMES_TABLE, conn)
+                stage.rows, stage.bytes = len(df), frame_bytes(df)
+            logger.info(f"Loaded {len(df)} records for '{player_name}'")
+        except Exception as e:
+            logger.error(f"Failed to load data for '{player_name}': {e}")
+            raise
+    
+    def reset_staging(self):
+        """Drop the games staging table left behind by an earlier, failed run."""
+        with self.engine.begin() as conn:
+            games_table(staging_name(GAMES_TABLE), partitions=0).drop(conn, checkfirst=True)
+    
+    def stage_table(self, df: pd.DataFrame, player_name: str, con=None) -> str:
+        """
+        Load a player's games into the games staging table.
+        
+        The games table is untouched until ``publish`` merges the staged
+        players in. Staging a player again replaces their staged games.
+        
+        Args:
+            df: Transformed player data
+            player_name: Name of the player (a key of ``self.players``)
+            con: Optional connection to write through (defaults to the engine)
+            
+        Returns:
+            Name of the staging table
+        """
+        staged = staging_name(GAMES_TABLE)
+        try:
+            if con is None:
+                with self.engine.begin() as conn:
+                    return self.stage_table(df, player_name, conn)
+            
+            with self.metrics.stage('load', player_name) as stage:
+                table = games_table(staged, partitions=0)
+                table.create(con, checkfirst=True)
+                con.execute(table.delete().where(
+                    table.c.player_key == self.players[player_name]
+                ))
+                bulk_load(self._to_games_frame(df, player_name), staged, con)
+                stage.rows, stage.bytes = len(df), frame_bytes(df)
+            logger.info(f"Staged {len(df)} records for '{player_name}'")
+            return staged
+        except Exception as e:
+            logger.error(f"Failed to stage data for '{player_name}': {e}")
+            raise
+    
+    def merge_staged_games(self, conn, player_names: List[str]) -> int:
+        """
+        Replace the staged players' games in the games table.
+        
+        Staged careers are diffed against the stored games first, and the
+        players with new, corrected or removed games are added to
+        ``self.changes``.
+        
+        Args:
+            conn: Connection with an open transaction
+            player_names: Players staged by ``stage_table`` in this run
+            
+        Returns:
+            Number of rows merged
+        """
+        if not player_names:
+            return 0
+        games = create_games_tables(conn)
+        staged = games_table(staging_name(GAMES_TABLE), partitions=0)
+        keys = [self.players[name] for name in player_names]
+        names = dict(zip(keys, player_names))
+        for key, change in diff_staged_games(conn, staged, games, keys).items():
+            self.changes[names[key]] = change
+        conn.execute(games.delete().where(games.c.player_key.in_(keys)))
+        rows = conn.execute(games.insert().from_select(
+            [c.name for c in staged.c], select(staged).where(staged.c.player_key.in_(keys))
+        )).rowcount
+        staged.drop(conn)
+        logger.info(f"Merged {rows} staged records for {len(keys)} players into '{GAMES_TABLE}'")
+        return rows
+    
+    def stage_combined_table(self, conn, players: Dict[str, int], games: int) -> str:
+        """
+        Stage the combined table from the tail of every player's games.
+        
+        Runs as ``INSERT ... SELECT`` of the players' most recent games
+        merged by date, so no player data passes through Python. Players
+        are inserted ``COMBINED_BATCH_PLAYERS`` at a time to stay under
+        SQLite's limit on UNION ALL terms. Each player's tail is read newest
+        first through the games table's (player_key, game_date) key, within
+        the player's partition on PostgreSQL, which lets PostgreSQL merge
+        the already-sorted tails (Merge Append) instead of sorting the
+        combined rows.
+        
+        Args:
+            conn: Connection with an open transaction
+            players: Mapping of player name to NBA API player ID
+            games: Most recent games taken from each player
+            
+        Returns:
+            Name of the staging table
+        """
+        staged = staging_name(COMBINED_TABLE)
+        with self.metrics.stage('combine') as stage:
+            combined = create_game_table(conn, staged, ranked=True)
+            tails = []
+            for player_name, player_key in players.items():
+                player = player_games(player_name, player_key)
+                game_date = player.selected_columns.game_date
+                tail = player.order_by(game_date.desc()).limit(games).subquery()
+                tails.append(select(tail))
+            
+            rows = 0
+            for start in range(0, len(tails), COMBINED_BATCH_PLAYERS):
+                batch = tails[start:start + COMBINED_BATCH_PLAYERS]
+                merged = union_all(*batch).order_by(column('game_date').desc())
+                rows += conn.execute(combined.insert().from_select(GAME_COLUMN_NAMES, merged)).rowcount
+            stage.rows = rows
+        logger.info(f"Staged {rows} records for table '{COMBINED_TABLE}'")
+        return staged
+    
+    def upsert_player_data(self, df: pd.DataFrame, player_name: str, conn=None) -> int:
+        """
+        Write a player's new and changed games into the games table.
         
-        # Sort by game date
-        df = df.sort_values(by='GAME_DATE', ascending=True)
+        Rows are keyed on (player, game_date). Stored rows on or after the
+        earliest date in ``df`` are compared with ``df`` and only rows that are
+        new or differ are rewritten and recorded in ``self.changes``. The
+        player's ingest state is updated in the same transaction.
         
-        # Drop unnecessary columns
-        df = df.drop(['SEASON_ID', 'Game_ID', 'VIDEO_AVAILABLE'], axis=1, errors='ignore')
+        Args:
+            df: Transformed player data covering the tail of the career
+            player_name: Name of the player (a key of ``self.players``)
+            conn: Connection with an open transaction to join (defaults to a
+                new transaction)
+            
+        Returns:
+            Number of rows written
+        """
+        if conn is None:
+            with self.engine.begin() as conn:
+                return self.upsert_player_data(df, player_name, conn)
         
-        # Convert percentages to more readable format
-        df['FG_PCT'] = (df['FG_PCT'] * 100).round(2)
-        df['FG3_PCT'] = (df['FG3_PCT'] * 100).round(2)
-        df['FT_PCT'] = (df['FT_PCT'] * 100).round(2)
+        df = self._to_db_frame(df)
+        player_key = self.players[player_name]
+        try:
+            with self.metrics.stage('load', player_name) as stage:
+                games = create_games_tables(conn)
+                stored = player_games(player_name, player_key)
+                existing = pd.read_sql(
+                    stored.where(
+                        stored.selected_columns.game_date >= df['game_date'].min().to_pydatetime()
+                    ),
+                    conn,
+                    parse_dates=['game_date']
+                )
+                changes = self._diff_rows(df, existing)
+                
+                if len(changes):
+                    is_new = ~changes['game_date'].isin(existing['game_date'])
+                    self.changes[player_name] = player_change(
+                        is_new.sum(), (~is_new).sum(), first_game_date=changes['game_date'].min()
+                    )
+                    conn.execute(games.delete().where(
+                        games.c.player_key == player_key,
+                        games.c.game_date.in_(changes['game_date'].tolist())
+                    ))
+                    bulk_load(self._to_games_frame(changes, player_name), GAMES_TABLE, conn)
+                
+                self._write_ingest_state(conn, player_name, df)
+                stage.rows, stage.bytes = len(changes), frame_bytes(changes)
+            
+            logger.info(f"Upserted {len(changes)} of {len(df)} records for '{player_name}'")
+            return len(changes)
+        except Exception as e:
+            logger.error(f"Failed to upsert data for '{player_name}': {e}")
+            raise
+    
+    @staticmethod
+    def _to_db_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Lower-case column names so unquoted SQL identifiers resolve."""
+        return df.rename(columns=str.lower)
+    
+    def _to_games_frame(self, df: pd.DataFrame, player_name: str) -> pd.DataFrame:
+        """Key a player's rows on their NBA API player ID for the games table."""
+        df = self._to_db_frame(df).drop(columns='player_id')
+        df.insert(0, 'player_key', self.players[player_name])
+        return df
+    
+    @staticmethod
+    def _diff_rows(new: pd.DataFrame, existing: pd.DataFrame) -> pd.DataFrame:
+        """Get the rows of ``new`` that are missing from or differ in ``existing``."""
+        if existing.empty:
+            return new
         
-        # Add date components
-        df['YEAR'] = df['GAME_DATE'].dt.year
-        df['MONTH'] = df['GAME_DATE'].dt.month_name()
-        df['DAY'] = df['GAME_DATE'].dt.day
-        df['DAY_OF_WEEK'] = df['GAME_DATE'].dt.day_name()
+        key = ['player_id', 'game_date']
+        merged = new.merge(
+            existing[new.columns], on=key, how='left', suffixes=('', '_old'), indicator=True
+        )
+        stale = merged['_merge'] == 'left_only'
+        for col in new.columns.difference(key):
+            current, stored = merged[col], merged[f'{col}_old']
+            stale |= ~((current == stored) | (current.isna() & stored.isna()))
         
-        # Extract opponent team code
-        df['OPP'] = df['MATCHUP'].str[-3:]
+        return new[stale.to_numpy()]
+    
+    def get_ingest_state(self) -> Dict[str, dict]:
+        """
+        Get the last ingested game per player.
         
-        # Add division and conference
-        df['DIV'] = df['OPP'].apply(self._get_division)
-        df['CONF'] = df['OPP'].apply(self._get_conference)
+        Returns:
+            Mapping of player name to ``last_game_date`` and ``games``
+        """
+        if not inspect(self.engine).has_table(config.INGEST_STATE_TABLE):
+            return {}
         
-        # Add location (home/away)
-        df['LOCATION'] = df['MATCHUP'].apply(
-            lambda x: 'HOME' if 'vs.' in x else 'AWAY' if '@' in x else ''
+        state = pd.read_sql_table(
+            config.INGEST_STATE_TABLE, self.engine, parse_dates=['last_game_date']
         )
+        return state.set_index('player_name')[['last_game_date', 'games']].to_dict('index')
+    
+    def _write_ingest_state(self, conn, player_name: str, df: pd.DataFrame):
+        """Replace a player's ingest state row in an open transaction (removed without games)."""
+        if inspect(conn).has_table(config.INGEST_STATE_TABLE):
+            state = Table(config.INGEST_STATE_TABLE, MetaData(), autoload_with=conn)
+            conn.execute(state.delete().where(state.c.player_name == player_name))
+        if df.empty:
+            return
         
-        # Add game number
-        df['G'] = np.arange(1, len(df) + 1)
+        last = df.loc[df['game_date'].idxmax()]
+        pd.DataFrame([{
+            'player_name': player_name,
+            'last_game_date': last['game_date'],
+            'games': int(last['g']),
+            'updated_at': datetime.now()
+        }]).to_sql(config.INGEST_STATE_TABLE, conn, if_exists='append', index=False)
+    
+    def _count_games_before(self, player_name: str, game_date: pd.Timestamp) -> int:
+        """Count a player's stored games played before a date."""
+        games = games_table(partitions=0)
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(func.count()).select_from(games)
+                .where(games.c.player_key == self.players[player_name],
+                       games.c.game_date < game_date.to_pydatetime())
+            ).scalar_one()
+    
+    def _first_game_number(self, raw_data: pd.DataFrame, player_name: str) -> int:
+        """Career game number of the earliest game in a recent slice."""
+        first_date = self._parse_game_dates(raw_data['GAME_DATE']).min()
+        return self._count_games_before(player_name, first_date) + 1
+    
+    def _response_unchanged(self, player_id: int, season: Optional[str]) -> bool:
+        """Check whether a cached API response matches what was last loaded."""
+        return (
+            isinstance(self.source, CachedGameLogSource)
+            and self.source.is_unchanged(player_id, season)
+        )
+    
+    def publish(self, full_loads: Dict[str, pd.DataFrame],
+                deltas: Dict[str, pd.DataFrame], game_counts: Dict[str, int]) -> int:
+        """
+        Make one run's results visible in a single transaction.
         
-        # Replace Player_ID with name
-        df['Player_ID'] = player_name
+        Games for full loads must already be staged. Merging them into the
+        games table, incremental upserts, ingest state, the combined
+        ``nba_5`` table, its summary tables, the change log and the swap of
+        every staged table commit together, so readers always see a complete
+        snapshot from one run and a failed run leaves the previous one intact.
         
-        # Reorder columns for better readability
-        column_order = [
-            'G', 'Player_ID', 'GAME_DATE', 'MONTH', 'DAY', 'YEAR',
-            'DAY_OF_WEEK', 'MATCHUP', 'LOCATION', 'OPP', 'DIV', 'CONF',
-            'WL', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT',
-            'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL',
-            'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS'
-        ]
+        When every player keeps the same games in ``nba_5``, only the changed
+        players' rows of the summary tables are aggregated again. Players
+        without games are left out of ``nba_5``, so they do not shrink its
+        window of games per player to zero.
         
-        df = df[column_order]
+        Args:
+            full_loads: Fully reloaded players and their transformed data
+                (at least the rolling stats source columns)
+            deltas: Incrementally loaded players and their transformed slices
+            game_counts: Career games per player after this run (0 for
+                rostered players without games)
+            
+        Returns:
+            The published load generation
+        """
+        self.changes = {}
+        with self.engine.begin() as conn:
+            create_games_tables(conn)
+            write_players(conn, {name: self.players[name] for name in game_counts})
+            self.merge_staged_games(conn, list(full_loads))
+            
+            for player_name, df in deltas.items():
+                if self.upsert_player_data(df, player_name, conn):
+                    update_rolling_stats(conn, player_name, self.players[player_name],
+                                         since=df['GAME_DATE'].min())
+            for player_name, df in full_loads.items():
+                db_frame = self._to_db_frame(df)
+                self._write_ingest_state(conn, player_name, db_frame)
+                write_rolling(conn, player_name, compute_rolling(db_frame))
+            
+            # Backfill rolling stats for players loaded before they existed
+            with_games = {name: count for name, count in game_counts.items() if count}
+            with_rolling = set(players_with_rolling_stats(conn))
+            for player_name in with_games:
+                if player_name not in with_rolling and player_name not in full_loads:
+                    update_rolling_stats(conn, player_name, self.players[player_name])
+                    self.changes.setdefault(player_name, player_change())
+            
+            # Create combined table with equal games for each player
+            logger.info("Creating combined player comparison table...")
+            window = min(with_games.values(), default=0)
+            same_window = self._combined_window(conn) == {name: window for name in with_games}
+            staged_combined = self.stage_combined_table(
+                conn, {name: self.players[name] for name in with_games}, window
+            )
+            
+            # Materialize rollups from the staged combined table
+            generation = self._bump_load_generation(conn)
+            write_change_log(conn, generation, self.changes, self.players)
+            summary_tables = build_summaries(
+                conn, staged_combined, generation, players=list(self.changes) if same_window else None
+            )
+            
+            swap_in_staged_tables(conn, [COMBINED_TABLE] + summary_tables)
+            if config.PLAYER_VIEWS_ENABLED:
+                create_player_views(conn, {name: self.players[name] for name in game_counts})
         
-        logger.info(f"Transformed data for {player_name}")
-        return df
+        logger.info(
+            f"Published load generation {generation}: "
+            f"{len(full_loads)} reloaded and {len(deltas)} updated players, "
+            f"{len(self.changes)} changed"
+        )
+        return generation
     
-    def _get_division(self, team_code: str) -> str:
-        """Get division for a team code."""
-        for division, teams in config.DIVISIONS.items():
-            if team_code in teams:
-                return division
-        return 'UNKNOWN'
+    def _combined_window(self, conn) -> Dict[str, int]:
+        """Games per player in the published combined table (empty if there is none)."""
+        if not inspect(conn).has_table(COMBINED_TABLE):
+            return {}
+        return dict(conn.execute(
+            text(f"SELECT player_id, COUNT(*) FROM {COMBINED_TABLE} GROUP BY player_id")
+        ).all())
     
-    def _get_conference(self, team_code: str) -> str:
-        """Get conference for a team code."""
-        division = self._get_division(team_code)
-        for conference, divisions in config.CONFERENCES.items():
-            if division in divisions:
-                return conference
-        return 'UNKNOWN'
+    def get_load_generation(self) -> Optional[int]:
+        """Get the generation stamp of the last published load."""
+        if not inspect(self.engine).has_table(config.LOAD_GENERATION_TABLE):
+            return None
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(f"SELECT MAX(generation) FROM {config.LOAD_GENERATION_TABLE}")
+            ).scalar()
     
-    def load_to_database(self, df: pd.DataFrame, table_name: str):
+    def write_snapshots(self, store: Optional['ColumnarStore'] = None):
         """
-        Load DataFrame to PostgreSQL table.
+        Write Parquet snapshots of the published tables for the columnar analyzer.
+        
+        Tables are read back in one repeatable-read transaction, so the
+        snapshot matches a single load generation exactly. Players the change
+        log shows unchanged since the previous snapshot keep its files, so
+        only the changed players' games are read. Does nothing if the current
+        snapshot is already at the published generation.
         
         Args:
-            df: DataFrame to load
-            table_name: Name of the target table
+            store: Snapshot store (defaults to ``config.SNAPSHOT_DIR``)
         """
-        try:
-            df.to_sql(
-                table_name,
-                self.engine,
-                if_exists='replace',
-                index=False
+        from columnar import ColumnarStore, write_snapshot
+        
+        store = store or ColumnarStore()
+        generation = self.get_load_generation()
+        previous = store.current()
+        if generation is None or (previous is not None and previous['generation'] == generation):
+            return
+        
+        conn = self.engine.connect()
+        if self.engine.dialect.name == 'postgresql':
+            conn = conn.execution_options(isolation_level='REPEATABLE READ')
+        with conn, conn.begin():
+            generation = conn.execute(
+                text(f"SELECT MAX(generation) FROM {config.LOAD_GENERATION_TABLE}")
+            ).scalar()
+            existing = set(inspect(conn).get_table_names())
+            changed = None
+            if previous is not None:
+                changed = changed_players(conn, previous['generation'], generation)
+            reused = [] if changed is None else [
+                name for name in self.players
+                if name not in changed and name in previous['tables']
+            ]
+            
+            frames = {}
+            if GAMES_TABLE in existing and len(reused) < len(self.players):
+                # Every other player's games in one scan, split per player
+                query = (
+                    f"SELECT p.player_name AS player_id, "
+                    f"{', '.join('g.' + c for c in GAME_COLUMN_NAMES if c != 'player_id')} "
+                    f"FROM {GAMES_TABLE} g JOIN {PLAYERS_TABLE} p ON p.player_key = g.player_key "
+                )
+                params = None
+                if reused:
+                    query += "WHERE p.player_name IN :players "
+                    params = {'players': [name for name in self.players if name not in reused]}
+                query = text(query + "ORDER BY p.player_name, g.game_date")
+                if reused:
+                    query = query.bindparams(bindparam('players', expanding=True, type_=String))
+                games = pd.read_sql(
+                    query, conn, params=params, parse_dates=['game_date']
+                )[GAME_COLUMN_NAMES]
+                for name, player in games.groupby('player_id', sort=False):
+                    if name in self.players:
+                        frames[name] = player.reset_index(drop=True)
+            frames[COMBINED_TABLE] = pd.read_sql(
+                f"SELECT * FROM {COMBINED_TABLE} ORDER BY game_date DESC, player_id", conn,
+                parse_dates=['game_date']
             )
-            logger.info(f"Loaded {len(df)} records to table '{table_name}'")
-        except Exception as e:
-            logger.error(f"Failed to load data to table '{table_name}': {e}")
-            raise
+            if ROLLING_TABLE in existing:
+                frames[ROLLING_TABLE] = pd.read_sql(
+                    f"SELECT * FROM {ROLLING_TABLE} ORDER BY player_id, game_date", conn,
+                    parse_dates=['game_date']
+                )
+        write_snapshot(frames, generation, store.root, reused=reused, changed=changed)
     
-    def run(self):
-        """Execute the full ETL pipeline."""
+    def _bump_load_generation(self, conn) -> int:
+        """Increment the load generation stamp read by analyzer caches."""
+        generation = 1
+        if inspect(conn).has_table(config.LOAD_GENERATION_TABLE):
+            stamp = Table(config.LOAD_GENERATION_TABLE, MetaData(), autoload_with=conn)
+            generation += conn.execute(select(func.max(stamp.c.generation))).scalar() or 0
+            conn.execute(stamp.delete())
+        
+        pd.DataFrame([{
+            'generation': generation,
+            'loaded_at': datetime.now()
+        }]).to_sql(config.LOAD_GENERATION_TABLE, conn, if_exists='append', index=False)
+        return generation
+    
+    def run(self, incremental: Optional[bool] = None):
+        """
+        Execute the ETL pipeline.
+        
+        Args:
+            incremental: Only fetch and upsert the current season for players
+                that were loaded before (defaults to ``config.ETL_MODE``)
+        """
+        from pipeline import ParallelTransformer
+        
+        if incremental is None:
+            incremental = config.ETL_MODE == 'incremental'
+        
+        self.metrics = RunMetrics()
+        targets = event_targets()
         try:
             logger.info("Starting NBA Stats ETL Pipeline")
             
-            # Connect to database
+            # Connect to database and bring existing tables up to the schema
             self.connect_to_database()
+            migrate(self.engine, self.players)
             
-            # Extract and transform data for each player
-            all_players_data = []
+            # Players with ingest state only need the current season
+            loaded = self.get_ingest_state()
+            state = loaded if incremental else {}
+            season = current_season()
+            seasons = {name: season for name in self.players if name in state}
             
-            for player_name, player_id in config.PLAYER_IDS.items():
-                logger.info(f"Processing {player_name}...")
-                
-                # Extract
-                raw_data = self.extract_player_data(player_id)
-                
-                # Transform
-                transformed_data = self.transform_player_data(raw_data, player_name)
-                self.player_data[player_name] = transformed_data
-                
-                # Load individual player table
-                self.load_to_database(transformed_data, player_name)
+            # Pipeline: extraction threads feed transform worker processes,
+            # and finished players are staged while the rest are in flight
+            self.reset_staging()
+            full_loads, deltas, game_counts = {}, {}, {}
+            
+            def load(player_name: str, transformed: pd.DataFrame):
+                # G numbers the whole career, so a delta's last game gives the career count
+                game_counts[player_name] = int(transformed['G'].max()) if len(transformed) else 0
+                if player_name in state:
+                    deltas[player_name] = transformed
+                else:
+                    # Staged tables feed nba_5; keep only what rolling stats need
+                    self.stage_table(transformed, player_name)
+                    full_loads[player_name] = self._to_db_frame(transformed)[SOURCE_COLUMNS]
+            
+            with ParallelTransformer(self.transform_player_data, metrics=self.metrics) as transformer:
+                for player_name, raw_data in self.iter_extracted(self.players, seasons):
+                    logger.info(f"Processing {player_name}...")
+                    
+                    if player_name in loaded and self._response_unchanged(
+                        self.players[player_name], seasons.get(player_name)
+                    ):
+                        logger.info(f"No changes for {player_name}, skipping transform and load")
+                        game_counts[player_name] = loaded[player_name]['games']
+                        continue
+                    
+                    first_game = 1
+                    if player_name in state:
+                        if raw_data.empty:
+                            logger.info(f"No new games for {player_name}")
+                            game_counts[player_name] = state[player_name]['games']
+                            continue
+                        first_game = self._first_game_number(raw_data, player_name)
+                    elif raw_data.empty:
+                        # Rostered but yet to play (or absent from the league logs)
+                        logger.info(f"No games for {player_name}, skipping transform and load")
+                        game_counts[player_name] = 0
+                        continue
+                    
+                    transformer.submit(raw_data, player_name, first_game)
+                    for finished in transformer.completed():
+                        load(*finished)
                 
-                all_players_data.append(transformed_data)
+                for finished in transformer.completed(wait_all=True):
+                    load(*finished)
             
-            # Create combined table with equal games for each player
-            logger.info("Creating combined player comparison table...")
-            min_games = min(len(df) for df in all_players_data)
+            game_counts = {name: game_counts[name] for name in self.players if name in game_counts}
+            
+            # Swap in every table from this run at once
+            published = set(inspect(self.engine).get_table_names())
+            generation = None
+            if full_loads or deltas or not {COMBINED_TABLE, ROLLING_TABLE} <= published:
+                with self.metrics.stage('publish') as stage:
+                    generation = retry_with_backoff(
+                        lambda: self.publish(full_loads, deltas, game_counts),
+                        max_retries=config.SWAP_RETRIES,
+                        base_delay=config.API_BACKOFF_BASE,
+                        max_delay=config.API_BACKOFF_MAX,
+                        on_retry=lambda attempt, error: setattr(stage, 'retries', attempt),
+                        retry_on=is_transient_db_error
+                    )
+            else:
+                logger.info("No player data changed, keeping published tables")
+            
+            if isinstance(self.source, CachedGameLogSource):
+                for player_name, player_id in self.players.items():
+                    self.source.mark_loaded(player_id, seasons.get(player_name))
             
-            balanced_data = [df.tail(min_games) for df in all_players_data]
-            combined_df = pd.concat(balanced_data, axis=0)
-            combined_df = combined_df.sort_values(by='GAME_DATE', ascending=False)
+            if config.SNAPSHOTS_ENABLED:
+                self.write_snapshots()
             
-            # Load combined table
-            self.load_to_database(combined_df, 'nba_5')
+            # Announce the load once its tables and snapshot are readable
+            if generation is not None and targets:
+                emit_change_event(change_event(generation, self.changes), self.engine, targets)
             
             logger.info("ETL Pipeline completed successfully!")
+            self.metrics.finish('success')
             
         except Exception as e:
             logger.error(f"ETL Pipeline failed: {e}")
+            self.metrics.finish('failed')
             raise
         finally:
+            if config.METRICS_ENABLED:
+                self.metrics.write(config.METRICS_DIR)
+            # The engine is shared with other users in this process, so its
+            # pool stays open; main() closes it on exit
             if self.engine:
-                self.engine.dispose()
-                logger.info("Database connection closed")
+                logger.debug(f"Connection pool after run: {pool_status()}")
+
+
+def configure_logging(level: int = logging.INFO):
+    """
+    Send log records to stdout, for command-line runs.
+    
+    Called by the entry points rather than at import, so importing the
+    pipeline leaves the application's logging setup alone.
+    
+    Args:
+        level: Root logger level
+    """
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
 
 
 def main():
     """Main entry point."""
+    configure_logging()
     etl = NBAStatsETL()
-    etl.run()
+    try:
+        etl.run()
+    finally:
+        dispose_engines()
+        logger.info("Database connection closed")
 
 
 if __name__ == '__main__':
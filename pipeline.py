@@ -0,0 +1,221 @@
+"""Process-pool transform stage with shared-memory Arrow hand-off."""
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from config import config
+from extraction import GameLogSource
+from metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+# Per-process ETL instance used by transform workers
+_worker_etl = None
+
+
+def _write_stream(memory: memoryview, table: pa.Table):
+    """Write a table as an Arrow IPC stream into a writable buffer."""
+    sink = pa.FixedSizeBufferWriter(pa.py_buffer(memory))
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    sink.close()
+
+
+def _read_stream(memory: memoryview, size: int) -> pd.DataFrame:
+    """Read an Arrow IPC stream in place and copy it out to pandas."""
+    table = pa.ipc.open_stream(pa.py_buffer(memory)[:size]).read_all()
+    # to_pandas may return views of the stream, which would pin the block
+    return table.to_pandas().copy(deep=True)
+
+
+def frame_to_shared_memory(df: pd.DataFrame) -> Tuple[str, int]:
+    """
+    Write a DataFrame into a new shared memory block as an Arrow IPC stream.
+
+    The stream is sized first and then written straight into the block, so
+    the columns are copied once.
+
+    Args:
+        df: DataFrame to share
+
+    Returns:
+        Shared memory block name and stream size in bytes
+    """
+    table = pa.Table.from_pandas(df)
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    size = sink.size()
+
+    shm = SharedMemory(create=True, size=size)
+    try:
+        _write_stream(shm.buf, table)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return shm.name, size
+
+
+def frame_from_shared_memory(name: str, size: int) -> pd.DataFrame:
+    """
+    Read a DataFrame written by ``frame_to_shared_memory`` and free the block.
+
+    Arrow reads the record batches in place; only the conversion to pandas
+    copies them out before the block is unlinked.
+
+    Args:
+        name: Shared memory block name
+        size: Stream size in bytes
+
+    Returns:
+        DataFrame with dtypes (including categoricals) preserved
+    """
+    shm = SharedMemory(name=name)
+    try:
+        return _read_stream(shm.buf, size)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _discard(name: str):
+    """Free a shared memory block that will not be read."""
+    shm = SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
+
+
+class _TransformOnlySource(GameLogSource):
+    """Game log source for transform workers, which never extract."""
+
+    throttled = False
+
+    def fetch(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
+        raise RuntimeError("Transform workers do not fetch game logs")
+
+
+def _init_worker():
+    """Create the transform worker's ETL instance once per process."""
+    global _worker_etl
+    from nba_stats_etl import NBAStatsETL
+
+    _worker_etl = NBAStatsETL(source=_TransformOnlySource(), players={})
+
+
+def _transform_shared(name: str, size: int, player_name: str,
+                      first_game: int) -> Tuple[str, int, List[dict]]:
+    """
+    Transform a raw game log handed over in shared memory (runs in a worker).
+
+    Returns:
+        Shared memory block name and size of the transformed table, and the
+        worker's stage metrics for it
+    """
+    raw = frame_from_shared_memory(name, size)
+    transformed = _worker_etl.transform_player_data(raw, player_name, first_game=first_game)
+    return (*frame_to_shared_memory(transformed), _worker_etl.metrics.drain())
+
+
+class ParallelTransformer:
+    """
+    Bounded pool of transform workers.
+
+    Raw game logs go to worker processes and transformed tables come back
+    through shared memory. At most ``max_pending`` players are in flight, so
+    ``submit`` blocks the extract stage when transforms fall behind. With
+    one worker or fewer, transforms run inline in the calling process.
+    """
+
+    def __init__(self, transform, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, metrics: Optional[RunMetrics] = None):
+        """
+        Initialize the transformer.
+
+        Args:
+            transform: In-process fallback, ``transform(raw, player_name, first_game)``
+            workers: Worker processes (defaults to ``config.TRANSFORM_WORKERS``)
+            max_pending: Players in flight before ``submit`` blocks
+                (defaults to ``config.PIPELINE_QUEUE_SIZE``)
+            metrics: Run metrics that receive the workers' transform stages
+        """
+        self.transform = transform
+        self.workers = config.TRANSFORM_WORKERS if workers is None else workers
+        self.max_pending = max_pending or config.PIPELINE_QUEUE_SIZE
+        self.metrics = metrics
+        self._pool = None
+        self._pending: Dict[Future, Tuple[str, str]] = {}
+        self._done = []
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._pool is not None:
+            # Free the hand-off blocks of work that is abandoned on error
+            for future, (_, raw_block) in self._pending.items():
+                if future.cancel():
+                    _discard(raw_block)
+            self._pool.shutdown(wait=True)
+            for future in self._pending:
+                if not future.cancelled() and future.exception() is None:
+                    _discard(future.result()[0])
+
+    def submit(self, raw: pd.DataFrame, player_name: str, first_game: int = 1):
+        """
+        Queue a raw game log for transformation.
+
+        Args:
+            raw: Raw game log
+            player_name: Name identifier for the player
+            first_game: Career game number of the earliest game in ``raw``
+        """
+        if self._pool is None:
+            self._done.append((player_name, self.transform(raw, player_name, first_game)))
+            return
+
+        while len(self._pending) >= self.max_pending:
+            self._collect(block=True)
+        name, size = frame_to_shared_memory(raw)
+        try:
+            future = self._pool.submit(_transform_shared, name, size, player_name, first_game)
+        except BaseException:
+            _discard(name)
+            raise
+        self._pending[future] = (player_name, name)
+
+    def _collect(self, block: bool):
+        """Move finished transforms from the pool to the done list."""
+        if not self._pending:
+            return
+        done, _ = wait(self._pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            player_name, _ = self._pending.pop(future)
+            name, size, records = future.result()
+            if self.metrics is not None:
+                self.metrics.extend(records)
+            self._done.append((player_name, frame_from_shared_memory(name, size)))
+
+    def completed(self, wait_all: bool = False) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Yield transformed players as they finish.
+
+        Args:
+            wait_all: Block until every submitted player is transformed
+
+        Yields:
+            Player name and transformed DataFrame
+        """
+        self._collect(block=False)
+        while self._done or (wait_all and self._pending):
+            while self._done:
+                yield self._done.pop(0)
+            if wait_all:
+                self._collect(block=True)
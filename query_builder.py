@@ -0,0 +1,344 @@
+"""
+Validated, parameterized analyzer queries built with SQLAlchemy Core.
+
+Stat names are checked against the loaded game columns and become part of a
+statement's structure; counts such as ``limit`` are bound parameters. Each
+distinct structure is built once and reused, so SQLAlchemy's compiled cache
+and the driver's prepared statement cache (asyncpg) see one statement per
+stat choice instead of one per call.
+"""
+import calendar
+import functools
+import numbers
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import (
+    CompoundSelect, Integer, Select, and_, bindparam, case, column, func, literal, literal_column,
+    select, text, union_all
+)
+from sqlalchemy import table as table_clause
+
+from rolling import rolling_table
+from schema import (
+    COMBINED_TABLE, GAME_COLUMN_NAMES, STAT_COLUMN_NAMES, games_table, players_table
+)
+from summaries import SUMMARY_QUERIES
+
+# Columns returned by ``top_performances_query``
+TOP_PERFORMANCE_COLUMNS = [
+    'player_id', 'game_date', 'matchup', 'pts', 'reb', 'ast', 'stl', 'blk', 'fg_pct', 'fg3_pct'
+]
+
+# Stats compared when none are given
+DEFAULT_COMPARE_STATS = ('pts', 'reb', 'ast')
+
+# Distinct stat lists kept as built ``compare_players_query`` statements
+STATEMENT_CACHE_SIZE = 256
+
+# Row order of each summary report
+SUMMARY_ORDER = {
+    'summary_career_averages': [column('avg_points').desc()],
+    'summary_home_away': [column('player_id'), column('location')],
+    'summary_conference': [column('player_id'), column('conference')],
+    'summary_day_of_week': [
+        column('player_id'),
+        case(
+            *[(column('day_of_week') == literal_column(f"'{day}'"), literal_column(str(i)))
+              for i, day in enumerate(calendar.day_name, start=1)]
+        ),
+    ],
+    'summary_triple_doubles': [column('game_date').desc(), column('player_id')],
+}
+
+
+def validate_stat(stat: str) -> str:
+    """
+    Check that a stat names a box score column.
+
+    Args:
+        stat: Stat column name (e.g., 'pts')
+
+    Returns:
+        The stat name
+
+    Raises:
+        ValueError: If the stat is not a known column
+    """
+    if stat not in STAT_COLUMN_NAMES:
+        raise ValueError(f"Unknown stat '{stat}', expected one of {STAT_COLUMN_NAMES}")
+    return stat
+
+
+def validate_stats(stats: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """
+    Check a list of stats, dropping repeats.
+
+    Args:
+        stats: Stat column names (``DEFAULT_COMPARE_STATS`` when None)
+
+    Returns:
+        Tuple of distinct stat names in their original order
+
+    Raises:
+        ValueError: If the list is empty or a stat is not a known column
+    """
+    if stats is None:
+        return DEFAULT_COMPARE_STATS
+    if isinstance(stats, str):
+        stats = [stats]
+    stats = tuple(dict.fromkeys(validate_stat(stat) for stat in stats))
+    if not stats:
+        raise ValueError("At least one stat is required")
+    return stats
+
+
+def validate_players(player_names: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Check a list of player names, dropping repeats.
+
+    Args:
+        player_names: Player (table) names
+
+    Returns:
+        Tuple of distinct player names in their original order
+
+    Raises:
+        ValueError: If the list is empty or a name is not a string
+    """
+    if isinstance(player_names, str):
+        player_names = [player_names]
+    names = tuple(dict.fromkeys(player_names))
+    if not names:
+        raise ValueError("At least one player is required")
+    for name in names:
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"Invalid player name {name!r}")
+    return names
+
+
+def validate_count(value: int, name: str) -> int:
+    """
+    Check that a row or game count is a positive integer.
+
+    Args:
+        value: Count to check
+        name: Argument name used in the error message
+
+    Returns:
+        The count as an int
+
+    Raises:
+        ValueError: If the value is not a positive integer
+    """
+    if isinstance(value, bool) or not isinstance(value, numbers.Integral) or value < 1:
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    return int(value)
+
+
+def _games(name: str = COMBINED_TABLE):
+    """Lightweight table clause over a game table's columns."""
+    return table_clause(name, *[column(c) for c in GAME_COLUMN_NAMES])
+
+
+@functools.lru_cache(maxsize=None)
+def top_performances_query(stat: str) -> Select:
+    """
+    Statement for the best single games by a stat.
+
+    Args:
+        stat: Validated stat to rank by
+
+    Returns:
+        SELECT with a bound ``limit`` parameter
+    """
+    games = _games()
+    return (
+        select(*[games.c[c] for c in TOP_PERFORMANCE_COLUMNS])
+        .order_by(games.c[stat].desc())
+        .limit(bindparam('limit', type_=Integer))
+    )
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def top_performances_batch_query(stats: Tuple[str, ...]) -> CompoundSelect:
+    """
+    Statement for the best single games by each of several stats.
+
+    Each stat's top games come from its own ``ORDER BY ... LIMIT`` branch (so
+    the ranked stat indexes on ``nba_5`` still apply), combined with UNION
+    ALL into one round trip. A ``stat`` column tells the branches apart.
+
+    Args:
+        stats: Validated, distinct stats to rank by
+
+    Returns:
+        UNION ALL statement with a bound ``limit`` parameter
+    """
+    games = _games()
+    limit = bindparam('limit', type_=Integer)
+    branches = [
+        select(literal(stat).label('stat'), *[games.c[c] for c in TOP_PERFORMANCE_COLUMNS])
+        .order_by(games.c[stat].desc())
+        .limit(limit)
+        .subquery(f"top_{stat}")
+        for stat in stats
+    ]
+    return union_all(*[select(branch) for branch in branches])
+
+
+@functools.lru_cache(maxsize=None)
+def players_data_query() -> Select:
+    """
+    Statement reading any number of players' games from the games table.
+
+    Returns:
+        SELECT of ``GAME_COLUMN_NAMES`` (``player_id`` is the player name)
+        with an expanding ``player_names`` parameter, ordered by player and
+        game number
+    """
+    games, players = games_table(partitions=0), players_table()
+    columns = [
+        players.c.player_name.label('player_id') if name == 'player_id' else games.c[name]
+        for name in GAME_COLUMN_NAMES
+    ]
+    return (
+        select(*columns)
+        .select_from(games.join(players, games.c.player_key == players.c.player_key))
+        .where(players.c.player_name.in_(bindparam('player_names', expanding=True)))
+        .order_by(players.c.player_name, games.c.g)
+    )
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def compare_players_query(stats: Tuple[str, ...]) -> Select:
+    """
+    Statement averaging any number of stats per player in one scan.
+
+    Args:
+        stats: Validated, distinct stats; results are ordered by the first
+
+    Returns:
+        SELECT of ``player_id``, ``games`` and ``avg_<stat>`` per stat
+    """
+    games = _games()
+    averages = [func.round(func.avg(games.c[s]), 2).label(f"avg_{s}") for s in stats]
+    return (
+        select(games.c.player_id, func.count().label('games'), *averages)
+        .group_by(games.c.player_id)
+        .order_by(averages[0].desc())
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def recent_form_query() -> Select:
+    """
+    Statement for averages and wins over each player's most recent games.
+
+    Column names do not depend on the number of games, so one statement
+    serves every window; callers rename the columns if needed.
+
+    Returns:
+        SELECT with a bound ``games`` parameter
+    """
+    games = _games()
+    recent = select(
+        games.c.player_id, games.c.pts, games.c.reb, games.c.ast, games.c.wl,
+        func.row_number().over(
+            partition_by=games.c.player_id, order_by=games.c.game_date.desc()
+        ).label('game_rank')
+    ).cte('recent_games')
+
+    avg_points = func.round(func.avg(recent.c.pts), 2).label('avg_points')
+    return (
+        select(
+            recent.c.player_id,
+            avg_points,
+            func.round(func.avg(recent.c.reb), 2).label('avg_rebounds'),
+            func.round(func.avg(recent.c.ast), 2).label('avg_assists'),
+            func.sum(case((recent.c.wl == 'W', 1), else_=0)).label('wins'),
+        )
+        .where(recent.c.game_rank <= bindparam('games', type_=Integer))
+        .group_by(recent.c.player_id)
+        .order_by(avg_points.desc())
+    )
+
+
+def recent_form_columns(games: int) -> dict:
+    """Rename ``recent_form_query`` columns to the ``*_last_<games>`` report names."""
+    return {
+        'avg_points': f"avg_points_last_{games}",
+        'avg_rebounds': f"avg_rebounds_last_{games}",
+        'avg_assists': f"avg_assists_last_{games}",
+        'wins': f"wins_last_{games}",
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def summary_query(table_name: str) -> Select:
+    """
+    Statement reading a summary report from its materialized table.
+
+    Args:
+        table_name: Summary table (a key of ``SUMMARY_QUERIES``)
+
+    Returns:
+        SELECT of every column, in report order
+    """
+    return (
+        select(literal_column('*'))
+        .select_from(table_clause(table_name))
+        .order_by(*SUMMARY_ORDER[table_name])
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def summary_rollup_query(table_name: str) -> Select:
+    """
+    Statement aggregating a summary report from ``nba_5`` (for a stale summary table).
+
+    Args:
+        table_name: Summary table (a key of ``SUMMARY_QUERIES``)
+
+    Returns:
+        SELECT of the rollup's columns, in report order
+    """
+    rollup = text(SUMMARY_QUERIES[table_name].format(source=COMBINED_TABLE)).columns().subquery('q')
+    return select(literal_column('*')).select_from(rollup).order_by(*SUMMARY_ORDER[table_name])
+
+
+@functools.lru_cache(maxsize=None)
+def rolling_stats_query() -> Select:
+    """
+    Statement for one player's rolling stats.
+
+    Returns:
+        SELECT with a bound ``player_name`` parameter, oldest game first
+    """
+    rolling = rolling_table()
+    return (
+        select(rolling)
+        .where(rolling.c.player_id == bindparam('player_name'))
+        .order_by(rolling.c.game_date)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def current_form_query() -> Select:
+    """
+    Statement for each player's rolling stats as of their latest game.
+
+    Returns:
+        SELECT ordered by 10-game scoring average
+    """
+    rolling = rolling_table()
+    latest = (
+        select(rolling.c.player_id, func.max(rolling.c.game_date).label('game_date'))
+        .group_by(rolling.c.player_id)
+        .subquery('latest')
+    )
+    return (
+        select(rolling)
+        .join(latest, and_(rolling.c.player_id == latest.c.player_id,
+                           rolling.c.game_date == latest.c.game_date))
+        .order_by(rolling.c.pts_avg_10.desc(), rolling.c.player_id)
+    )
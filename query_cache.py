@@ -0,0 +1,202 @@
+"""In-memory result cache for analyzer queries."""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional, Set
+
+from config import config
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert lists, sets and dicts into hashable equivalents for cache keys."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class QueryCache:
+    """
+    Size-bounded LRU cache invalidated by the ETL load generation.
+
+    The generation stamp written by ``NBAStatsETL`` is re-read at most once
+    per ``check_interval`` seconds; when it changes, every entry is dropped,
+    except that entries tagged with the players they depend on survive when
+    ``changes_fn`` reports that none of those players changed.
+    Between checks, hits are served from memory without touching the database.
+    """
+
+    def __init__(self, generation_fn: Callable[[], Any],
+                 max_entries: Optional[int] = None,
+                 check_interval: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 changes_fn: Optional[Callable[[Any, Any], Optional[Set[str]]]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            generation_fn: Returns the current load generation
+            max_entries: Maximum cached results before LRU eviction
+            check_interval: Seconds between load generation checks
+            clock: Monotonic clock, injectable for testing
+            changes_fn: Returns the players changed between two generations,
+                or None if unknown (every entry is then dropped)
+        """
+        self.generation_fn = generation_fn
+        self.changes_fn = changes_fn
+        self.max_entries = config.QUERY_CACHE_SIZE if max_entries is None else max_entries
+        self.check_interval = (
+            config.QUERY_CACHE_CHECK_INTERVAL if check_interval is None else check_interval
+        )
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._players = {}
+        self._generation = None
+        self._checked_at = None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.retained = 0
+
+    def _refresh_generation(self):
+        """Drop the entries affected by a new load generation."""
+        now = self._clock()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        generation = self.generation_fn()
+        self._checked_at = now
+        if generation != self._generation:
+            changed = None
+            if self.changes_fn is not None and self._entries:
+                changed = self.changes_fn(self._generation, generation)
+            self._drop_changed(changed)
+            self._generation = generation
+
+    def _drop_changed(self, changed: Optional[Set[str]]):
+        """Drop every entry except those tagged only with players not in ``changed``."""
+        if changed is None:
+            self._entries.clear()
+            self._players.clear()
+            return
+        for key in list(self._entries):
+            players = self._players.get(key)
+            if players is None or not players.isdisjoint(changed):
+                del self._entries[key]
+                self._players.pop(key, None)
+        self.retained += len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       players: Optional[Iterable[str]] = None) -> Any:
+        """
+        Get a cached result, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the result
+            players: Players the result depends on; it is kept across load
+                generations that change none of them (None means it depends
+                on every player)
+
+        Returns:
+            Cached or freshly computed result
+        """
+        with self._lock:
+            self._refresh_generation()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            if generation == self._generation and self.max_entries > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                if players is not None:
+                    self._players[key] = frozenset(players)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._players.pop(evicted, None)
+        return value
+
+    def invalidate(self):
+        """Drop every entry and force a generation check on the next call."""
+        with self._lock:
+            self._entries.clear()
+            self._players.clear()
+            self._checked_at = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy a query result, including each DataFrame of a batch (dict) result."""
+    if isinstance(result, dict):
+        return {key: _copy_result(value) for key, value in result.items()}
+    return result.copy() if hasattr(result, 'copy') else result
+
+
+def cached_query(method: Optional[Callable] = None, *, players: Optional[str] = None) -> Callable:
+    """
+    Memoize an analyzer method in the instance's ``query_cache``.
+
+    Results are keyed on the method name and its arguments bound to the
+    method's signature, defaults included, so positional, keyword and
+    defaulted calls share an entry. Callers receive a copy, so mutating a
+    returned DataFrame never corrupts the cache. Call latency, cache hits included, is recorded in the instance's
+    ``query_metrics`` when it has one.
+
+    Used bare (``@cached_query``) a result depends on every player. Methods
+    that only read some players name the argument holding them
+    (``@cached_query(players='player_name')``, a name or an iterable of
+    names), so their results survive loads that change other players.
+    """
+    if method is None:
+        return functools.partial(cached_query, players=players)
+    signature = inspect.signature(method)
+
+    def bind(self, args, kwargs) -> inspect.BoundArguments:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        return bound
+
+    def tagged_players(bound: inspect.BoundArguments) -> Optional[Iterable[str]]:
+        if players is None:
+            return None
+        value = bound.arguments[players]
+        if isinstance(value, str):
+            return [value]
+        # Iterators are left untagged rather than consumed before the call
+        return value if isinstance(value, (list, tuple, set, frozenset)) else None
+
+    def call(self, *args, **kwargs):
+        cache = getattr(self, 'query_cache', None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+        # Key on the bound arguments so f(x, 5), f(x, limit=5) and f(x) with
+        # a default of 5 share one entry
+        bound = bind(self, args, kwargs)
+        arguments = list(bound.arguments.items())[1:]
+        key = (method.__name__, tuple((name, _freeze(value)) for name, value in arguments))
+        result = cache.get_or_compute(
+            key, lambda: method(self, *args, **kwargs), tagged_players(bound)
+        )
+        return _copy_result(result)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = getattr(self, 'query_metrics', None)
+        if metrics is None:
+            return call(self, *args, **kwargs)
+        with metrics.timed(method.__name__):
+            return call(self, *args, **kwargs)
+    return wrapper
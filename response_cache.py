@@ -0,0 +1,199 @@
+"""On-disk cache of raw NBA API responses."""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+from config import config
+from extraction import GameLogSource, TokenBucket, current_season
+
+logger = logging.getLogger(__name__)
+
+ALL_SEASONS = 'ALL'
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """
+    Hash the contents of a DataFrame, including column names.
+
+    Args:
+        df: DataFrame to hash
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256(','.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def is_completed_season(season: Optional[str], today=None) -> bool:
+    """Check whether a season has finished, so its data can no longer change."""
+    return season not in (None, ALL_SEASONS) and season < current_season(today)
+
+
+class RawResponseCache:
+    """
+    Persistent cache of raw API responses stored as Parquet files.
+
+    Entries are keyed by endpoint, player and season. Completed seasons never
+    expire; the current season and whole-career responses expire after a TTL.
+    Each entry records the content hash of the response and the hash that was
+    last loaded to the database, so unchanged responses can skip the
+    transform and load stages.
+    """
+
+    def __init__(self, root: Optional[Path] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory (defaults to ``config.RAW_CACHE_DIR``)
+            ttl: Seconds before current-season entries expire
+            clock: Wall clock, injectable for testing
+        """
+        self.root = Path(root or config.RAW_CACHE_DIR)
+        self.ttl = config.RAW_CACHE_TTL if ttl is None else ttl
+        self._clock = clock
+
+    def _paths(self, endpoint: str, player_id: int, season: Optional[str]):
+        """Get the data and metadata paths for a cache entry."""
+        stem = self.root / endpoint / f"{player_id}_{season or ALL_SEASONS}"
+        return stem.with_suffix('.parquet'), stem.with_suffix('.json')
+
+    def read_meta(self, endpoint: str, player_id: int, season: Optional[str]) -> Optional[dict]:
+        """Read the metadata of a cache entry, or None if there is no entry."""
+        data_path, meta_path = self._paths(endpoint, player_id, season)
+        if not (data_path.exists() and meta_path.exists()):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def _write_meta(self, meta_path: Path, meta: dict):
+        """Atomically replace a metadata file."""
+        tmp_path = meta_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def is_fresh(self, meta: dict, season: Optional[str]) -> bool:
+        """Check whether a cache entry can be served without refetching."""
+        if is_completed_season(season):
+            return True
+        return self._clock() - meta['fetched_at'] < self.ttl
+
+    def get(self, endpoint: str, player_id: int, season: Optional[str],
+            allow_stale: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Get a cached response.
+
+        Args:
+            endpoint: API endpoint name
+            player_id: NBA API player ID
+            season: Season identifier (None for all seasons)
+            allow_stale: Return expired entries too (for offline replay)
+
+        Returns:
+            Cached DataFrame, or None on a miss
+        """
+        meta = self.read_meta(endpoint, player_id, season)
+        if meta is None or not (allow_stale or self.is_fresh(meta, season)):
+            return None
+        data_path, _ = self._paths(endpoint, player_id, season)
+        return pd.read_parquet(data_path)
+
+    def put(self, endpoint: str, player_id: int, season: Optional[str],
+            df: pd.DataFrame) -> str:
+        """
+        Store a response.
+
+        Args:
+            endpoint: API endpoint name
+            player_id: NBA API player ID
+            season: Season identifier (None for all seasons)
+            df: Raw response DataFrame
+
+        Returns:
+            Content hash of the response
+        """
+        data_path, meta_path = self._paths(endpoint, player_id, season)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        meta = self.read_meta(endpoint, player_id, season) or {}
+        digest = content_hash(df)
+        if meta.get('content_hash') != digest or not data_path.exists():
+            tmp_path = data_path.with_suffix('.parquet.tmp')
+            df.to_parquet(tmp_path, index=False, compression='zstd')
+            os.replace(tmp_path, data_path)
+
+        meta.update(content_hash=digest, fetched_at=self._clock())
+        self._write_meta(meta_path, meta)
+        return digest
+
+    def mark_loaded(self, endpoint: str, player_id: int, season: Optional[str]):
+        """Record that the cached response has been loaded to the database."""
+        meta = self.read_meta(endpoint, player_id, season)
+        if meta is not None:
+            meta['loaded_hash'] = meta['content_hash']
+            self._write_meta(self._paths(endpoint, player_id, season)[1], meta)
+
+    def is_unchanged(self, endpoint: str, player_id: int, season: Optional[str]) -> bool:
+        """Check whether the cached response matches what was last loaded."""
+        meta = self.read_meta(endpoint, player_id, season)
+        return meta is not None and meta.get('loaded_hash') == meta['content_hash']
+
+
+class CachedGameLogSource(GameLogSource):
+    """Game log source that serves responses from a ``RawResponseCache``."""
+
+    ENDPOINT = 'playergamelog'
+
+    # Cache hits make no request; only upstream misses are rate limited
+    throttled = False
+
+    def __init__(self, source: Optional[GameLogSource], cache: RawResponseCache,
+                 offline: bool = False, rate_limiter: Optional[TokenBucket] = None):
+        """
+        Initialize the source.
+
+        Args:
+            source: Upstream source for cache misses (unused when offline)
+            cache: Response cache
+            offline: Replay from the cache only, serving expired entries too
+            rate_limiter: Rate limiter taken for every throttled upstream request
+        """
+        self.source = source
+        self.cache = cache
+        self.offline = offline
+        self.rate_limiter = rate_limiter
+
+    def fetch(self, player_id: int, season: Optional[str] = None) -> pd.DataFrame:
+        """Fetch a player's game log, preferring the cache."""
+        cached = self.cache.get(self.ENDPOINT, player_id, season, allow_stale=self.offline)
+        if cached is not None:
+            logger.debug(f"Cache hit for player {player_id} ({season or ALL_SEASONS})")
+            return cached
+        if self.offline or self.source is None:
+            raise LookupError(
+                f"No cached game log for player {player_id} ({season or ALL_SEASONS})"
+            )
+
+        if self.rate_limiter is not None and self.source.throttled:
+            self.rate_limiter.acquire()
+        df = self.source.fetch(player_id, season)
+        self.cache.put(self.ENDPOINT, player_id, season, df)
+        return df
+
+    def is_unchanged(self, player_id: int, season: Optional[str] = None) -> bool:
+        """Check whether a player's response matches what was last loaded."""
+        return self.cache.is_unchanged(self.ENDPOINT, player_id, season)
+
+    def mark_loaded(self, player_id: int, season: Optional[str] = None):
+        """Record that a player's current response has been loaded."""
+        self.cache.mark_loaded(self.ENDPOINT, player_id, season)
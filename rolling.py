@@ -0,0 +1,214 @@
+"""Rolling averages, exponentially weighted form and streaks per game."""
+import logging
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Column, DateTime, Float, Index, Integer, MetaData, PrimaryKeyConstraint, SmallInteger,
+    String, Table, inspect, select
+)
+
+from config import config
+from loaders import bulk_load
+from schema import player_games
+
+logger = logging.getLogger(__name__)
+
+ROLLING_TABLE = 'rolling_stats'
+ROLLING_WINDOWS = [5, 10, 20]
+ROLLING_STATS = ['pts', 'reb', 'ast']
+STREAK_COLUMNS = ['win_streak', 'longest_win_streak', 'scoring_streak', 'longest_scoring_streak']
+
+# Game columns the rolling stats are computed from
+SOURCE_COLUMNS = ['player_id', 'game_date', 'g', 'wl'] + ROLLING_STATS
+
+ROLLING_COLUMNS = (
+    ['player_id', 'game_date', 'g']
+    + [f"{stat}_avg_{window}" for stat in ROLLING_STATS for window in ROLLING_WINDOWS]
+    + [f"{stat}_ewm" for stat in ROLLING_STATS]
+    + STREAK_COLUMNS
+)
+
+
+def rolling_table(metadata: MetaData = None) -> Table:
+    """Define the per-game rolling stats side table."""
+    table = Table(
+        ROLLING_TABLE,
+        metadata or MetaData(),
+        Column('player_id', String(64), nullable=False),
+        Column('game_date', DateTime, nullable=False),
+        Column('g', Integer, nullable=False),
+        *[Column(name, Float) for name in ROLLING_COLUMNS[3:-len(STREAK_COLUMNS)]],
+        *[Column(name, SmallInteger, nullable=False) for name in STREAK_COLUMNS],
+        PrimaryKeyConstraint('player_id', 'game_date', name=f"pk_{ROLLING_TABLE}")
+    )
+    Index(f"ix_{ROLLING_TABLE}_player_date", table.c.player_id, table.c.game_date.desc())
+    return table
+
+
+def _rolling_means(values: np.ndarray, prior: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing means over up to ``window`` games, skipping missing values.
+
+    Args:
+        values: Stat values of the games to compute
+        prior: Values of the games immediately before ``values`` (at least
+            ``window - 1`` of them unless the career starts there)
+        window: Window length in games
+
+    Returns:
+        Mean for each entry of ``values``
+    """
+    combined = np.concatenate([prior, values]).astype(float)
+    present = ~np.isnan(combined)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(present, combined, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(present)])
+
+    end = np.arange(len(prior), len(combined)) + 1
+    start = np.maximum(end - window, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums[end] - sums[start]) / (counts[end] - counts[start])
+
+
+def _streaks(flags: np.ndarray, streak: int = 0, longest: int = 0):
+    """
+    Current and longest run of consecutive True flags at each game.
+
+    Args:
+        flags: Boolean per game
+        streak: Run length carried in from the previous game
+        longest: Longest run carried in from the previous game
+
+    Returns:
+        Tuple of current and longest run arrays
+    """
+    hits = np.cumsum(flags)
+    current = hits - np.maximum.accumulate(np.where(flags, 0, hits))
+    current[np.cumsum(~flags) == 0] += streak
+    return current, np.maximum(np.maximum.accumulate(current), longest)
+
+
+def compute_rolling(games: pd.DataFrame, prior: Optional[pd.DataFrame] = None,
+                    state: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Compute rolling stats for a run of consecutive games of one player.
+
+    Only ``games`` are computed; ``prior`` and ``state`` carry in what is
+    needed from earlier games, so new games are appended without
+    recomputing the history.
+
+    Args:
+        games: Games in chronological order with ``SOURCE_COLUMNS``
+        prior: The ``max(ROLLING_WINDOWS) - 1`` games before ``games``
+        state: Rolling stats row of the game before ``games``
+
+    Returns:
+        DataFrame with ``ROLLING_COLUMNS``, one row per game
+    """
+    prior = prior if prior is not None else games.iloc[:0]
+    result = games[['player_id', 'game_date', 'g']].reset_index(drop=True)
+    alpha = 2 / (config.ROLLING_EWM_SPAN + 1)
+
+    for stat in ROLLING_STATS:
+        values = games[stat].to_numpy(dtype=float)
+        for window in ROLLING_WINDOWS:
+            means = _rolling_means(values, prior[stat].to_numpy(dtype=float), window)
+            result[f"{stat}_avg_{window}"] = np.round(means, 2)
+
+        # Seeding with the previous (unrounded) value continues the recursion exactly
+        seed = [] if state is None else [state[f"{stat}_ewm"]]
+        ewm = pd.Series(np.concatenate([seed, values])).ewm(alpha=alpha, adjust=False).mean()
+        result[f"{stat}_ewm"] = ewm.to_numpy()[len(seed):]
+
+    state = state or {}
+    wins = (games['wl'] == 'W').to_numpy()
+    scoring = (games['pts'] >= config.SCORING_STREAK_POINTS).to_numpy()
+    for name, flags in (('win_streak', wins), ('scoring_streak', scoring)):
+        current, longest = _streaks(
+            flags, int(state.get(name, 0)), int(state.get(f"longest_{name}", 0))
+        )
+        result[name] = current.astype(np.int16)
+        result[f"longest_{name}"] = longest.astype(np.int16)
+
+    return result[ROLLING_COLUMNS]
+
+
+def write_rolling(conn, player_id: str, rows: pd.DataFrame, since=None):
+    """
+    Replace a player's rolling stats from a date onward.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        player_id: Player identifier
+        rows: Output of ``compute_rolling``
+        since: First game date replaced (all of the player's rows if None)
+    """
+    table = rolling_table()
+    table.create(conn, checkfirst=True)
+    delete = table.delete().where(table.c.player_id == player_id)
+    if since is not None:
+        delete = delete.where(table.c.game_date >= since)
+    conn.execute(delete)
+    if len(rows):
+        bulk_load(rows, ROLLING_TABLE, conn, if_exists='append')
+
+
+def update_rolling_stats(conn, player_name: str, player_key: int, since=None) -> int:
+    """
+    Recompute a player's rolling stats from the games table.
+
+    Games before ``since`` are only read for the trailing windows and the
+    carried-in EWM and streak state.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        player_name: Player name (the rolling stats' ``player_id``)
+        player_key: NBA API player ID the games are stored under
+        since: First game date to recompute (the whole career if None)
+
+    Returns:
+        Number of rolling rows written
+    """
+    player = player_games(player_name, player_key)
+    player = player.with_only_columns(*[player.selected_columns[c] for c in SOURCE_COLUMNS])
+    game_date = player.selected_columns.game_date
+    prior, state = None, None
+
+    if since is not None:
+        since = pd.Timestamp(since).to_pydatetime()
+        table = rolling_table()
+        if inspect(conn).has_table(ROLLING_TABLE):
+            last = pd.read_sql(
+                select(table).where(table.c.player_id == player_name, table.c.game_date < since)
+                .order_by(table.c.game_date.desc()).limit(1),
+                conn
+            )
+            state = last.iloc[0].to_dict() if len(last) else None
+
+        prior = pd.read_sql(
+            player.where(game_date < since)
+            .order_by(game_date.desc()).limit(max(ROLLING_WINDOWS) - 1),
+            conn
+        ).iloc[::-1]
+
+        # Without stored state for the earlier games, start from the first game
+        if state is None and len(prior):
+            since, prior = None, None
+
+    query = player.order_by(game_date)
+    if since is not None:
+        query = query.where(game_date >= since)
+    games = pd.read_sql(query, conn, parse_dates=['game_date'])
+    rows = compute_rolling(games, prior, state)
+    write_rolling(conn, player_name, rows, since)
+    logger.info(f"Computed rolling stats for {len(rows)} games of {player_name}")
+    return len(rows)
+
+
+def players_with_rolling_stats(conn) -> List[str]:
+    """List the players that have rolling stats stored."""
+    if not inspect(conn).has_table(ROLLING_TABLE):
+        return []
+    table = rolling_table()
+    return list(conn.execute(select(table.c.player_id).group_by(table.c.player_id)).scalars())
@@ -0,0 +1,108 @@
+"""Tracked player roster from the config, a roster file or the players table."""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+from sqlalchemy import inspect, select
+
+from config import config
+from database import get_engine
+from schema import PLAYERS_TABLE, players_table
+
+logger = logging.getLogger(__name__)
+
+
+def validate_roster(roster: Dict[str, int]) -> Dict[str, int]:
+    """
+    Check that a roster maps distinct player names to distinct integer IDs.
+
+    Args:
+        roster: Mapping of player name to NBA API player ID
+
+    Returns:
+        The roster with IDs as ints
+
+    Raises:
+        ValueError: If a name is empty or a name or ID is repeated
+    """
+    players = {}
+    for name, player_id in roster.items():
+        name = str(name).strip()
+        if not name:
+            raise ValueError("Roster has a player without a name")
+        if name in players:
+            raise ValueError(f"Roster lists '{name}' more than once")
+        players[name] = int(player_id)
+    if len(set(players.values())) != len(players):
+        raise ValueError("Roster lists a player ID under more than one name")
+    return players
+
+
+def read_roster_file(path: Path) -> Dict[str, int]:
+    """
+    Read a roster file.
+
+    CSV files need ``player_name`` and ``player_id`` columns; JSON files
+    hold an object mapping player name to player ID.
+
+    Args:
+        path: Roster file (``.csv`` or ``.json``)
+
+    Returns:
+        Mapping of player name to NBA API player ID
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.json':
+        roster = json.loads(path.read_text())
+    elif path.suffix.lower() == '.csv':
+        rows = pd.read_csv(path, dtype={'player_name': str})
+        roster = dict(zip(rows['player_name'], rows['player_id']))
+    else:
+        raise ValueError(f"Unsupported roster file '{path}', expected .csv or .json")
+    return validate_roster(roster)
+
+
+def read_roster_table(engine=None) -> Dict[str, int]:
+    """
+    Read the roster from the players table.
+
+    Args:
+        engine: SQLAlchemy engine (defaults to the shared engine)
+
+    Returns:
+        Mapping of player name to NBA API player ID (empty if there is no
+        players table yet)
+    """
+    engine = engine or get_engine()
+    if not inspect(engine).has_table(PLAYERS_TABLE):
+        return {}
+    table = players_table()
+    query = select(table.c.player_name, table.c.player_key).order_by(table.c.player_name)
+    with engine.connect() as conn:
+        return dict(conn.execute(query).all())
+
+
+def load_roster(source: Optional[str] = None, engine=None) -> Dict[str, int]:
+    """
+    Load the tracked players.
+
+    Args:
+        source: 'config' for ``config.PLAYER_IDS``, 'table' for the players
+            table, or the path of a roster file (defaults to
+            ``config.ROSTER_SOURCE``)
+        engine: SQLAlchemy engine for the 'table' source
+
+    Returns:
+        Mapping of player name to NBA API player ID
+    """
+    source = source or config.ROSTER_SOURCE
+    if source == 'config':
+        roster = validate_roster(config.PLAYER_IDS)
+    elif source == 'table':
+        roster = read_roster_table(engine)
+    else:
+        roster = read_roster_file(Path(source))
+    logger.info(f"Tracking {len(roster)} players from the {source} roster")
+    return roster
@@ -0,0 +1,387 @@
+"""Typed table definitions, indexes and migrations for loaded game tables."""
+import logging
+from typing import Dict, List, Optional, Union
+
+from sqlalchemy import (
+    Column, DateTime, Executable, Index, Integer, MetaData, Numeric, PrimaryKeyConstraint,
+    Select, SmallInteger, String, Table, inspect, literal, select, text
+)
+
+from config import config
+from database import dispose_engines, get_engine
+from loaders import staging_name, swap_in_staged_tables
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+SCHEMA_VERSION_TABLE = 'etl_schema_version'
+COMBINED_TABLE = 'nba_5'
+GAMES_TABLE = 'games'
+PLAYERS_TABLE = 'players'
+
+# Stats the analyzer ranks by (``ORDER BY <stat> DESC LIMIT n``)
+RANKED_STATS = ['pts', 'reb', 'ast', 'stl', 'blk']
+
+
+def _pct():
+    return Numeric(5, 2, asdecimal=False)
+
+
+def game_columns() -> List[Column]:
+    """Typed columns shared by every player table and ``nba_5``."""
+    return [
+        Column('g', Integer, nullable=False),
+        Column('player_id', String(64), nullable=False),
+        Column('game_date', DateTime, nullable=False),
+        Column('month', String(9)),
+        Column('day', SmallInteger),
+        Column('year', SmallInteger),
+        Column('day_of_week', String(9)),
+        Column('matchup', String(16)),
+        Column('location', String(4)),
+        Column('opp', String(3)),
+        Column('div', String(16)),
+        Column('conf', String(16)),
+        Column('wl', String(1)),
+        Column('min', SmallInteger),
+        Column('fgm', SmallInteger),
+        Column('fga', SmallInteger),
+        Column('fg_pct', _pct()),
+        Column('fg3m', SmallInteger),
+        Column('fg3a', SmallInteger),
+        Column('fg3_pct', _pct()),
+        Column('ftm', SmallInteger),
+        Column('fta', SmallInteger),
+        Column('ft_pct', _pct()),
+        Column('oreb', SmallInteger),
+        Column('dreb', SmallInteger),
+        Column('reb', SmallInteger),
+        Column('ast', SmallInteger),
+        Column('stl', SmallInteger),
+        Column('blk', SmallInteger),
+        Column('tov', SmallInteger),
+        Column('pf', SmallInteger),
+        Column('pts', SmallInteger),
+        Column('plus_minus', SmallInteger),
+    ]
+
+
+GAME_COLUMN_NAMES = [column.name for column in game_columns()]
+
+# Per-game box score stats (everything after the game descriptors)
+STAT_COLUMN_NAMES = GAME_COLUMN_NAMES[GAME_COLUMN_NAMES.index('min'):]
+
+
+def game_table(name: str, ranked: bool = False, metadata: MetaData = None) -> Table:
+    """
+    Define a game table with its primary key and indexes.
+
+    Constraint and index names are built from the table name. A staging
+    table's names therefore differ from its live predecessor's, and
+    ``swap_in_staged_tables`` renames them to the live names on swap.
+
+    Args:
+        name: Table name
+        ranked: Also index the ranked stat columns (for ``nba_5``)
+        metadata: MetaData to attach the table to
+
+    Returns:
+        SQLAlchemy Table
+    """
+    table = Table(
+        name,
+        metadata or MetaData(),
+        *game_columns(),
+        PrimaryKeyConstraint('player_id', 'game_date', name=f"pk_{name}")
+    )
+    Index(f"ix_{name}_player_date", table.c.player_id, table.c.game_date.desc())
+    if ranked:
+        for stat in RANKED_STATS:
+            Index(f"ix_{name}_{stat}", table.c[stat].desc())
+    return table
+
+
+def players_table(metadata: MetaData = None) -> Table:
+    """Define the players dimension (NBA API player ID to player name)."""
+    return Table(
+        PLAYERS_TABLE,
+        metadata or MetaData(),
+        Column('player_key', Integer, primary_key=True, autoincrement=False),
+        Column('player_name', String(64), nullable=False, unique=True),
+    )
+
+
+def games_table(name: str = GAMES_TABLE, metadata: MetaData = None,
+                partitions: Optional[int] = None) -> Table:
+    """
+    Define the long-format games table holding every player's games.
+
+    Rows are keyed on the integer ``player_key`` instead of the player name,
+    which lives in the players dimension. On PostgreSQL the table is hash
+    partitioned on ``player_key``, so per-player loads, upserts and reads
+    touch a single partition.
+
+    Args:
+        name: Table name (``games`` or its staging copy)
+        metadata: MetaData to attach the table to
+        partitions: Hash partitions on PostgreSQL (0 for a plain table;
+            defaults to ``config.GAMES_PARTITIONS``)
+
+    Returns:
+        SQLAlchemy Table
+    """
+    partitions = config.GAMES_PARTITIONS if partitions is None else partitions
+    columns = [c for c in game_columns() if c.name != 'player_id']
+    options = {'postgresql_partition_by': 'HASH (player_key)'} if partitions else {}
+    table = Table(
+        name,
+        metadata or MetaData(),
+        Column('player_key', Integer, nullable=False),
+        *columns,
+        PrimaryKeyConstraint('player_key', 'game_date', name=f"pk_{name}"),
+        **options
+    )
+    table.info['partitions'] = partitions
+    return table
+
+
+def create_games_tables(conn) -> Table:
+    """
+    Create the players dimension and the games table (with its partitions) if missing.
+
+    Args:
+        conn: SQLAlchemy connection
+
+    Returns:
+        The games Table
+    """
+    partitions = config.GAMES_PARTITIONS if conn.dialect.name == 'postgresql' else 0
+    games = games_table(partitions=partitions)
+    players_table().create(conn, checkfirst=True)
+    if not inspect(conn).has_table(GAMES_TABLE):
+        games.create(conn)
+        for remainder in range(partitions):
+            conn.exec_driver_sql(
+                f"CREATE TABLE {GAMES_TABLE}_p{remainder} PARTITION OF {GAMES_TABLE} "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+    return games
+
+
+def write_players(conn, players: Dict[str, int]):
+    """
+    Add or rename players in the players dimension.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        players: Mapping of player name to NBA API player ID
+    """
+    table = players_table()
+    stored = dict(conn.execute(select(table.c.player_name, table.c.player_key)).all())
+    changed = {name: key for name, key in players.items() if stored.get(name) != key}
+    if not changed:
+        return
+    conn.execute(table.delete().where(
+        table.c.player_name.in_(list(changed)) | table.c.player_key.in_(list(changed.values()))
+    ))
+    conn.execute(table.insert(), [
+        {'player_key': key, 'player_name': name} for name, key in changed.items()
+    ])
+
+
+def player_games(player_name: str, player_key: int, table: str = GAMES_TABLE) -> Select:
+    """
+    Select one player's games with the columns of a per-player game table.
+
+    Args:
+        player_name: Player name, returned as the ``player_id`` column
+        player_key: NBA API player ID
+        table: Games table to read (``games`` or its staging copy)
+
+    Returns:
+        SELECT of ``GAME_COLUMN_NAMES`` for the player
+    """
+    games = games_table(table, partitions=0)
+    columns = [
+        literal(player_name, String(64)).label('player_id') if name == 'player_id' else games.c[name]
+        for name in GAME_COLUMN_NAMES
+    ]
+    return select(*columns).where(games.c.player_key == player_key)
+
+
+def create_player_views(conn, players: Dict[str, int]) -> int:
+    """
+    Create per-player compatibility views over the games table.
+
+    Each view has the name and columns of the per-player table it replaces,
+    so SQL written against ``lebron_james`` and friends keeps working.
+    Existing views are left alone; a player's view is only created when
+    no table or view of that name exists.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        players: Mapping of player name to NBA API player ID
+
+    Returns:
+        Number of views created
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    inspector = inspect(conn)
+    existing = set(inspector.get_table_names()) | set(inspector.get_view_names())
+    created = 0
+    for name, key in players.items():
+        if name in existing:
+            continue
+        query = player_games(name, key).compile(conn, compile_kwargs={'literal_binds': True})
+        conn.exec_driver_sql(f"CREATE VIEW {quote(name)} AS {query}")
+        created += 1
+    if created:
+        logger.info(f"Created {created} player compatibility views")
+    return created
+
+
+def create_game_table(conn, name: str, ranked: bool = False) -> Table:
+    """
+    Drop and recreate a typed game table.
+
+    Args:
+        conn: SQLAlchemy connection
+        name: Table name
+        ranked: Also index the ranked stat columns
+
+    Returns:
+        The created Table
+    """
+    table = game_table(name, ranked)
+    table.drop(conn, checkfirst=True)
+    table.create(conn)
+    return table
+
+
+def get_schema_version(conn) -> int:
+    """Get the schema version recorded in the database (0 if none)."""
+    if not inspect(conn).has_table(SCHEMA_VERSION_TABLE):
+        return 0
+    return conn.execute(text(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")).scalar() or 0
+
+
+def migrate(engine, players: Dict[str, int]) -> bool:
+    """
+    Upgrade existing game tables to the current schema.
+
+    Version 1 rebuilds tables created before the schema layer (no primary
+    key, no indexes, inferred types) into typed copies. Version 2 moves
+    every per-player table into the long-format ``games`` table, fills the
+    players dimension and, when ``config.PLAYER_VIEWS_ENABLED``, replaces
+    each player table with a compatibility view. Every step runs in one
+    transaction.
+
+    Args:
+        engine: SQLAlchemy engine
+        players: Mapping of player name to NBA API player ID
+
+    Returns:
+        True if a migration was applied
+    """
+    with engine.begin() as conn:
+        version = get_schema_version(conn)
+        if version >= SCHEMA_VERSION:
+            return False
+
+        if version < 1:
+            _migrate_typed_tables(conn, list(players))
+        if version < 2:
+            _migrate_games_table(conn, players)
+
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SCHEMA_VERSION_TABLE}")
+        conn.exec_driver_sql(f"CREATE TABLE {SCHEMA_VERSION_TABLE} (version INTEGER NOT NULL)")
+        conn.execute(
+            text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version) VALUES (:version)"),
+            {'version': SCHEMA_VERSION}
+        )
+
+    logger.info(f"Migrated database from schema version {version} to {SCHEMA_VERSION}")
+    return True
+
+
+def _migrate_typed_tables(conn, table_names: List[str]):
+    """Rebuild untyped player tables and ``nba_5`` into typed, indexed copies (version 1)."""
+    inspector = inspect(conn)
+    quote = conn.dialect.identifier_preparer.quote
+    existing = set(inspector.get_table_names())
+    migrated = []
+    for name in list(table_names) + [COMBINED_TABLE]:
+        if name not in existing or name in migrated:
+            continue
+
+        # Tables written before columns were lower-cased have quoted
+        # upper-case names on PostgreSQL
+        actual = {c['name'].lower(): c['name'] for c in inspector.get_columns(name)}
+        staged = staging_name(name)
+        create_game_table(conn, staged, ranked=name == COMBINED_TABLE)
+        conn.exec_driver_sql(
+            f"INSERT INTO {quote(staged)} ({', '.join(GAME_COLUMN_NAMES)}) "
+            f"SELECT {', '.join(quote(actual[c]) for c in GAME_COLUMN_NAMES)} FROM {quote(name)}"
+        )
+        migrated.append(name)
+
+    swap_in_staged_tables(conn, migrated)
+    logger.info(f"Rebuilt {len(migrated)} tables with typed columns")
+
+
+def _migrate_games_table(conn, players: Dict[str, int]):
+    """Move per-player tables into the games table (version 2)."""
+    quote = conn.dialect.identifier_preparer.quote
+    existing = set(inspect(conn).get_table_names())
+    create_games_tables(conn)
+
+    moved = {name: key for name, key in players.items() if name in existing}
+    write_players(conn, moved)
+    columns = [c for c in GAME_COLUMN_NAMES if c != 'player_id']
+    for name, key in moved.items():
+        conn.execute(
+            text(
+                f"INSERT INTO {GAMES_TABLE} (player_key, {', '.join(columns)}) "
+                f"SELECT :player_key, {', '.join(columns)} FROM {quote(name)}"
+            ),
+            {'player_key': key}
+        )
+        conn.exec_driver_sql(f"DROP TABLE {quote(name)}")
+
+    if config.PLAYER_VIEWS_ENABLED:
+        create_player_views(conn, moved)
+    logger.info(f"Moved {len(moved)} player tables into '{GAMES_TABLE}'")
+
+
+def explain(conn, query: Union[str, Executable]) -> str:
+    """
+    Get the query plan for a query as text.
+
+    Args:
+        conn: SQLAlchemy connection
+        query: SQL, or a statement whose bound parameters all have values
+
+    Returns:
+        ``EXPLAIN QUERY PLAN`` details on SQLite, ``EXPLAIN`` lines elsewhere
+    """
+    if not isinstance(query, str):
+        query = str(query.compile(conn, compile_kwargs={'literal_binds': True}))
+    if conn.dialect.name == 'sqlite':
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {query}").fetchall()
+        return '\n'.join(str(row[-1]) for row in rows)
+    return '\n'.join(row[0] for row in conn.exec_driver_sql(f"EXPLAIN {query}"))
+
+
+def main():
+    """Migrate the configured database to the current schema."""
+    from roster import load_roster
+
+    engine = get_engine()
+    migrated = migrate(engine, load_roster(engine=engine))
+    print(f"Migrated to schema version {SCHEMA_VERSION}" if migrated
+          else f"Already at schema version {SCHEMA_VERSION}")
+    dispose_engines()
+
+
+if __name__ == '__main__':
+    main()
@@ -88,10 +88,9 @@ def check_database_connection():
         from dotenv import load_dotenv
         load_dotenv()
         
-        from sqlalchemy import create_engine
-        from config import config
+        from database import get_engine
         
-        engine = create_engine(config.database_url)
+        engine = get_engine()
         connection = engine.connect()
         connection.close()
         
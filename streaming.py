@@ -0,0 +1,145 @@
+"""Grouped averages over whole and chunked reads of game tables."""
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _round_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Round integer ratios to two decimals, half away from zero.
+
+    Working on exact integers reproduces PostgreSQL's ``ROUND(numeric, 2)``
+    rather than the float rounding of ``np.round``.
+    """
+    numerator = np.asarray(numerator, dtype='int64')
+    denominator = np.asarray(denominator, dtype='int64')
+    result = np.full(numerator.shape, np.nan)
+    valid = denominator > 0
+    den = denominator[valid]
+    hundredths = (200 * np.abs(numerator[valid]) + den) // (2 * den)
+    result[valid] = np.sign(numerator[valid]) * hundredths / 100
+    return result
+
+
+def _scale(column: str) -> int:
+    """Fixed-point scale of a game column (percentages are ``NUMERIC(5, 2)``)."""
+    return 100 if column.endswith('_pct') else 1
+
+
+def grouped_averages(df: pd.DataFrame, by: List[str], stats: Dict[str, str],
+                     win_pct: bool = False, count_column: str = 'games') -> pd.DataFrame:
+    """
+    Compute ``ROUND(AVG(stat), 2)`` per group the way the database does.
+
+    Args:
+        df: Game rows
+        by: Columns to group by
+        stats: Mapping of source column to output column name
+        win_pct: Also compute ``win_pct`` from the ``wl`` column
+        count_column: Name of the row count column
+
+    Returns:
+        DataFrame with the group columns, the row count, one average per
+        stat and optionally ``win_pct``, sorted by the group columns
+    """
+    scaled = pd.DataFrame({
+        column: (df[column] * _scale(column)).round().astype('Int64') for column in stats
+    })
+    for column in by:
+        scaled[column] = df[column].to_numpy()
+    if win_pct:
+        scaled['_wins'] = (df['wl'] == 'W').astype('int64').to_numpy()
+
+    grouped = scaled.groupby(by, sort=True, dropna=False)
+    sums = grouped[list(stats)].sum()
+    counts = grouped[list(stats)].count()
+    result = pd.DataFrame({count_column: grouped.size().astype('int64')})
+    for column, name in stats.items():
+        result[name] = _round_ratio(sums[column], counts[column] * _scale(column))
+    if win_pct:
+        result['win_pct'] = _round_ratio(grouped['_wins'].sum() * 100, result[count_column])
+    return result.reset_index()
+
+
+class RunningAggregate:
+    """
+    Grouped averages and win percentages accumulated one chunk at a time.
+
+    Only per-group sums and counts are kept between chunks, so memory is
+    bounded by the number of groups rather than the number of rows. Averages
+    skip NULLs and are rounded to two decimals half away from zero, like
+    ``ROUND(AVG(x), 2)`` on PostgreSQL: stats are summed as exact integers
+    (percentages in hundredths) and rounded by ``_round_ratio``.
+    """
+
+    def __init__(self, by: Union[str, List[str]], stats: Dict[str, str],
+                 win_pct: bool = False):
+        """
+        Initialize the aggregate.
+
+        Args:
+            by: Column or columns to group by
+            stats: Mapping of source column to output column name
+            win_pct: Also compute ``win_pct`` from the ``wl`` column
+        """
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.stats = stats
+        self.win_pct = win_pct
+        self._sums: Optional[pd.DataFrame] = None
+        self._counts: Optional[pd.DataFrame] = None
+        self._games: Optional[pd.Series] = None
+        self._wins: Optional[pd.Series] = None
+        self.rows = 0
+
+    @property
+    def columns(self) -> List[str]:
+        """Source columns a chunk must contain."""
+        return self.by + list(self.stats) + (['wl'] if self.win_pct else [])
+
+    @staticmethod
+    def _add(total, part):
+        """Add partial totals, treating groups missing on either side as zero."""
+        return part if total is None else total.add(part, fill_value=0)
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Fold a chunk of rows into the running totals.
+
+        Args:
+            chunk: DataFrame containing ``self.columns``
+        """
+        scaled = chunk[self.by].copy()
+        for column in self.stats:
+            scaled[column] = (chunk[column] * _scale(column)).round().astype('Int64')
+        grouped = scaled.groupby(self.by, observed=True, sort=False)
+        stats = list(self.stats)
+        self._sums = self._add(self._sums, grouped[stats].sum())
+        self._counts = self._add(self._counts, grouped[stats].count())
+        self._games = self._add(self._games, grouped.size())
+        if self.win_pct:
+            wins = chunk['wl'].eq('W').groupby([chunk[c] for c in self.by], observed=True).sum()
+            self._wins = self._add(self._wins, wins)
+        self.rows += len(chunk)
+
+    def result(self) -> pd.DataFrame:
+        """
+        Get the aggregate over every chunk seen so far.
+
+        Returns:
+            DataFrame with the group columns, ``games``, one average per stat
+            and optionally ``win_pct``
+        """
+        if self._sums is None:
+            columns = self.by + ['games'] + list(self.stats.values())
+            return pd.DataFrame(columns=columns + (['win_pct'] if self.win_pct else []))
+
+        result = pd.DataFrame({'games': self._games.astype('int64')})
+        for column, name in self.stats.items():
+            sums = self._sums[column].reindex(result.index).to_numpy('int64')
+            counts = self._counts[column].reindex(result.index).to_numpy('int64')
+            result[name] = _round_ratio(sums, counts * _scale(column))
+        if self.win_pct:
+            wins = self._wins.reindex(result.index).to_numpy('int64')
+            result['win_pct'] = _round_ratio(wins * 100, result['games'].to_numpy())
+        return result.sort_index().reset_index()
@@ -0,0 +1,186 @@
+"""Pre-aggregated summary tables built from the combined ``nba_5`` table."""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import String, bindparam, inspect, text
+
+from loaders import staging_name
+
+logger = logging.getLogger(__name__)
+
+WIN_PCT = "ROUND(CAST(SUM(CASE WHEN wl = 'W' THEN 1 ELSE 0 END) AS NUMERIC) * 100.0 / COUNT(*), 2)"
+
+
+def _avg(column: str) -> str:
+    """Rounded average expression that works on integer and float columns."""
+    return f"ROUND(CAST(AVG({column}) AS NUMERIC), 2)"
+
+
+# Rollups materialized after each load; ``{source}`` is the combined table
+SUMMARY_QUERIES: Dict[str, str] = {
+    'summary_career_averages': f"""
+        SELECT
+            player_id,
+            COUNT(*) AS games_played,
+            {_avg('pts')} AS avg_points,
+            {_avg('reb')} AS avg_rebounds,
+            {_avg('ast')} AS avg_assists,
+            {_avg('stl')} AS avg_steals,
+            {_avg('blk')} AS avg_blocks,
+            {_avg('fg_pct')} AS avg_fg_pct,
+            {_avg('fg3_pct')} AS avg_3pt_pct
+        FROM {{source}}
+        GROUP BY player_id
+    """,
+    'summary_home_away': f"""
+        SELECT
+            player_id,
+            location,
+            COUNT(*) AS games,
+            {_avg('pts')} AS avg_points,
+            {_avg('reb')} AS avg_rebounds,
+            {_avg('ast')} AS avg_assists,
+            {_avg('fg_pct')} AS avg_fg_pct,
+            {WIN_PCT} AS win_pct
+        FROM {{source}}
+        WHERE location IN ('HOME', 'AWAY')
+        GROUP BY player_id, location
+    """,
+    'summary_conference': f"""
+        SELECT
+            player_id,
+            conf AS conference,
+            COUNT(*) AS games,
+            {_avg('pts')} AS avg_points,
+            {_avg('reb')} AS avg_rebounds,
+            {_avg('ast')} AS avg_assists,
+            {WIN_PCT} AS win_pct
+        FROM {{source}}
+        GROUP BY player_id, conf
+    """,
+    'summary_day_of_week': f"""
+        SELECT
+            player_id,
+            day_of_week,
+            COUNT(*) AS games,
+            {_avg('pts')} AS avg_points,
+            {_avg('fg_pct')} AS avg_fg_pct
+        FROM {{source}}
+        GROUP BY player_id, day_of_week
+    """,
+    'summary_triple_doubles': """
+        SELECT
+            player_id,
+            game_date,
+            matchup,
+            pts, reb, ast, stl, blk
+        FROM {source}
+        WHERE pts >= 10 AND reb >= 10 AND ast >= 10
+    """,
+}
+
+# Indexed columns of each summary table, one list per index
+SUMMARY_INDEXES: Dict[str, List[List[str]]] = {
+    'summary_career_averages': [['player_id'], ['avg_points']],
+    'summary_home_away': [['player_id', 'location']],
+    'summary_conference': [['player_id', 'conference']],
+    'summary_day_of_week': [['player_id', 'day_of_week']],
+    'summary_triple_doubles': [['game_date']],
+}
+
+
+def summary_index_name(table_name: str, columns: List[str]) -> str:
+    """Name of a summary table's index on some columns (``ix_<table>_<columns>``)."""
+    return f"ix_{table_name}_{'_'.join(columns)}"
+
+
+def build_summaries(conn, source_table: str, generation: int,
+                    players: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Build staged summary tables from a combined game table.
+
+    Each summary is created as the staging copy of its table with a
+    ``generation`` column and its indexes, ready to be swapped in alongside
+    the table it was built from. Indexes keep the same names across loads.
+
+    With ``players``, a summary that is already live is updated rather than
+    rebuilt: the other players' rows are copied from the live table and only
+    the given players are aggregated from ``source_table``. The caller must
+    ensure the other players' rows of the source are unchanged.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        source_table: Table to aggregate (normally the staged ``nba_5``)
+        generation: Load generation the summaries belong to
+        players: Players whose rows changed since the live summaries were built
+            (None rebuilds every summary from scratch)
+
+    Returns:
+        Names of the live summary tables that were staged
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    source = quote(source_table)
+    live = set(inspect(conn).get_table_names()) if players is not None else set()
+    players = sorted(players or [])
+    updated = 0
+
+    for table_name, query in SUMMARY_QUERIES.items():
+        staged = quote(staging_name(table_name))
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {staged}")
+        if table_name in live:
+            _update_summary(conn, table_name, query, source, generation, players)
+            updated += 1
+        else:
+            conn.exec_driver_sql(
+                f"CREATE TABLE {staged} AS "
+                f"SELECT {int(generation)} AS generation, q.* FROM ({query.format(source=source)}) q"
+            )
+
+        # Named after the staging table; the swap gives them the live names
+        for columns in SUMMARY_INDEXES[table_name]:
+            index_name = quote(summary_index_name(staging_name(table_name), columns))
+            conn.exec_driver_sql(
+                f"CREATE INDEX {index_name} ON {staged} ({', '.join(quote(c) for c in columns)})"
+            )
+
+    if updated:
+        logger.info(
+            f"Built {len(SUMMARY_QUERIES)} summary tables for generation {generation} "
+            f"({updated} updated for {len(players)} changed players)"
+        )
+    else:
+        logger.info(f"Built {len(SUMMARY_QUERIES)} summary tables for generation {generation}")
+    return list(SUMMARY_QUERIES)
+
+
+def _update_summary(conn, table_name: str, query: str, source: str, generation: int,
+                    players: List[str]):
+    """
+    Stage a summary from its live table, aggregating only the changed players.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        table_name: Live summary table
+        query: Summary query (a value of ``SUMMARY_QUERIES``)
+        source: Quoted name of the table to aggregate
+        generation: Load generation the summary belongs to
+        players: Players whose rows are aggregated again
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    staged = quote(staging_name(table_name))
+    columns = ', '.join(
+        quote(c['name']) for c in inspect(conn).get_columns(table_name) if c['name'] != 'generation'
+    )
+    changed = {'players': players}
+
+    conn.execute(text(
+        f"CREATE TABLE {staged} AS "
+        f"SELECT {int(generation)} AS generation, {columns} FROM {quote(table_name)} "
+        f"WHERE player_id NOT IN :players"
+    ).bindparams(bindparam('players', expanding=True, type_=String)), changed)
+    if players:
+        changed_source = f"(SELECT * FROM {source} WHERE player_id IN :players) changed_source"
+        conn.execute(text(
+            f"INSERT INTO {staged} "
+            f"SELECT {int(generation)} AS generation, q.* FROM ({query.format(source=changed_source)}) q"
+        ).bindparams(bindparam('players', expanding=True, type_=String)), changed)
@@ -0,0 +1,34 @@
+"""Shared pytest setup: make the project's top-level modules importable."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import config  # noqa: E402
+from database import dispose_engines  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def sqlite_database(tmp_path_factory):
+    """
+    Point the ETL and analyzers at an empty SQLite database for a test module.
+
+    Snapshots and change events are kept out of the project's data
+    directory, and neither the raw response cache nor run metrics are written.
+
+    Yields:
+        Database URL
+    """
+    tmp_path = tmp_path_factory.mktemp('database')
+    url = f"sqlite:///{tmp_path / 'nba.db'}"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(config, 'DATABASE_URL', url)
+        monkeypatch.setattr(config, 'SNAPSHOT_DIR', tmp_path / 'snapshots')
+        monkeypatch.setattr(config, 'CHANGE_EVENTS', 'none')
+        monkeypatch.setattr(config, 'RAW_CACHE_ENABLED', False)
+        monkeypatch.setattr(config, 'METRICS_ENABLED', False)
+        monkeypatch.setattr(config, 'TRANSFORM_WORKERS', 1)
+        yield url
+        dispose_engines()
@@ -0,0 +1,37 @@
+"""The database, columnar and compact analyzer backends answer alike."""
+import pandas as pd
+import pytest
+
+from analyze_stats import create_analyzer
+from benchmarks.synthetic import FaultyGameLogSource
+from extraction import TokenBucket
+from nba_stats_etl import NBAStatsETL
+
+PLAYERS = {'player_1': 1, 'player_2': 2}
+
+BACKENDS = ('database', 'columnar', 'compact')
+
+
+@pytest.fixture(scope='module')
+def loaded_database(sqlite_database):
+    """SQLite database and Parquet snapshot of one ETL run."""
+    NBAStatsETL(source=FaultyGameLogSource(), rate_limiter=TokenBucket(1000, 10),
+                players=PLAYERS).run(incremental=False)
+    return sqlite_database
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_player_data_matches_database(loaded_database, backend):
+    expected = create_analyzer('database').get_player_data('player_1')
+    result = create_analyzer(backend).get_player_data('player_1')
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('player', ['unknown', 'nba_5'])
+def test_unknown_player_raises_value_error(loaded_database, backend, player):
+    analyzer = create_analyzer(backend)
+    with pytest.raises(ValueError, match=player):
+        analyzer.get_player_data(player)
+    with pytest.raises(ValueError, match=player):
+        analyzer.get_player_data_batch(['player_1', player])
@@ -0,0 +1,60 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from benchmarks.suite import BENCHMARKS, main, stale_benchmarks
+
+BASELINES = Path(__file__).resolve().parent.parent / 'benchmarks' / 'baselines'
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Write a baseline and identical current results; return their paths and contents."""
+    baseline = json.loads((BASELINES / 'sqlite-small.json').read_text())
+    paths = tmp_path / 'baseline.json', tmp_path / 'current.json'
+    yield paths, baseline, json.loads(json.dumps(baseline))
+    logging.disable(logging.NOTSET)
+
+
+def compare_exit_code(paths, baseline, current) -> int:
+    for path, document in zip(paths, (baseline, current)):
+        path.write_text(json.dumps(document))
+    try:
+        main(['compare', *map(str, paths)])
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+def test_baselines_cover_every_benchmark():
+    for path in BASELINES.glob('*.json'):
+        baseline = json.loads(path.read_text())
+        assert list(baseline['results']) == BENCHMARKS, f"{path.name} is stale"
+
+
+def test_stale_benchmarks_lists_one_sided_results():
+    baseline = {'results': {'load': {}, 'query.old': {}}}
+    current = {'results': {'load': {}, 'query.new': {}}}
+    assert stale_benchmarks(baseline, current) == ['query.new', 'query.old']
+
+
+def test_compare_passes_against_a_matching_baseline(documents, capsys):
+    assert compare_exit_code(*documents) == 0
+    assert 'stale' not in capsys.readouterr().out
+
+
+def test_compare_fails_when_the_baseline_misses_a_suite_benchmark(documents, capsys):
+    paths, baseline, current = documents
+    del baseline['results'][BENCHMARKS[-1]]
+
+    assert compare_exit_code(paths, baseline, current) == 1
+    assert f"is stale ({BENCHMARKS[-1]})" in capsys.readouterr().out
+
+
+def test_compare_fails_when_a_benchmark_left_the_suite(documents):
+    paths, baseline, current = documents
+    del current['results'][BENCHMARKS[0]]
+
+    assert compare_exit_code(paths, baseline, current) == 1
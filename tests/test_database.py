@@ -0,0 +1,74 @@
+"""Tests for telling transient database errors from permanent ones."""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from database import is_transient_db_error
+from extraction import retry_with_backoff
+
+
+class PGError(Exception):
+    """Driver error carrying a PostgreSQL SQLSTATE, like psycopg2's."""
+
+    def __init__(self, pgcode: str):
+        super().__init__(f"SQLSTATE {pgcode}")
+        self.pgcode = pgcode
+
+
+def raised(engine, sql: str) -> Exception:
+    with pytest.raises(Exception) as info:
+        with engine.begin() as conn:
+            conn.execute(text(sql))
+    return info.value
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'errors.db'}",
+                           connect_args={'timeout': 0})
+    yield engine
+    engine.dispose()
+
+
+def test_sqlite_syntax_and_missing_table_errors_are_not_transient(engine):
+    for sql in ("SELEC 1", "SELECT * FROM missing_table"):
+        error = raised(engine, sql)
+        assert isinstance(error, OperationalError)
+        assert not is_transient_db_error(error)
+
+
+def test_sqlite_locked_database_is_transient(engine):
+    with engine.connect() as holder:
+        holder.exec_driver_sql("BEGIN EXCLUSIVE")
+        error = raised(engine, "CREATE TABLE t (x INTEGER)")
+        holder.rollback()
+    assert isinstance(error, OperationalError)
+    assert is_transient_db_error(error)
+
+
+@pytest.mark.parametrize('pgcode, transient', [
+    ('40001', True),   # serialization_failure
+    ('40P01', True),   # deadlock_detected
+    ('55P03', True),   # lock_not_available
+    ('08006', True),   # connection_failure
+    ('42601', False),  # syntax_error
+    ('42P01', False),  # undefined_table
+    ('57014', False),  # query_canceled (statement timeout)
+])
+def test_postgresql_errors_are_classified_by_sqlstate(pgcode, transient):
+    error = OperationalError('SELECT 1', {}, PGError(pgcode))
+    assert is_transient_db_error(error) is transient
+
+
+def test_syntax_error_is_not_retried(engine):
+    attempts = []
+
+    def publish():
+        attempts.append(1)
+        with engine.begin() as conn:
+            conn.execute(text("SELEC 1"))
+
+    with pytest.raises(OperationalError):
+        retry_with_backoff(publish, max_retries=3, base_delay=0, max_delay=0,
+                           sleep=lambda seconds: None, retry_on=is_transient_db_error)
+    assert len(attempts) == 1
@@ -0,0 +1,55 @@
+"""End-to-end ETL runs against SQLite with players who have no games."""
+import pandas as pd
+
+from benchmarks.synthetic import generate_game_log
+from database import get_engine
+from extraction import GameLogSource, TokenBucket
+from nba_stats_etl import NBAStatsETL
+
+PLAYERS = {'veteran': 1, 'starter': 2, 'rookie': 3}
+
+
+class RosterSource(GameLogSource):
+    """Serves a fixed number of games per player; players with 0 get an empty log."""
+
+    def __init__(self, games):
+        self.games = games
+
+    def fetch(self, player_id, season=None):
+        games = self.games[player_id]
+        return generate_game_log(player_id, games) if games else generate_game_log(player_id, 1)[:0]
+
+
+def run_etl(games, incremental=False) -> NBAStatsETL:
+    etl = NBAStatsETL(source=RosterSource(games), rate_limiter=TokenBucket(1000, 10),
+                      players=PLAYERS)
+    etl.run(incremental=incremental)
+    return etl
+
+
+def combined_window(url) -> dict:
+    games = pd.read_sql("SELECT player_id, COUNT(*) AS games FROM nba_5 GROUP BY player_id",
+                        get_engine(url))
+    return dict(zip(games['player_id'], games['games']))
+
+
+def test_player_without_games_is_left_out_of_nba_5(sqlite_database):
+    etl = run_etl({1: 40, 2: 30, 3: 0})
+
+    assert combined_window(sqlite_database) == {'veteran': 30, 'starter': 30}
+    assert set(etl.get_ingest_state()) == {'veteran', 'starter'}
+    assert 'rookie' not in etl.changes
+
+    # Still without games, the rookie is fetched in full again and skipped
+    etl = run_etl({1: 40, 2: 30, 3: 0}, incremental=True)
+    assert combined_window(sqlite_database) == {'veteran': 30, 'starter': 30}
+    assert 'rookie' not in etl.changes
+
+
+def test_player_joins_nba_5_after_first_games(sqlite_database):
+    run_etl({1: 40, 2: 30, 3: 0})
+    etl = run_etl({1: 40, 2: 30, 3: 5}, incremental=True)
+
+    assert combined_window(sqlite_database) == {'veteran': 5, 'starter': 5, 'rookie': 5}
+    assert etl.get_ingest_state()['rookie']['games'] == 5
+    assert etl.changes['rookie']['new_games'] == 5
@@ -0,0 +1,182 @@
+"""Tests for rate-limited, retrying extraction against a fake game log source."""
+import time
+
+import pytest
+
+from benchmarks.synthetic import FaultyGameLogSource, generate_game_log
+from config import config
+from extraction import GameLogSource, TokenBucket, is_transient_error, retry_with_backoff
+from nba_stats_etl import NBAStatsETL
+
+
+class ShortCareerSource(GameLogSource):
+    """Source of ten-game logs, cheap enough that fetch latency dominates."""
+
+    def fetch(self, player_id, season=None):
+        return generate_game_log(player_id, 10)
+
+
+class FakeClock:
+    """Clock whose sleeps advance time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class HTTPError(Exception):
+    """Request error carrying a response, like ``requests.HTTPError``."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type('Response', (), {'status_code': status_code})()
+
+
+def test_game_log_source_is_abstract():
+    with pytest.raises(TypeError):
+        GameLogSource()
+
+
+def test_token_bucket_allows_burst_then_paces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(5):
+        bucket.acquire()
+
+    assert len(clock.sleeps) == 3
+    assert clock.now == pytest.approx(0.3)
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+@pytest.mark.parametrize('error, transient', [
+    (ConnectionError('reset'), True),
+    (TimeoutError('read timed out'), True),
+    (HTTPError(429), True),
+    (HTTPError(503), True),
+    (HTTPError(404), False),
+    (KeyError('PTS'), False),
+    (TypeError('bad argument'), False),
+])
+def test_is_transient_error(error, transient):
+    assert is_transient_error(error) is transient
+
+
+def test_retry_with_backoff_retries_transient_errors():
+    clock = FakeClock()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError('reset')
+        return 'ok'
+
+    retries = []
+    result = retry_with_backoff(flaky, max_retries=5, base_delay=1.0, max_delay=4.0,
+                                sleep=clock.sleep, on_retry=lambda n, e: retries.append(n))
+
+    assert result == 'ok'
+    assert retries == [1, 2]
+    assert len(clock.sleeps) == 2
+    assert all(0 <= delay <= 4.0 for delay in clock.sleeps)
+
+
+def test_retry_with_backoff_raises_after_max_retries():
+    clock = FakeClock()
+
+    def down():
+        raise HTTPError(503)
+
+    with pytest.raises(HTTPError):
+        retry_with_backoff(down, max_retries=3, base_delay=0.5, max_delay=1.0, sleep=clock.sleep)
+    assert len(clock.sleeps) == 3
+    assert all(delay <= 1.0 for delay in clock.sleeps)
+
+
+def test_retry_with_backoff_does_not_retry_programming_errors():
+    clock = FakeClock()
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise KeyError('PTS')
+
+    with pytest.raises(KeyError):
+        retry_with_backoff(broken, max_retries=5, base_delay=1.0, max_delay=4.0, sleep=clock.sleep)
+    assert len(attempts) == 1
+    assert clock.sleeps == []
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(config, 'API_MAX_RETRIES', 10)
+    monkeypatch.setattr(config, 'API_BACKOFF_BASE', 0.001)
+    monkeypatch.setattr(config, 'API_BACKOFF_MAX', 0.005)
+
+
+def test_concurrent_extraction_overlaps_latency(fast_retries):
+    players = {f'player_{i}': i for i in range(1, 17)}
+    source = FaultyGameLogSource(ShortCareerSource(), latency=0.1)
+    etl = NBAStatsETL(source=source, workers=8, rate_limiter=TokenBucket(1000, 16),
+                      players=players)
+
+    start = time.perf_counter()
+    extracted = dict(etl.iter_extracted(players))
+    elapsed = time.perf_counter() - start
+
+    assert set(extracted) == set(players)
+    assert 1 < source.max_in_flight <= 8
+    # Two rounds of 8 overlapping fetches take 0.2 s; serial fetches 1.6 s
+    assert elapsed < 16 * 0.1 / 2
+
+
+def test_concurrent_extraction_retries_injected_failures(fast_retries):
+    players = {f'player_{i}': i for i in range(1, 17)}
+    source = FaultyGameLogSource(latency=0.01, failure_rate=0.3, seed=1)
+    etl = NBAStatsETL(source=source, workers=4, rate_limiter=TokenBucket(1000, 16),
+                      players=players)
+
+    extracted = dict(etl.iter_extracted(players))
+
+    assert set(extracted) == set(players)
+    assert all(len(df) for df in extracted.values())
+    assert source.failures > 0
+    assert source.calls == len(players) + source.failures
+    assert sum(record.retries for record in etl.metrics.records) == source.failures
+
+
+def test_extraction_is_paced_by_the_rate_limiter(fast_retries):
+    players = {f'player_{i}': i for i in range(1, 11)}
+    source = FaultyGameLogSource()
+    etl = NBAStatsETL(source=source, workers=8, rate_limiter=TokenBucket(50, 1),
+                      players=players)
+
+    start = time.perf_counter()
+    dict(etl.iter_extracted(players))
+    elapsed = time.perf_counter() - start
+
+    # One token up front, then one every 1/50 s
+    assert elapsed >= 9 / 50 * 0.9
+
+
+def test_extraction_fails_fast_on_non_transient_errors(fast_retries):
+    players = {'player_1': 1}
+    source = FaultyGameLogSource(failure_rate=1.0, error=ValueError)
+    etl = NBAStatsETL(source=source, workers=1, rate_limiter=TokenBucket(1000, 1),
+                      players=players)
+
+    with pytest.raises(ValueError):
+        dict(etl.iter_extracted(players))
+    assert source.calls == 1
@@ -0,0 +1,12 @@
+"""Startup budgets of the entry points, measured in fresh interpreters."""
+import pytest
+
+from benchmarks.bench_import import IMPORT_BUDGETS_MS, check_budgets
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_import_stays_within_budget(module):
+    result, = check_budgets({module: IMPORT_BUDGETS_MS[module]}, repeat=2)
+
+    assert result['eager_imports'] == []
+    assert result['project_ms'] <= result['budget_ms']
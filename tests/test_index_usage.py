@@ -0,0 +1,109 @@
+"""Check that every analyzer query is answered from an index."""
+import re
+
+import pytest
+from sqlalchemy import inspect
+
+import query_builder
+from analyze_stats import NBAStatsAnalyzer
+from benchmarks.synthetic import FaultyGameLogSource
+from database import get_engine
+from extraction import TokenBucket
+from nba_stats_etl import NBAStatsETL
+from schema import COMBINED_TABLE, RANKED_STATS, explain
+from summaries import SUMMARY_INDEXES, SUMMARY_QUERIES, summary_index_name
+
+PLAYERS = {'player_1': 1, 'player_2': 2, 'player_3': 3}
+
+# Analyzer method -> statements it runs, with their parameters
+ANALYZER_QUERIES = {
+    'get_career_averages': [
+        (query_builder.summary_query('summary_career_averages'), {}),
+        (query_builder.summary_rollup_query('summary_career_averages'), {}),
+    ],
+    'get_player_data': [(query_builder.players_data_query(), {'player_names': ['player_1']})],
+    'get_player_data_batch': [
+        (query_builder.players_data_query(), {'player_names': list(PLAYERS)}),
+    ],
+    'get_top_performances': [
+        (query_builder.top_performances_query(stat), {'limit': 10}) for stat in RANKED_STATS
+    ],
+    'get_top_performances_batch': [
+        (query_builder.top_performances_batch_query(tuple(RANKED_STATS)), {'limit': 10}),
+    ],
+    'compare_players': [
+        (query_builder.compare_players_query(query_builder.DEFAULT_COMPARE_STATS), {}),
+    ],
+    'get_recent_form': [(query_builder.recent_form_query(), {'games': 10})],
+    'get_rolling_stats': [(query_builder.rolling_stats_query(), {'player_name': 'player_1'})],
+    'get_current_form': [(query_builder.current_form_query(), {})],
+    'get_triple_doubles': [
+        (query_builder.summary_query('summary_triple_doubles'), {}),
+        (query_builder.summary_rollup_query('summary_triple_doubles'), {}),
+    ],
+    'home_vs_away': [
+        (query_builder.summary_query('summary_home_away'), {}),
+        (query_builder.summary_rollup_query('summary_home_away'), {}),
+    ],
+    'conference_splits': [
+        (query_builder.summary_query('summary_conference'), {}),
+        (query_builder.summary_rollup_query('summary_conference'), {}),
+    ],
+    'day_of_week_splits': [
+        (query_builder.summary_query('summary_day_of_week'), {}),
+        (query_builder.summary_rollup_query('summary_day_of_week'), {}),
+    ],
+}
+
+
+@pytest.fixture(scope='module')
+def loaded_database(sqlite_database):
+    """SQLite database loaded twice, so every table was swapped in over an older one."""
+    for _ in range(2):
+        NBAStatsETL(source=FaultyGameLogSource(), rate_limiter=TokenBucket(1000, 10),
+                    players=PLAYERS).run(incremental=False)
+    return get_engine(sqlite_database)
+
+
+def stored_table_scans(plan: str, tables) -> list:
+    """Plan lines that read a stored table without an index (SQLite ``SCAN <table>``)."""
+    return [
+        line for line in plan.splitlines()
+        if (match := re.match(r'SCAN (\w+)$', line.strip())) and match.group(1) in tables
+    ]
+
+
+def test_every_analyzer_query_is_checked():
+    cached = {
+        name for name, member in vars(NBAStatsAnalyzer).items()
+        if hasattr(member, '__wrapped__')
+    }
+    assert cached == set(ANALYZER_QUERIES)
+
+
+@pytest.mark.parametrize('method, statement, params', [
+    (method, statement, params)
+    for method, statements in ANALYZER_QUERIES.items()
+    for statement, params in statements
+])
+def test_analyzer_query_uses_an_index(loaded_database, method, statement, params):
+    with loaded_database.connect() as conn:
+        tables = set(inspect(conn).get_table_names())
+        plan = explain(conn, statement.params(**params))
+
+    assert 'INDEX' in plan, f"{method} does not use an index:\n{plan}"
+    assert not stored_table_scans(plan, tables), f"{method} scans a table:\n{plan}"
+
+
+def test_swapped_in_tables_have_stable_index_names(loaded_database):
+    inspector = inspect(loaded_database)
+    indexes = {index['name'] for index in inspector.get_indexes(COMBINED_TABLE)}
+    assert indexes == {f"ix_{COMBINED_TABLE}_player_date"} | {
+        f"ix_{COMBINED_TABLE}_{stat}" for stat in RANKED_STATS
+    }
+    assert not [name for name in inspector.get_table_names() if name.endswith('__staging')]
+    assert set(SUMMARY_QUERIES) <= set(inspector.get_table_names())
+    for table_name, indexes in SUMMARY_INDEXES.items():
+        assert {index['name'] for index in inspector.get_indexes(table_name)} == {
+            summary_index_name(table_name, columns) for columns in indexes
+        }
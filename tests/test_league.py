@@ -0,0 +1,72 @@
+"""League-wide ingestion against recorded season game logs."""
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_game_log
+from config import config
+from database import get_engine
+from extraction import TokenBucket
+from league import LeagueGameLogSource, RecordedSeasonGameLogSource, seasons_between
+from nba_stats_etl import NBAStatsETL
+
+PLAYERS = {'alpha': 101, 'beta': 102, 'gamma': 103}
+
+# Season -> games per player ID; gamma is rostered but never plays and
+# player 999 is in the league logs without being tracked
+SEASON_GAMES = {
+    '2022-23': ({101: 6, 102: 4, 999: 3}, '2022-10-20'),
+    '2023-24': ({101: 5, 102: 8, 999: 2}, '2023-10-24'),
+}
+
+
+def league_season_log(games: dict, start: str) -> pd.DataFrame:
+    """A season shaped like the ``LeagueGameLog`` endpoint result."""
+    logs = []
+    for player_id, count in games.items():
+        log = generate_game_log(player_id, count, seed=player_id + int(start[:4]), start=start)
+        log = log.rename(columns={'Player_ID': 'PLAYER_ID', 'Game_ID': 'GAME_ID'})
+        log['GAME_DATE'] = pd.to_datetime(log['GAME_DATE'], format='%b %d, %Y').dt.strftime('%Y-%m-%d')
+        log.insert(2, 'PLAYER_NAME', f'Player {player_id}')
+        log.insert(3, 'TEAM_ABBREVIATION', log['MATCHUP'].str[:3])
+        logs.append(log)
+    return pd.concat(logs, ignore_index=True)
+
+
+@pytest.fixture(scope='module')
+def recorded_seasons(tmp_path_factory):
+    root = tmp_path_factory.mktemp('league')
+    for season, (games, start) in SEASON_GAMES.items():
+        league_season_log(games, start).to_csv(root / f'{season}.csv', index=False)
+    return root
+
+
+def test_league_ingestion_loads_tracked_players(sqlite_database, recorded_seasons, monkeypatch):
+    monkeypatch.setattr(config, 'INGEST_MODE', 'league')
+    monkeypatch.setattr(config, 'LEAGUE_FIRST_SEASON', '2022-23')
+    etl = NBAStatsETL(rate_limiter=TokenBucket(1000, 10), players=PLAYERS)
+    assert isinstance(etl.source, LeagueGameLogSource)
+    etl.source.source = RecordedSeasonGameLogSource(recorded_seasons)
+
+    etl.run(incremental=False)
+
+    # One request per season, however many players were fetched
+    assert etl.source.requests == len(seasons_between('2022-23'))
+
+    engine = get_engine(sqlite_database)
+    games = pd.read_sql(
+        "SELECT player_key, g, game_date, pts FROM games ORDER BY player_key, game_date", engine,
+        parse_dates=['game_date']
+    )
+    recorded = pd.concat(league_season_log(*season) for season in SEASON_GAMES.values())
+    recorded = recorded[recorded['PLAYER_ID'].isin(PLAYERS.values())]
+    assert games.groupby('player_key').size().to_dict() == {101: 11, 102: 12}
+    assert games.groupby('player_key')['pts'].sum().to_dict() \
+        == recorded.groupby('PLAYER_ID')['PTS'].sum().to_dict()
+    for _, player in games.groupby('player_key'):
+        assert player['g'].tolist() == list(range(1, len(player) + 1))
+        assert player['game_date'].is_monotonic_increasing
+
+    combined = pd.read_sql("SELECT player_id, COUNT(*) AS games FROM nba_5 GROUP BY player_id",
+                           engine)
+    assert dict(zip(combined['player_id'], combined['games'])) == {'alpha': 11, 'beta': 11}
+    assert set(etl.get_ingest_state()) == {'alpha', 'beta'}
@@ -0,0 +1,29 @@
+import pytest
+
+from loaders import resolve_load_method
+
+
+@pytest.mark.parametrize('dialect, driver, expected', [
+    ('postgresql', 'psycopg2', 'copy'),
+    ('postgresql', 'psycopg', 'executemany'),
+    ('postgresql', 'asyncpg', 'executemany'),
+    ('postgresql', 'pg8000', 'executemany'),
+    ('sqlite', 'pysqlite', 'executemany'),
+])
+def test_auto_uses_copy_only_with_psycopg2(dialect, driver, expected):
+    assert resolve_load_method(dialect, 'auto', driver) == expected
+
+
+@pytest.mark.parametrize('dialect, driver', [
+    ('postgresql', 'psycopg'),
+    ('sqlite', 'pysqlite'),
+])
+def test_explicit_copy_rejected_without_psycopg2(dialect, driver):
+    with pytest.raises(ValueError, match='COPY'):
+        resolve_load_method(dialect, 'copy', driver)
+
+
+def test_explicit_methods_pass_through():
+    assert resolve_load_method('sqlite', 'multi', 'pysqlite') == 'multi'
+    with pytest.raises(ValueError):
+        resolve_load_method('sqlite', 'bogus', 'pysqlite')
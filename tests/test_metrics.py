@@ -0,0 +1,37 @@
+import json
+
+from metrics import PROMETHEUS_FILE, RunMetrics
+
+
+def finished_run() -> RunMetrics:
+    metrics = RunMetrics()
+    with metrics.stage('extract', 'player_1') as record:
+        record.rows = 10
+    metrics.finish('success')
+    return metrics
+
+
+def test_write_keeps_newest_reports(tmp_path):
+    paths = [finished_run().write(tmp_path, retention=3) for _ in range(5)]
+
+    kept = sorted(tmp_path.glob('run-*.json'))
+    assert len(kept) == 3
+    assert paths[-1] in kept
+    assert (tmp_path / PROMETHEUS_FILE).exists()
+
+
+def test_zero_retention_keeps_every_report(tmp_path):
+    for _ in range(4):
+        finished_run().write(tmp_path, retention=0)
+    assert len(list(tmp_path.glob('run-*.json'))) == 4
+
+
+def test_memory_is_reported_for_the_process_not_per_stage(tmp_path):
+    metrics = finished_run()
+    report = json.loads(metrics.write(tmp_path, retention=0).read_text())
+
+    assert 'peak_rss_bytes' not in report['stages']['extract']
+    assert 'process_peak_rss_at_end' in report['records'][0]
+    prometheus = metrics.to_prometheus()
+    assert 'nba_etl_stage_peak_rss_bytes' not in prometheus
+    assert 'nba_etl_stage_rows{stage="extract",player="player_1"} 10' in prometheus
@@ -0,0 +1,83 @@
+"""Process-pool transform stage and its shared-memory hand-off."""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import FaultyGameLogSource, generate_game_log
+from config import config
+from database import get_engine
+from extraction import TokenBucket
+from nba_stats_etl import NBAStatsETL
+from pipeline import ParallelTransformer, _TransformOnlySource
+from rolling import ROLLING_TABLE
+
+PLAYERS = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4}
+
+
+def transform_all(workers: int) -> dict:
+    etl = NBAStatsETL(source=_TransformOnlySource(), players=PLAYERS)
+    with ParallelTransformer(etl.transform_player_data, workers=workers, max_pending=2) as pool:
+        for name, player_id in PLAYERS.items():
+            pool.submit(generate_game_log(player_id, 20 * player_id), name)
+        return dict(pool.completed(wait_all=True))
+
+
+def test_worker_pool_matches_inline_transform():
+    inline = transform_all(workers=1)
+    pooled = transform_all(workers=2)
+
+    assert set(pooled) == set(PLAYERS)
+    for name, df in inline.items():
+        pd.testing.assert_frame_equal(pooled[name].reset_index(drop=True),
+                                      df.reset_index(drop=True))
+
+
+def shared_memory_blocks() -> set:
+    return {path.name for path in Path('/dev/shm').glob('psm_*')}
+
+
+def read_tables(url) -> dict:
+    engine = get_engine(url)
+    return {
+        'games': pd.read_sql("SELECT * FROM games ORDER BY player_key, game_date", engine),
+        'nba_5': pd.read_sql("SELECT * FROM nba_5 ORDER BY player_id, game_date", engine),
+        'rolling': pd.read_sql(f"SELECT * FROM {ROLLING_TABLE} ORDER BY player_id, game_date",
+                               engine),
+    }
+
+
+@pytest.mark.skipif(not Path('/dev/shm').is_dir(), reason="needs POSIX shared memory in /dev/shm")
+def test_parallel_run_matches_serial_run(sqlite_database, monkeypatch):
+    before = shared_memory_blocks()
+    etl = NBAStatsETL(source=FaultyGameLogSource(), rate_limiter=TokenBucket(1000, 10),
+                      players=PLAYERS)
+    etl.run(incremental=False)
+    serial = read_tables(sqlite_database)
+
+    monkeypatch.setattr(config, 'TRANSFORM_WORKERS', 2)
+    monkeypatch.setattr(config, 'PIPELINE_QUEUE_SIZE', 2)
+    etl = NBAStatsETL(source=FaultyGameLogSource(), rate_limiter=TokenBucket(1000, 10),
+                      players=PLAYERS)
+    etl.run(incremental=False)
+    parallel = read_tables(sqlite_database)
+
+    assert {record.player for record in etl.metrics.records if record.stage == 'transform'} \
+        == set(PLAYERS)
+    for table, df in serial.items():
+        pd.testing.assert_frame_equal(parallel[table], df, check_like=True)
+    assert shared_memory_blocks() <= before
+
+
+@pytest.mark.skipif(not Path('/dev/shm').is_dir(), reason="needs POSIX shared memory in /dev/shm")
+def test_failed_transform_frees_shared_memory():
+    before = shared_memory_blocks()
+    etl = NBAStatsETL(source=_TransformOnlySource(), players=PLAYERS)
+    with pytest.raises(KeyError):
+        with ParallelTransformer(etl.transform_player_data, workers=2, max_pending=4) as pool:
+            pool.submit(generate_game_log(1, 20).drop(columns='MATCHUP'), 'first')
+            for name, player_id in list(PLAYERS.items())[1:]:
+                pool.submit(generate_game_log(player_id, 20), name)
+            list(pool.completed(wait_all=True))
+
+    assert shared_memory_blocks() <= before
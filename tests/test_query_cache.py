@@ -0,0 +1,39 @@
+import pandas as pd
+
+from query_cache import QueryCache, cached_query
+
+
+class Analyzer:
+    def __init__(self):
+        self.query_cache = QueryCache(lambda: 1, max_entries=10, check_interval=60)
+        self.calls = 0
+
+    @cached_query(players='player_name')
+    def top_games(self, player_name, limit=5):
+        self.calls += 1
+        return pd.DataFrame({'player': [player_name] * limit})
+
+
+def test_positional_keyword_and_default_arguments_share_an_entry():
+    analyzer = Analyzer()
+    analyzer.top_games('A', 5)
+    analyzer.top_games('A', limit=5)
+    analyzer.top_games('A')
+    analyzer.top_games(player_name='A', limit=5)
+    assert analyzer.calls == 1
+    assert analyzer.query_cache.hits == 3
+
+
+def test_different_arguments_are_cached_separately():
+    analyzer = Analyzer()
+    analyzer.top_games('A', 5)
+    analyzer.top_games('A', 3)
+    analyzer.top_games('B', 5)
+    assert analyzer.calls == 3
+    assert len(analyzer.query_cache) == 3
+
+
+def test_results_are_copies():
+    analyzer = Analyzer()
+    analyzer.top_games('A')['player'] = 'changed'
+    assert (analyzer.top_games('A')['player'] == 'A').all()
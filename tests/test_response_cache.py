@@ -0,0 +1,105 @@
+"""Tests for the raw response cache and the cached game log source."""
+import pytest
+
+from benchmarks.synthetic import generate_game_log
+from config import config
+from extraction import GameLogSource, TokenBucket
+from nba_stats_etl import NBAStatsETL
+from response_cache import CachedGameLogSource, RawResponseCache
+
+PLAYERS = {f'player_{player_id}': player_id for player_id in range(1, 7)}
+
+
+class FakeClock:
+    """Clock whose sleeps advance time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class CountingSource(GameLogSource):
+    """Twenty-game logs, counting the fetches that reach it."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, player_id, season=None):
+        self.calls += 1
+        return generate_game_log(player_id, 20)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return RawResponseCache(tmp_path / 'raw', ttl=60, clock=clock)
+
+
+def test_miss_fetches_upstream_once_and_takes_a_token(cache, clock):
+    upstream = CountingSource()
+    bucket = TokenBucket(1.0, 1, clock=clock, sleep=clock.sleep)
+    source = CachedGameLogSource(upstream, cache, rate_limiter=bucket)
+
+    first = source.fetch(1)
+    second = source.fetch(1)
+
+    assert upstream.calls == 1
+    assert clock.sleeps == []
+    assert second.equals(first)
+    source.fetch(2)
+    assert upstream.calls == 2
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_hit_is_served_until_the_entry_expires(cache, clock):
+    upstream = CountingSource()
+    source = CachedGameLogSource(upstream, cache)
+    cache.put(CachedGameLogSource.ENDPOINT, 1, '2023-24', generate_game_log(1, 5))
+    cache.put(CachedGameLogSource.ENDPOINT, 1, None, generate_game_log(1, 5))
+
+    assert len(source.fetch(1)) == 5
+    assert upstream.calls == 0
+
+    clock.now += 61
+    assert len(source.fetch(1, '2023-24')) == 5  # completed seasons never expire
+    assert len(source.fetch(1)) == 20
+    assert upstream.calls == 1
+
+
+def test_offline_miss_raises_without_calling_upstream(cache, clock):
+    upstream = CountingSource()
+    source = CachedGameLogSource(upstream, cache, offline=True)
+    cache.put(CachedGameLogSource.ENDPOINT, 1, None, generate_game_log(1, 5))
+    clock.now += 61
+
+    assert len(source.fetch(1)) == 5  # expired entries are replayed offline
+    with pytest.raises(LookupError):
+        source.fetch(2)
+    assert upstream.calls == 0
+
+
+def test_offline_replay_takes_no_rate_limiter_tokens(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(config, 'RAW_CACHE_DIR', tmp_path / 'raw')
+    monkeypatch.setattr(config, 'INGEST_MODE', 'player')
+    cache = RawResponseCache()
+    for player_id in PLAYERS.values():
+        cache.put(CachedGameLogSource.ENDPOINT, player_id, None, generate_game_log(player_id, 20))
+
+    bucket = TokenBucket(1.0, 2, clock=clock, sleep=clock.sleep)
+    etl = NBAStatsETL(rate_limiter=bucket, offline=True, players=PLAYERS)
+    extracted = dict(etl.iter_extracted(PLAYERS))
+
+    assert isinstance(etl.source, CachedGameLogSource)
+    assert {name: len(df) for name, df in extracted.items()} == dict.fromkeys(PLAYERS, 20)
+    assert clock.sleeps == []
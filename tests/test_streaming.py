@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from streaming import RunningAggregate, grouped_averages
+
+STATS = {'pts': 'avg_points', 'fg_pct': 'avg_fg_pct'}
+
+
+def games() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    rows = 1000
+    return pd.DataFrame({
+        'player_id': rng.choice(['a', 'b', 'c'], rows),
+        'location': rng.choice(['HOME', 'AWAY'], rows),
+        'pts': rng.integers(0, 50, rows),
+        'fg_pct': np.where(rng.random(rows) < 0.05, np.nan, rng.integers(0, 101, rows) / 100),
+        'wl': rng.choice(['W', 'L'], rows),
+    })
+
+
+def test_halves_round_away_from_zero():
+    chunk = pd.DataFrame({'player_id': ['a'] * 8, 'pts': [0] * 7 + [1]})
+    aggregate = RunningAggregate('player_id', {'pts': 'avg_points'})
+    aggregate.update(chunk)
+    # 1 / 8 = 0.125, which float rounding takes to 0.12
+    assert aggregate.result()['avg_points'].tolist() == [0.13]
+
+
+def test_chunked_result_matches_grouped_averages():
+    df = games()
+    aggregate = RunningAggregate(['player_id', 'location'], STATS, win_pct=True)
+    for start in range(0, len(df), 64):
+        aggregate.update(df.iloc[start:start + 64])
+
+    expected = grouped_averages(df, ['player_id', 'location'], STATS, win_pct=True)
+    pd.testing.assert_frame_equal(aggregate.result(), expected, check_dtype=False)
+    assert aggregate.rows == len(df)